@@ -0,0 +1,359 @@
+from typing import Dict, List
+
+import numpy as np
+
+from hoki.game import STAT_COLUMNS, STATS_NAMES, BoxScore
+from hoki.game_config import GameConfig
+from hoki.ice_map import IceMap
+from hoki.pawn import Pawn, position
+from hoki.team import Team
+
+# the actions a player can choose, weighted the same way as PlayerManager.player_choose_action
+ACTION_SKATE = 0
+ACTION_NOTHING = 1
+ACTION_SHOOT = 2
+ACTION_PASS = 3
+ACTION_CHOICES = np.array(
+    [ACTION_SKATE, ACTION_SKATE, ACTION_NOTHING, ACTION_SHOOT, ACTION_PASS]
+)
+
+# the chance of a single tip, block or interception attempt succeeding
+REACTION_CHANCE = 0.25
+# the save difficulty added by a successful tip
+TIP_DIFFICULTY = 0.15
+# the save difficulty added by an opponent screening the goalie
+SCREEN_DIFFICULTY = 0.5
+
+# used to order players on a path by path position first and zone arrival second
+PATH_ORDER = 1 << 40
+
+
+class BatchGameManager:
+    """
+    A class that runs many games in lockstep. The state of every game is held in numpy arrays and every
+    game is advanced one game_tick at a time, following the same rules as GameManager and PlayerManager.
+    Games drop out of the batch as they are completed.
+
+    Players are indexed by slot, the home teams players first followed by the away teams players,
+    which is the same row order as BoxScore.counts.
+
+    Attributes:
+        matchups (List[List[Team]]): the [home-team, away-team] of each game.
+        players_by_id (Dict[str, Pawn]): a dict of Pawn keyed by ids.
+        rng (np.random.Generator): the random number generator shared by every game in the batch.
+        timer (int): The number of second for each period, from the config.
+        game_tick (int): The number of seconds to dectement each game tick, from the config.
+        num_periods (int): The total number of periods to play before overtime, from the config.
+        completed (bool): True once every game is over, else False. Default = False.
+        active (np.ndarray): the indices of the games still being played.
+        zone (np.ndarray): the zone of each player, shape (games, players).
+        puck_player (np.ndarray): the slot of the player with the puck, -1 if no player has it.
+        puck_zone (np.ndarray): the zone of the puck, -1 if it is out of play.
+        time (np.ndarray): the time remaining in the current period of each game.
+        period (np.ndarray): the current period of each game.
+        overtime (np.ndarray): True if the game is in overtime.
+        goals (np.ndarray): the goals of each team, shape (games, 2).
+        counts (np.ndarray): the player stats of each game, shape (games, players, STATS_NAMES).
+
+    Args:
+        matchups (List[List[Team]]): a list of [home-team, away-team] pairs, one per game.
+            Every team must have the same number of players.
+        players_by_id (Dict[str, Pawn]): a dict containing every Pawn in the games keyed by id.
+        seed (int): the seed used for the random number generator. Default = None.
+        ice_map (IceMap): the rink to play on. Default = None, a new IceMap.
+        config (GameConfig): the length of the games and the resolution of their clock. Default = None, the
+            default GameConfig.
+    Raises:
+        ValueError: if the config is event driven or plans skating, the games of a batch are run on every tick
+            and skate at random.
+    """
+
+    def __init__(
+        self,
+        matchups: List[List[Team]],
+        players_by_id: Dict[str, Pawn],
+        seed: int = None,
+        ice_map: IceMap = None,
+        config: GameConfig = None,
+    ) -> None:
+        config = config if config is not None else GameConfig()
+        if config.event_driven or config.plan_skating:
+            raise ValueError(
+                "a BatchGameManager can not run event driven games or plan skating"
+            )
+        self.matchups = [list(teams) for teams in matchups]
+        self.players_by_id = players_by_id
+        self.ice_map = ice_map if ice_map is not None else IceMap()
+        self.rng = np.random.default_rng(seed)
+
+        self.timer = config.timer
+        self.game_tick = config.game_tick
+        self.num_periods = config.num_periods
+        self.completed = False
+
+        self._build_rink()
+        self._build_rosters()
+
+        n_games = len(self.matchups)
+        self.active = np.arange(n_games)
+        self.puck_player = np.full(n_games, -1)
+        self.puck_zone = np.full(n_games, -1)
+        self.time = np.full(n_games, self.timer)
+        self.period = np.ones(n_games, dtype=np.int64)
+        self.overtime = np.zeros(n_games, dtype=bool)
+        self.goals = np.zeros((n_games, 2), dtype=np.int64)
+        self.counts = np.zeros(
+            (n_games, self.n_players, len(STATS_NAMES)), dtype=np.int64
+        )
+        # the two most recent players on each games PossessionStack
+        self.stack_top = np.full(n_games, -1)
+        self.stack_prev = np.full(n_games, -1)
+
+    def _build_rink(self) -> None:
+        """Take the zone adjacency and shot path lookup arrays from the shared rink topology."""
+        topology = self.ice_map.topology
+        self.degree = topology.degree
+        self.neighbours = topology.neighbours
+        # path_position[source, target, zone] is the index of zone on the shot path, -1 if it is not on it
+        self.path_position = topology.path_positions()
+
+    def _build_rosters(self) -> None:
+        """Build the per game player arrays. Raise a ValueError if the rosters can not be batched."""
+        team_sizes = {len(team.players) for teams in self.matchups for team in teams}
+        if len(team_sizes) != 1:
+            raise ValueError(
+                "every team in a batch must have the same number of players"
+            )
+        team_size = team_sizes.pop()
+        self.n_players = 2 * team_size
+        self.team_of = np.repeat([0, 1], team_size)
+        self.teammates = np.array(
+            [
+                [m for m in range(self.n_players) if m != p and self.team_of[m] == t]
+                for p, t in enumerate(self.team_of)
+            ]
+        )
+
+        n_games = len(self.matchups)
+        self.shooting = np.zeros((n_games, self.n_players))
+        self.save = np.zeros((n_games, self.n_players))
+        self.is_goalie = np.zeros((n_games, self.n_players), dtype=bool)
+        self.goalie = np.zeros((n_games, 2), dtype=np.int64)
+        self.centre = np.zeros((n_games, 2), dtype=np.int64)
+        self.zone = np.zeros((n_games, self.n_players), dtype=np.int64)
+        for g, teams in enumerate(self.matchups):
+            for t, team in enumerate(teams):
+                pawns = [self.players_by_id[pid] for pid in team.players]
+                positions = [p.position for p in pawns]
+                if position.GOALIE not in positions or position.CENTRE not in positions:
+                    raise ValueError(f"team {team.name} needs a goalie and a centre")
+                offset = t * team_size
+                self.goalie[g, t] = offset + positions.index(position.GOALIE)
+                self.centre[g, t] = offset + positions.index(position.CENTRE)
+                for i, pawn in enumerate(pawns):
+                    self.shooting[g, offset + i] = pawn.stats.shooting
+                    self.save[g, offset + i] = pawn.stats.save
+                    self.is_goalie[g, offset + i] = pawn.position == position.GOALIE
+                    self.zone[g, offset + i] = self.ice_map.get_initial_zone(
+                        pawn.position, t == 0
+                    )
+
+        # the order players arrived in their zone, the away team is placed on the ice first
+        self.arrival = np.zeros((n_games, self.n_players), dtype=np.int64)
+        self.arrival[:, team_size:] = np.arange(team_size)
+        self.arrival[:, :team_size] = np.arange(team_size, self.n_players)
+        self.sequence = self.n_players
+
+    def run(self) -> None:
+        """Run every game until it is completed."""
+        while len(self.active) > 0:
+            self.increment_state()
+        self.completed = True
+
+    def increment_state(self) -> None:
+        """Run every active game for 1 game_tick and drop the games that are over."""
+        self.run_state()
+
+        act = self.active
+        tied = self.goals[act, 0] == self.goals[act, 1]
+        running = self.time[act] > 0
+        done = running & self.overtime[act] & ~tied
+        self.time[act[running & ~done]] -= self.game_tick
+
+        ended = ~running
+        next_period = ended & (self.period[act] < self.num_periods)
+        overtime = ended & ~next_period & tied
+        done |= ended & ~next_period & ~tied
+        new_period = act[next_period | overtime]
+        self.period[new_period] += 1
+        self.time[new_period] = self.timer
+        self.overtime[act[overtime]] = True
+
+        self.active = act[~done]
+
+    def run_state(self) -> None:
+        """Run the current state of every active game."""
+        act = self.active
+        face_off = act[self.puck_zone[act] < 0]
+        if len(face_off) > 0:
+            self.face_off(face_off)
+
+        for player in range(self.n_players):
+            actions = ACTION_CHOICES[
+                self.rng.integers(0, len(ACTION_CHOICES), len(act))
+            ]
+            for action, func in [
+                (ACTION_SHOOT, self.shoot),
+                (ACTION_PASS, self.pass_puck),
+                (ACTION_SKATE, self.skate),
+            ]:
+                rows = act[actions == action]
+                if len(rows) > 0:
+                    func(rows, player)
+            self.add_possession(act[actions != ACTION_NOTHING])
+
+    def face_off(self, rows: np.ndarray) -> None:
+        """Resolve a faceoff between the two centres of each game in rows."""
+        won = self.rng.integers(0, 2, len(rows))
+        winner = self.centre[rows, won]
+        loser = self.centre[rows, 1 - won]
+        self.counts[rows, winner, STAT_COLUMNS["faceoffs"]] += 1
+        self.counts[rows, winner, STAT_COLUMNS["faceoffs-won"]] += 1
+        self.counts[rows, loser, STAT_COLUMNS["faceoffs"]] += 1
+        self.puck_player[rows] = winner
+        self.puck_zone[rows] = self.zone[rows, winner]
+
+    def first_on_path(
+        self, rows: np.ndarray, path_position: np.ndarray, mask: np.ndarray
+    ) -> np.ndarray:
+        """
+        Return the slot of the first masked player along a path in each game, -1 if there is none.
+        Players in the same zone are ordered by when they arrived in it.
+        """
+        order = np.where(
+            mask,
+            path_position * PATH_ORDER + self.arrival[rows],
+            np.iinfo(np.int64).max,
+        )
+        return np.where(mask.any(axis=1), order.argmin(axis=1), -1)
+
+    def shoot(self, rows: np.ndarray, shooter: int) -> None:
+        """Resolve a shot by the shooter slot in each game in rows."""
+        team = self.team_of[shooter]
+        games = np.arange(len(rows))
+        zones = self.zone[rows]
+        goalie = self.goalie[rows, 1 - team]
+        goalie_zone = zones[games, goalie]
+        path_position = self.path_position[
+            zones[:, shooter, None], goalie_zone[:, None], zones
+        ]
+
+        on_path = (path_position >= 0) & ~self.is_goalie[rows]
+        on_path[:, shooter] = False
+        tippers = on_path & (self.team_of == team)
+        blockers = on_path & (self.team_of != team)
+
+        tips = (tippers & (self.rng.random(tippers.shape) < REACTION_CHANCE)).sum(1)
+        screened = blockers.any(axis=1)
+        blocker = self.first_on_path(rows, path_position, blockers)
+        blocked = screened & (self.rng.random(len(rows)) < REACTION_CHANCE)
+
+        difficulty = (
+            self.shooting[rows, shooter]
+            + TIP_DIFFICULTY * tips
+            + SCREEN_DIFFICULTY * (screened & ~blocked)
+        )
+        saved = ~blocked & (difficulty < self.save[rows, goalie])
+        goal = ~blocked & ~saved
+
+        self.counts[rows, shooter, STAT_COLUMNS["shots"]] += 1
+        self.puck_player[rows] = np.where(blocked, blocker, goalie)
+        self.puck_zone[rows] = np.where(blocked, zones[games, blocker], goalie_zone)
+
+        scored = rows[goal]
+        if len(scored) > 0:
+            self.counts[scored, shooter, STAT_COLUMNS["goals"]] += 1
+            self.goals[scored, team] += 1
+            assist = self.stack_prev[scored]
+            assisted = (assist >= 0) & (self.team_of[assist] == team)
+            self.counts[
+                scored[assisted], assist[assisted], STAT_COLUMNS["assists"]
+            ] += 1
+            self.puck_player[scored] = -1
+            self.puck_zone[scored] = -1
+
+    def pass_puck(self, rows: np.ndarray, passer: int) -> None:
+        """Resolve a pass by the passer slot to a random teammate in each game in rows."""
+        team = self.team_of[passer]
+        games = np.arange(len(rows))
+        zones = self.zone[rows]
+        receiver = self.teammates[passer][
+            self.rng.integers(0, self.teammates.shape[1], len(rows))
+        ]
+        path_position = self.path_position[
+            zones[:, passer, None], zones[games, receiver][:, None], zones
+        ]
+
+        opponents = (path_position >= 0) & (self.team_of != team)
+        intercepts = opponents & (self.rng.random(opponents.shape) < REACTION_CHANCE)
+        interceptor = self.first_on_path(rows, path_position, intercepts)
+        possessor = np.where(interceptor >= 0, interceptor, receiver)
+
+        self.puck_player[rows] = possessor
+        self.puck_zone[rows] = zones[games, possessor]
+
+    def skate(self, rows: np.ndarray, skater: int) -> None:
+        """Move the skater slot to a random adjacent zone in each game in rows."""
+        current = self.zone[rows, skater]
+        choice = (self.rng.random(len(rows)) * self.degree[current]).astype(np.int64)
+        new_zone = self.neighbours[current, choice]
+
+        self.zone[rows, skater] = new_zone
+        self.arrival[rows, skater] = self.sequence
+        self.sequence += 1
+
+        carrying = self.puck_player[rows] == skater
+        self.puck_zone[rows[carrying]] = new_zone[carrying]
+
+    def add_possession(self, rows: np.ndarray) -> None:
+        """Add the puck player of each game in rows to its possession stack."""
+        puck_player = self.puck_player[rows]
+        new = (puck_player >= 0) & (puck_player != self.stack_top[rows])
+        rows = rows[new]
+        self.stack_prev[rows] = self.stack_top[rows]
+        self.stack_top[rows] = puck_player[new]
+
+    def get_boxscores(self) -> List[BoxScore]:
+        """Return a BoxScore for every game, in the same order as the matchups."""
+        boxscores = []
+        for g, (home, away) in enumerate(self.matchups):
+            boxscore = BoxScore(home, away, self.players_by_id)
+            boxscore.add_counts(self.counts[g])
+            boxscores.append(boxscore)
+        return boxscores
+
+
+def run_batch(
+    matchups: List[List[Team]],
+    players_by_id: Dict[str, Pawn],
+    seed: int = None,
+    config: GameConfig = None,
+) -> List:
+    """
+    Run a batch of games and return the BoxScore and final period of each game.
+
+    Args:
+        matchups (List[List[Team]]): a list of [home-team, away-team] pairs, one per game.
+        players_by_id (Dict[str, Pawn]): a dict containing every Pawn in the games keyed by id.
+        seed (int): the seed used for the random number generator. Default = None.
+        config (GameConfig): the length of the games and the resolution of their clock. Default = None, the
+            default GameConfig.
+    Returns:
+        a list of [boxscore, period] for each game, in the same order as the matchups.
+    """
+    batch = BatchGameManager(matchups, players_by_id, seed=seed, config=config)
+    batch.run()
+    return [
+        [boxscore, int(period)]
+        for boxscore, period in zip(batch.get_boxscores(), batch.period)
+    ]
@@ -0,0 +1,107 @@
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+from hoki.league_stats import LeagueStats
+
+# the least number of seconds between two checkpoints of a season
+CHECKPOINT_INTERVAL = 30.0
+
+# the fields of a SeasonCheckpoint, in the order they are saved
+CHECKPOINT_FIELDS = [
+    "year",
+    "n_games",
+    "first_seed",
+    "days",
+    "games",
+    "player_counts",
+    "team_counts",
+    "duration_counts",
+]
+
+
+@dataclass
+class SeasonCheckpoint:
+    """
+    The progress of a season, saved by League.run_season so an interrupted season can resume where it stopped.
+    A season is run a game day at a time, so the completed games are always the first games of the schedule and
+    only the number of completed game days needs to be kept, along with the combined stats of their games.
+
+    A checkpoint is saved to a temporary file that replaces the last checkpoint once it is written, so a crash
+    while saving leaves the last checkpoint as it was.
+
+    Attributes:
+        year (int): the year of the league the season is for.
+        n_games (int): the number of games in the season.
+        first_seed (int): the seed of the first game of the season, which tells seasons of the same league but a
+            different seed apart.
+        days (int): the number of completed game days.
+        games (int): the number of completed games.
+        player_counts (np.ndarray): the PLAYER_STATS_NAMES counters of each player over the completed games.
+        team_counts (np.ndarray): the TEAM_STATS_NAMES counters of each team over the completed games.
+        duration_counts (np.ndarray): the game duration histogram of the completed games.
+    """
+
+    year: int
+    n_games: int
+    first_seed: int
+    days: int
+    games: int
+    player_counts: np.ndarray
+    team_counts: np.ndarray
+    duration_counts: np.ndarray
+
+    @classmethod
+    def from_stats(
+        cls, year: int, n_games: int, first_seed: int, days: int, stats: LeagueStats
+    ) -> "SeasonCheckpoint":
+        """Create a checkpoint of the completed game days of a season from the LeagueStats of their games."""
+        return cls(
+            year=year,
+            n_games=n_games,
+            first_seed=first_seed,
+            days=days,
+            games=stats.games,
+            player_counts=stats.player_counts,
+            team_counts=stats.team_counts,
+            duration_counts=stats.duration_counts,
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "SeasonCheckpoint":
+        """Load a SeasonCheckpoint saved with SeasonCheckpoint.save."""
+        with np.load(path) as data:
+            values = {name: data[name] for name in CHECKPOINT_FIELDS}
+        for name in ["year", "n_games", "first_seed", "days", "games"]:
+            values[name] = int(values[name])
+        return cls(**values)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Save the checkpoint to an uncompressed .npz file, replacing any checkpoint already there. The counters
+        are written as they are, compressing them would cost more than the write.
+        """
+        path = Path(path)
+        temp_path = path.with_name(path.name + ".tmp")
+        arrays = {name: getattr(self, name) for name in CHECKPOINT_FIELDS}
+        # a game seed is 64 random bits, which does not fit the int64 numpy would store it as
+        arrays["first_seed"] = np.uint64(self.first_seed)
+        with open(temp_path, "wb") as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def matches(self, year: int, n_games: int, first_seed: int) -> bool:
+        """Return True if the checkpoint is of the season of the given year, length and first game seed."""
+        return (self.year, self.n_games, self.first_seed) == (year, n_games, first_seed)
+
+    def restore(self, stats: LeagueStats) -> None:
+        """Add the stats of the completed games to an empty LeagueStats."""
+        stats.player_counts += self.player_counts
+        stats.team_counts += self.team_counts
+        stats.duration_counts += self.duration_counts
+        stats.games += self.games
@@ -0,0 +1,159 @@
+import struct
+from enum import IntEnum
+from typing import List
+
+import numpy as np
+
+# the fields of an event record, packed into 13 bytes
+EVENT_DTYPE = np.dtype(
+    [
+        ("tick", "<i4"),
+        ("period", "u1"),
+        ("type", "u1"),
+        ("actor", "i1"),
+        ("target", "<i4"),
+        ("zone", "<i2"),
+    ]
+)
+# the same layout for writing a record, packing a record is several times faster than assigning a numpy row
+EVENT_STRUCT = struct.Struct("<iBBbih")
+
+# the records an EventLog allocates to start with, and the most it keeps before the oldest are overwritten
+INITIAL_EVENTS = 256
+MAX_EVENTS = 4096
+
+
+class event_type(IntEnum):
+    FACEOFF = 0
+    SHOT = 1
+    GOAL = 2
+    PASS = 3
+    INTERCEPTION = 4
+    NOTE = 5
+
+
+# the text of each event type, without and with a target
+EVENT_TEXT = {
+    event_type.FACEOFF: (
+        "{actor} wins the faceoff",
+        "{actor} wins the faceoff against {target}",
+    ),
+    event_type.SHOT: ("{actor} shoots", "{actor} shoots, stopped by {target}"),
+    event_type.GOAL: ("{actor} scores", "{actor} scores, assisted by {target}"),
+    event_type.PASS: ("{actor} passes", "{actor} passes to {target}"),
+    event_type.INTERCEPTION: (
+        "{actor} is intercepted",
+        "{target} intercepts a pass from {actor}",
+    ),
+}
+
+
+class EventLog:
+    """
+    The events of a game as fixed width records packed into a byte buffer. The buffer starts small and doubles as
+    the game goes on, up to capacity records, after which it is a ring and each new event overwrites the oldest, so
+    the memory of a game's log is bounded whatever its length.
+
+    Nothing is formatted while the game runs, the text of an event is only rendered when it is read.
+
+    Attributes:
+        names (List[str]): the name of the player in each player slot, the actor and target of an event.
+        capacity (int): the most records kept.
+        size (int): the number of records allocated.
+        buffer (bytearray): the EVENT_DTYPE records, in the order they were written until the ring wraps.
+        count (int): the number of events recorded, including any that have been overwritten.
+        notes (List[str]): the text of each NOTE event, indexed by its target.
+
+    Args:
+        names (List[str]): the name of the player in each player slot. Default = None, players are named by slot.
+        capacity (int): the most records kept. Default = MAX_EVENTS.
+    """
+
+    def __init__(self, names: List[str] = None, capacity: int = MAX_EVENTS) -> None:
+        self.names = names
+        self.capacity = capacity
+        self.size = min(INITIAL_EVENTS, capacity)
+        self.buffer = bytearray(self.size * EVENT_DTYPE.itemsize)
+        self.count = 0
+        self.notes = []
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes allocated for the records."""
+        return len(self.buffer)
+
+    @property
+    def dropped(self) -> int:
+        """The number of the oldest events that have been overwritten."""
+        return max(self.count - self.capacity, 0)
+
+    def record(
+        self,
+        tick: int,
+        period: int,
+        kind: event_type,
+        actor: int = -1,
+        target: int = -1,
+        zone: int = -1,
+    ) -> None:
+        """
+        Record an event.
+
+        Args:
+            tick (int): the game clock of the period, the seconds remaining, when the event happened.
+            period (int): the period the event happened in.
+            kind (event_type): the type of the event.
+            actor (int): the player slot of the player making the play. Default = -1, no player.
+            target (int): the player slot of the player the play is made on. Default = -1, no player.
+            zone (int): the zone the event happened in. Default = -1, no zone.
+        """
+        if self.count == self.size and self.size < self.capacity:
+            grow = min(self.size, self.capacity - self.size)
+            self.buffer += bytes(grow * EVENT_DTYPE.itemsize)
+            self.size += grow
+        EVENT_STRUCT.pack_into(
+            self.buffer,
+            self.count % self.size * EVENT_DTYPE.itemsize,
+            tick,
+            period,
+            kind,
+            actor,
+            target,
+            zone,
+        )
+        self.count += 1
+
+    def note(self, tick: int, period: int, text: str) -> None:
+        """Record a NOTE event with free text."""
+        self.record(tick, period, event_type.NOTE, target=len(self.notes))
+        self.notes.append(text)
+
+    def events(self) -> np.ndarray:
+        """Return a copy of the records that are kept, oldest first."""
+        records = np.frombuffer(bytes(self.buffer), dtype=EVENT_DTYPE)
+        if self.count <= self.size:
+            return records[: self.count]
+        return np.roll(records, -(self.count % self.size))
+
+    def render(self, event: np.void) -> str:
+        """Return the text of an event record, '<period>:<tick>: <text>'."""
+        if event["type"] == event_type.NOTE:
+            text = self.notes[event["target"]]
+        else:
+            short, full = EVENT_TEXT[event_type(event["type"])]
+            text = (full if event["target"] >= 0 else short).format(
+                actor=self._name(event["actor"]), target=self._name(event["target"])
+            )
+        return f"{event['period']}:{event['tick']}: {text}"
+
+    def lines(self) -> List[str]:
+        """Return the text of every event that is kept, oldest first."""
+        return [self.render(event) for event in self.events()]
+
+    def _name(self, slot: int) -> str:
+        if self.names is None:
+            return f"player {slot}"
+        return self.names[slot]
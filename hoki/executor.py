@@ -0,0 +1,79 @@
+from multiprocessing import Pool, cpu_count
+from typing import Callable, Iterable, Iterator, List, TypeVar
+
+from hoki.ice_map import IceMap
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def warm_worker() -> None:
+    """Load what every game needs in a new worker process, so the first task does not pay for it."""
+    # the simulation modules are imported with this one, and the default rink topology is compiled once per process
+    IceMap()
+
+
+def _ping(worker: int) -> int:
+    return worker
+
+
+class SimulationExecutor:
+    """
+    A long lived pool of worker processes to run games in. The workers are started and warmed up once, then
+    shared by every season of every League given the executor, until it is shut down.
+
+    A League without an executor starts one for each season and shuts it down afterwards.
+
+    Attributes:
+        processes (int): the number of worker processes.
+        pool (multiprocessing.pool.Pool): the pool of workers, None until the executor is started.
+
+    Args:
+        processes (int): the number of worker processes. Default = None, one per CPU.
+    """
+
+    def __init__(self, processes: int = None) -> None:
+        self.processes = processes or cpu_count()
+        self.pool = None
+
+    def start(self) -> "SimulationExecutor":
+        """Start the workers, if they are not already running, and wait for them to be warmed up."""
+        if self.pool is None:
+            self.pool = Pool(self.processes, initializer=warm_worker)
+            # a task only runs once the initializer of its worker is done
+            self.pool.map(_ping, range(self.processes), chunksize=1)
+        return self
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the workers.
+
+        Args:
+            wait (bool): let the workers finish their tasks first, rather than stop them straight away. Default =
+                True. A run that was interrupted stops them straight away, the results of its tasks are not wanted.
+        """
+        if self.pool is not None:
+            if wait:
+                self.pool.close()
+            else:
+                self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def __enter__(self) -> "SimulationExecutor":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.shutdown(wait=exc_type is None)
+
+    def map(
+        self, func: Callable[[T], R], iterable: Iterable[T], chunksize: int = None
+    ) -> List[R]:
+        """Return func applied to every item, in order, run in the workers."""
+        return self.start().pool.map(func, iterable, chunksize)
+
+    def imap_unordered(
+        self, func: Callable[[T], R], iterable: Iterable[T], chunksize: int = 1
+    ) -> Iterator[R]:
+        """Yield func applied to every item, run in the workers, in the order they finish."""
+        return self.start().pool.imap_unordered(func, iterable, chunksize)
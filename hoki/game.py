@@ -1,12 +1,20 @@
 import time
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
+from hoki.event_log import EventLog, event_type
+from hoki.game_config import GameConfig
+from hoki.game_random import GameRandom
 from hoki.game_state import GameState
+from hoki.id_map import IdMap
 from hoki.ice_map import IceMap
+from hoki.occupancy import ZoneOccupancy
 from hoki.pawn import Pawn
 from hoki.player_manager import PlayerManager, player_action
+from hoki.scheduler import DecisionScheduler
+from hoki.skating import SkatingPlanner
 from hoki.team import Team
 
 # the number of seconds between game ticks
@@ -14,14 +22,83 @@ SLEEP = 0
 
 # the different stats to be tracked durring a game
 STATS_NAMES = ["goals", "assists", "shots", "faceoffs", "faceoffs-won"]
+# the column index of each stat in BoxScore.counts
+STAT_COLUMNS = {stat: idx for idx, stat in enumerate(STATS_NAMES)}
+# the stats that are tallied per team on the ScoreBoard
+SCORE_STATS = ["goals", "shots"]
+
+
+class ScoreBoard:
+    """
+    A class to keep a running tally of each teams goals and shots as the game events arrive.
+
+    Attributes:
+        teams (List[str]): The team names, the home team first.
+        totals (Dict[str, List[int]]): The running total of each SCORE_STATS keyed by stat, indexed by team.
+        listeners (List[Callable]): The callbacks to call when a team scores.
+
+    Args:
+        teams (List[str]): The names of the two teams, the home team first.
+    """
+
+    def __init__(self, teams: List[str]) -> None:
+        self.teams = list(teams)
+        self.totals = {stat: [0 for _ in self.teams] for stat in SCORE_STATS}
+        self.listeners = []
+
+    def subscribe(self, callback: Callable[[str, "ScoreBoard"], None]) -> None:
+        """Call callback(team, scoreboard) every time a team scores."""
+        self.listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[str, "ScoreBoard"], None]) -> None:
+        """Stop calling a subscribed callback."""
+        self.listeners.remove(callback)
+
+    def increment(self, team_idx: int, stat: str) -> None:
+        """Increment the teams running total of stat by 1 and notify the listeners of any goal."""
+        self.totals[stat][team_idx] += 1
+        if stat == "goals":
+            for callback in self.listeners:
+                callback(self.teams[team_idx], self)
+
+    def goals(self, team_idx: int) -> int:
+        """Return the number of goals scored by the team."""
+        return self.totals["goals"][team_idx]
+
+    def shots(self, team_idx: int) -> int:
+        """Return the number of shots taken by the team."""
+        return self.totals["shots"][team_idx]
+
+    def margin(self) -> int:
+        """Return the goal difference between the two teams."""
+        return abs(self.totals["goals"][0] - self.totals["goals"][1])
+
+    def is_tied(self) -> bool:
+        """Return True if the game is tied else False."""
+        return self.totals["goals"][0] == self.totals["goals"][1]
+
+    def leader(self) -> Optional[str]:
+        """Return the name of the team in the lead, if the game is tied return None."""
+        home, away = self.totals["goals"]
+        if home == away:
+            return None
+        return self.teams[0] if home > away else self.teams[1]
 
 
 class BoxScore:
     """
     A class to manage the a games score and stats.
 
+    The stats are kept as counters in a dense integer array with a row per player and a column per stat,
+    a DataFrame is only built when the stats or score are requested for reporting.
+
     Attributes:
-        stats (pd.DataFrame): A dataframe containing the stats for all the players.
+        teams (List[str]): The team names, the home team first.
+        player_ids (IdMap): The player id of each row in counts.
+        player_names (List[str]): The player name of each row in counts.
+        player_teams (List[str]): The team name of each row in counts.
+        counts (np.ndarray): An integer array of shape (players, STATS_NAMES) containing the stats.
+        scoreboard (ScoreBoard): The running per team goals and shots.
 
     Args:
         home (Team): The team with home ice advantage.
@@ -30,41 +107,75 @@ class BoxScore:
     """
 
     def __init__(self, home: Team, away: Team, players_by_id: Dict[int, Pawn]) -> None:
-        idx = 0
-        data = {}
-        for team in [home, away]:
+        self.teams = [home.name, away.name]
+        self.player_ids = IdMap()
+        self.player_names = []
+        self.player_teams = []
+        self.team_by_slot = []
+        for team_idx, team in enumerate([home, away]):
             for player_id in team.players:
-                data[idx] = [
-                    team.name,
-                    players_by_id[player_id].id,
-                    players_by_id[player_id].name,
-                ]
-                for _ in STATS_NAMES:
-                    data[idx].append(0)
-                idx += 1
-        self.stats = pd.DataFrame.from_dict(
-            data, orient="index", columns=["team", "player-id", "player"] + STATS_NAMES
-        )
+                self.player_ids.intern(players_by_id[player_id].id)
+                self.player_names.append(players_by_id[player_id].name)
+                self.player_teams.append(team.name)
+                self.team_by_slot.append(team_idx)
+        self.counts = np.zeros((len(self.player_ids), len(STATS_NAMES)), dtype=np.int64)
+        self.scoreboard = ScoreBoard(self.teams)
+
+    @property
+    def stats(self) -> pd.DataFrame:
+        """A DataFrame containing the stats for all the players."""
+        return self.get_stats()
 
     def increment_stat(self, player: str, stat: str) -> None:
         """Increment the players given statistic by 1."""
-        self.stats.loc[self.stats["player-id"] == player, stat] += 1
+        self.increment_slot(self.player_ids.index(player), stat)
+
+    def increment_slot(self, slot: int, stat: str) -> None:
+        """Increment the given statistic of the player in the slot by 1."""
+        self.counts[slot, STAT_COLUMNS[stat]] += 1
+        if stat in self.scoreboard.totals:
+            self.scoreboard.increment(self.team_by_slot[slot], stat)
+
+    def add_counts(self, counts: np.ndarray) -> None:
+        """
+        Add an array of stats, with the same shape and row order as self.counts, to the box score.
+
+        Args:
+            counts (np.ndarray): the stats to add.
+        """
+        self.counts += counts
+        for stat in self.scoreboard.totals:
+            column = counts[:, STAT_COLUMNS[stat]]
+            for slot, team_idx in enumerate(self.team_by_slot):
+                self.scoreboard.totals[stat][team_idx] += int(column[slot])
 
     def add_assist(self, player: str) -> None:
         """Increment the players assists by 1."""
-        self.increment_stat(player, "assists")
+        self.record_assist(self.player_ids.index(player))
 
     def add_shot(self, player: str, goal: bool = False) -> None:
         """Increment the players shots by one. If goal, increment its goals also."""
-        self.increment_stat(player, "shots")
-        if goal:
-            self.increment_stat(player, "goals")
+        self.record_shot(self.player_ids.index(player), goal)
 
     def add_faceoff(self, player: str, won: bool = False) -> None:
         """Increment the players faceoffs. If won, increment its won-faceoffs also."""
-        self.increment_stat(player, "faceoffs")
+        self.record_faceoff(self.player_ids.index(player), won)
+
+    def record_assist(self, slot: int) -> None:
+        """Increment the assists of the player in the slot by 1."""
+        self.increment_slot(slot, "assists")
+
+    def record_shot(self, slot: int, goal: bool = False) -> None:
+        """Increment the shots of the player in the slot by one. If goal, increment its goals also."""
+        self.increment_slot(slot, "shots")
+        if goal:
+            self.increment_slot(slot, "goals")
+
+    def record_faceoff(self, slot: int, won: bool = False) -> None:
+        """Increment the faceoffs of the player in the slot. If won, increment its won-faceoffs also."""
+        self.increment_slot(slot, "faceoffs")
         if won:
-            self.increment_stat(player, "faceoffs-won")
+            self.increment_slot(slot, "faceoffs-won")
 
     def get_score(self) -> pd.DataFrame:
         """
@@ -73,21 +184,16 @@ class BoxScore:
         Returns:
             a pd.DataFrame of the teams, goals, and shots.
         """
-        teams = self.stats["team"].unique()
         scores = {
-            "team": teams,
-            "goals": [
-                self.stats[self.stats["team"] == team]["goals"].sum() for team in teams
-            ],
-            "shots": [
-                self.stats[self.stats["team"] == team]["shots"].sum() for team in teams
-            ],
+            "team": self.teams,
+            "goals": list(self.scoreboard.totals["goals"]),
+            "shots": list(self.scoreboard.totals["shots"]),
         }
         return pd.DataFrame(data=scores)
 
     def is_tied(self) -> bool:
         """Return True if the game is tied else False."""
-        return len(self.get_score()["goals"].unique()) == 1
+        return self.scoreboard.is_tied()
 
     def get_score_dict(self) -> Dict:
         """Return a dict with the current games score."""
@@ -95,11 +201,15 @@ class BoxScore:
 
     def get_stats(self) -> pd.DataFrame:
         """Return the game stats."""
-        return self.stats
+        stats = pd.DataFrame(self.counts, columns=STATS_NAMES)
+        stats.insert(0, "player", self.player_names)
+        stats.insert(0, "player-id", list(self.player_ids))
+        stats.insert(0, "team", self.player_teams)
+        return stats
 
     def get_stats_dict(self):
         """Get the game stats as a dict."""
-        return self.stats.to_dict()
+        return self.get_stats().to_dict()
 
     def __str__(self) -> str:
         """Return the game score as a string."""
@@ -150,29 +260,68 @@ class GameManager:
     """
     A class that manages all the game actions.
 
+    The engine works on dense integer slots rather than the external pawn and team ids. Players are
+    slotted home team first, in the same order as the BoxScore rows, and the teams are slotted home
+    then away. The ids are only translated back when reporting.
+
     Attributes:
         teams_by_id (Dict[int, Team]): a dict of Team keyed by ids.
         players_by_id (Dict[int, Pawn]): a dict of Pawn keyed by ids.
+        team_ids (IdMap): the team name of each team slot.
+        player_ids (IdMap): the pawn id of each player slot.
+        players (List[Pawn]): the Pawn in each player slot.
+        ice_map (IceMap): The rink the game is played on.
         home_team (Team): The team with the home ice advantage.
         away_team (Team): The visiting team.
         boxscore (BoxScore): The current game score and player stats.
         puck (Puck): The puck state.
-        timer (int): The number of second for each period. Default = 30.
-        game_ticks (int): The number of seconds to dectement each game tick. Default = 1.
-        num_periods (int): The total number of periods to play before overtime. Default = 3.
+        config (GameConfig): the length of the game and the resolution of its clock.
+        timer (int): The number of second for each period, from the config.
+        game_tick (int): The number of seconds to dectement each game tick, from the config.
+        num_periods (int): The total number of periods to play before overtime, from the config.
         completed (bool): True if the game is over, else False. Default = False.
         possession_stack (PossessionStack): The stack to manage the player possession.
         lineups (pd.DataFrame): A dataframe containing all players and their possitions.
+        skating_planner (SkatingPlanner): plans where skaters move, None if they skate at random.
+        rng (GameRandom): the random number stream of the game.
         state (pd.DataFrame): The current game state.
+        scheduler (DecisionScheduler): the next decision of each player in event driven mode, None in tick mode.
+        decision_ticks (int): the number of game ticks a decision lasts, from the config. In tick mode every player
+            decides on the ticks that are a multiple of it, in event driven mode each player's decisions are
+            scheduled that many ticks apart, so both modes play the same game.
+        ticks (int): the number of game ticks run, including the tick between two periods.
 
     Args:
         home_team (Team): The Team to grant home ice advantage.
         away_team (Team): The visiting Team.
         pawns (List[Pawns]): A list of all Pawns in the game.
+        ice_map (IceMap): The rink to play on. Default = None, the default rink.
+        plan_skating (bool): Skate towards the puck or the goal around the opponents, rather than to a random
+            adjacent zone. Default = False, unless the config plans skating.
+        rng (GameRandom): the random number stream of the game. Default = None, a stream seeded from the global
+            random module.
+        config (GameConfig): the length of the game and the resolution of its clock. Default = None, the default
+            GameConfig. An event driven game only runs the ticks where a player decides, rather than deciding for
+            every player on every tick. A player's run of NOTHING decisions is drawn up front and skipped, so the
+            actions of each player follow the same distribution as in tick mode, from a different draw of the
+            random stream. Players choose an action other than NOTHING on most decisions and tick mode already
+            skips the decisions between two multiples of decision_ticks, so an event driven game runs at about
+            the speed of a tick mode game with the same config, and no faster at one tick decisions. A game only
+            gets cheaper with a larger decision_ticks, and that plays a different game with fewer decisions.
     """
 
-    def __init__(self, home_team: Team, away_team: Team, pawns: List[Pawn]) -> None:
-        self.ice_map = IceMap()
+    def __init__(
+        self,
+        home_team: Team,
+        away_team: Team,
+        pawns: List[Pawn],
+        ice_map: IceMap = None,
+        plan_skating: bool = False,
+        rng: GameRandom = None,
+        config: GameConfig = None,
+    ) -> None:
+        self.ice_map = ice_map if ice_map is not None else IceMap()
+        self.rng = rng if rng is not None else GameRandom.from_global()
         self.posession_stack = PossessionStack()
 
         self.teams_by_id = {
@@ -180,29 +329,41 @@ class GameManager:
             away_team.name: away_team,
         }
         self.players_by_id = {player.id: player for player in pawns}
-        self.player_manager = PlayerManager(self.players_by_id, self.ice_map)
         self.home_team = home_team
         self.away_team = away_team
 
+        self.team_ids = IdMap([home_team.name, away_team.name])
+        self.player_ids = IdMap(
+            player_id for team in [home_team, away_team] for player_id in team.players
+        )
+        self.players = [self.players_by_id[player_id] for player_id in self.player_ids]
+
         self.boxscore = BoxScore(self.home_team, self.away_team, self.players_by_id)
 
-        self.timer = 30
-        self.game_tick = 1
-        self.num_periods = 3
+        self.config = config if config is not None else GameConfig()
+        self.timer = self.config.timer
+        self.game_tick = self.config.game_tick
+        self.num_periods = self.config.num_periods
+        self.decision_ticks = self.config.decision_ticks
+        self.ticks = 0
         self.completed = False
 
         self.lineups = self._generate_lineups()
 
-        players_by_team = {
-            team: self.teams_by_id[team].players for team in self.teams_by_id
-        }
-        team_by_player = {
-            pid: tid for tid in players_by_team for pid in players_by_team[tid]
-        }
-        zones_by_player = self.ice_map.get_initial_player_zones(self.lineups)
-        player_by_zone = {z: [] for z in self.ice_map.zones}
-        for p in zones_by_player:
-            player_by_zone[zones_by_player[p]].append(p)
+        players_by_team = [
+            [self.player_ids.index(player_id) for player_id in team.players]
+            for team in [home_team, away_team]
+        ]
+        team_by_player = [0 for _ in self.player_ids]
+        for team, players in enumerate(players_by_team):
+            for player in players:
+                team_by_player[player] = team
+        initial_zones = self.ice_map.get_initial_player_zones(self.lineups)
+        zones_by_player = [initial_zones[player_id] for player_id in self.player_ids]
+        player_by_zone = [[] for _ in self.ice_map.zones]
+        for player_id in self.lineups["player-id"]:
+            player = self.player_ids.index(player_id)
+            player_by_zone[zones_by_player[player]].append(player)
 
         self.state = GameState(
             puck_player=None,
@@ -211,10 +372,30 @@ class GameManager:
             team_by_player=team_by_player,
             player_by_zone=player_by_zone,
             zone_by_player=zones_by_player,
+            occupancy=ZoneOccupancy(team_by_player, zones_by_player),
             boxscore=self.boxscore,
             time=self.timer,
             period=1,
+            events=EventLog([player.name for player in self.players]),
         )
+        self.skating_planner = (
+            SkatingPlanner(self.ice_map.topology, self.state)
+            if plan_skating or self.config.plan_skating
+            else None
+        )
+        self.player_manager = PlayerManager(
+            self.players,
+            self.ice_map,
+            players_by_team,
+            self.skating_planner,
+            self.rng,
+        )
+        self.scheduler = None
+        if self.config.event_driven:
+            self.scheduler = DecisionScheduler()
+            for player_id in range(len(self.players)):
+                idle = self.player_manager.player_idle_decisions(player_id, self.state)
+                self.scheduler.schedule(player_id, idle * self.decision_ticks)
 
     def _generate_lineups(self) -> pd.DataFrame:
         """
@@ -243,8 +424,16 @@ class GameManager:
         )
 
     def log_event(self, text: str) -> None:
-        """Add the event text to the game_log."""
-        self.state.game_log.append(f"{self.state.period}:{self.state.time}: {text}")
+        """Add a note with the event text to the game events."""
+        self.state.events.note(self.state.time, self.state.period, text)
+
+    def record_event(
+        self, kind: event_type, actor: int, target: int = -1, zone: int = -1
+    ) -> None:
+        """Record an event at the current game time, see EventLog.record."""
+        self.state.events.record(
+            self.state.time, self.state.period, kind, actor, target, zone
+        )
 
     def reset_puck(self):
         """Reset the puck, setting the zone to OUT_OF_PLAY and the player to None."""
@@ -262,13 +451,16 @@ class GameManager:
 
     def increment_state(self) -> bool:
         """
-        increment the game by 1 game_tick and return True if the game is over.
+        increment the game by 1 game_tick and return True if the game is over. In event driven mode the ticks
+        until the next decision are skipped, up to the end of the period, as if nothing happened on them.
         """
         self.run_state()
+        ticks = 1
         if self.state.time > 0:
             if self.state.overtime and not self.is_tied():
                 return True
-            self.state.time -= self.game_tick
+            ticks = self.ticks_to_next_decision()
+            self.state.time -= self.game_tick * ticks
         elif self.state.period < self.num_periods:
             self.state.period += 1
             self.state.time = self.timer
@@ -278,26 +470,66 @@ class GameManager:
             self.state.overtime = True
         else:
             return True
+        self.ticks += ticks
+        if self.scheduler is not None:
+            self.scheduler.advance(ticks)
+
+    def ticks_to_next_decision(self) -> int:
+        """
+        Return the number of game ticks to the next tick with anything to run, 1 in tick mode. A faceoff is due on
+        the next tick and the last tick of a period is always run.
+        """
+        if self.scheduler is None or self.state.puck_zone is None:
+            return 1
+        period_ticks = -(-self.state.time // self.game_tick)
+        return max(1, min(self.scheduler.ticks_to_next(), period_ticks))
+
+    def schedule_decision(self, player_id: int, idle: int) -> None:
+        """Schedule the next decision of a player, after its current decision and the idle ones after it."""
+        self.scheduler.schedule(player_id, (1 + idle) * self.decision_ticks)
 
     def run_state(self) -> None:
         """
         Run the current game state and then sleep for SLEEP.
         """
+        if self.skating_planner is not None:
+            self.skating_planner.begin_tick()
         if self.state.puck_zone is None:
             winner_id, loser_id = self.player_manager.face_off(self.state)
-            self.boxscore.add_faceoff(winner_id, True)
-            self.boxscore.add_faceoff(loser_id)
+            self.boxscore.record_faceoff(winner_id, True)
+            self.boxscore.record_faceoff(loser_id)
             self.state.puck_player = winner_id
             self.state.puck_zone = self.state.zone_by_player[winner_id]
-
-        for player_id in self.players_by_id:
-            action = self.player_manager.player_choose_action(player_id, self.state)
+            self.record_event(
+                event_type.FACEOFF, winner_id, loser_id, self.state.puck_zone
+            )
+
+        if self.scheduler is not None:
+            deciding = self.scheduler.pop_due()
+        elif self.ticks % self.decision_ticks == 0:
+            deciding = range(len(self.players))
+        else:
+            deciding = ()
+        for player_id in deciding:
+            if self.scheduler is None:
+                action = self.player_manager.player_choose_action(player_id, self.state)
+            else:
+                action, idle = self.player_manager.player_choose_next_action(
+                    player_id, self.state
+                )
+                self.schedule_decision(player_id, idle)
 
             if action == player_action.SHOOT:
                 goal, puck_posessor, zone_id = self.player_manager.player_action_shoot(
                     player_id, self.state
                 )
-                self.boxscore.add_shot(player_id, goal)
+                self.boxscore.record_shot(player_id, goal)
+                self.record_event(
+                    event_type.SHOT,
+                    player_id,
+                    -1 if goal else puck_posessor,
+                    self.state.zone_by_player[player_id],
+                )
                 if goal:
                     assist_id = self.posession_stack.get_assist()
                     if (
@@ -305,7 +537,10 @@ class GameManager:
                         and self.state.team_by_player[assist_id]
                         == self.state.team_by_player[player_id]
                     ):
-                        self.boxscore.add_assist(assist_id)
+                        self.boxscore.record_assist(assist_id)
+                    else:
+                        assist_id = -1
+                    self.record_event(event_type.GOAL, player_id, assist_id, zone_id)
                     self.reset_puck()
                 else:
                     self.state.puck_player = puck_posessor
@@ -315,6 +550,16 @@ class GameManager:
                 receiver_id, zone_id = self.player_manager.player_action_pass(
                     player_id, self.state
                 )
+                intercepted = (
+                    self.state.team_by_player[receiver_id]
+                    != self.state.team_by_player[player_id]
+                )
+                self.record_event(
+                    event_type.INTERCEPTION if intercepted else event_type.PASS,
+                    player_id,
+                    receiver_id,
+                    zone_id,
+                )
                 self.state.puck_player = receiver_id
                 self.state.puck_zone = zone_id
 
@@ -334,6 +579,9 @@ class GameManager:
         self.state.player_by_zone[old_zone_id].remove(player_id)
         self.state.player_by_zone[zone_id].append(player_id)
         self.state.zone_by_player[player_id] = zone_id
+        self.state.occupancy.move(player_id, old_zone_id, zone_id)
+        if self.skating_planner is not None:
+            self.skating_planner.move(player_id, old_zone_id, zone_id)
 
         if self.state.puck_player == player_id:
             self.state.puck_zone = self.state.zone_by_player[player_id]
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+
+# the decisions each player makes in a period of the default GameConfig, the pace the game was tuned at
+DECISIONS_PER_PERIOD = 30
+
+
+@dataclass(frozen=True)
+class GameConfig:
+    """
+    The length of a game and the resolution of its clock.
+
+    Every player decides once every decision_ticks game ticks, in tick mode and event driven mode alike, and the
+    cost of a game grows linearly with its decisions, timer / game_tick / decision_ticks a period. An event driven
+    game skips the ticks where no player decides, it plays the same game as tick mode at about the same speed. A
+    longer period costs linearly more to run, unless its decisions last longer, which changes the game: fewer
+    decisions make fewer shots and goals, see paced.
+
+    Attributes:
+        timer (int): the number of seconds in each period. Default = 30.
+        game_tick (int): the number of seconds of each game tick. Default = 1.
+        num_periods (int): the number of periods before overtime. Default = 3.
+        decision_ticks (int): the number of game ticks a decision lasts, players decide every decision_ticks
+            ticks. Default = 1.
+        event_driven (bool): skip the ticks where no player decides, see GameManager. Default = False.
+        plan_skating (bool): skate towards the puck or the goal around the opponents with a SkatingPlanner,
+            rather than to a random adjacent zone. Default = False.
+    """
+
+    timer: int = 30
+    game_tick: int = 1
+    num_periods: int = 3
+    decision_ticks: int = 1
+    event_driven: bool = False
+    plan_skating: bool = False
+
+    def __post_init__(self) -> None:
+        if min(self.timer, self.game_tick, self.num_periods, self.decision_ticks) < 1:
+            raise ValueError(
+                f"every setting of a GameConfig must be positive, got {self}"
+            )
+        if self.timer % self.game_tick:
+            raise ValueError(
+                f"timer {self.timer} is not a whole number of game ticks of {self.game_tick}"
+            )
+
+    @property
+    def period_ticks(self) -> int:
+        """The number of game ticks in a period."""
+        return self.timer // self.game_tick
+
+    @classmethod
+    def paced(
+        cls,
+        timer: int,
+        game_tick: int = 1,
+        num_periods: int = 3,
+        decisions_per_period: int = DECISIONS_PER_PERIOD,
+    ) -> "GameConfig":
+        """
+        Return an event driven GameConfig where each player makes about decisions_per_period decisions a period,
+        however long the period and fine the clock.
+
+        Pacing is not an engine speedup, it plays a different game than one tick decisions over the same period.
+        The stats stay on the scale of the default 30 second period rather than growing with the period, about 214
+        shots a game at 1,200 second periods rather than 8,671, and the game costs about as much to run as a
+        default one because it runs about as many decisions.
+
+        Args:
+            timer (int): the number of seconds in each period.
+            game_tick (int): the number of seconds of each game tick. Default = 1.
+            num_periods (int): the number of periods before overtime. Default = 3.
+            decisions_per_period (int): the decisions each player makes in a period. Default = DECISIONS_PER_PERIOD.
+        Returns:
+            the GameConfig.
+        """
+        period_ticks = timer // game_tick
+        return cls(
+            timer=timer,
+            game_tick=game_tick,
+            num_periods=num_periods,
+            decision_ticks=max(1, period_ticks // decisions_per_period),
+            event_driven=True,
+        )
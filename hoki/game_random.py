@@ -0,0 +1,133 @@
+import itertools
+import operator
+import random
+from typing import Iterable, Iterator, Sequence, TypeVar
+
+import numpy as np
+
+# the number of random numbers drawn from the generator at a time
+BLOCK_SIZE = 4096
+
+# the streams a league seed is split into, so the schedules and the games never draw from the same seeds
+SCHEDULE_STREAM, GAME_STREAM = range(2)
+
+# the odd constant splitmix64 steps its counter by, and the multipliers of its output function
+GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+MIX_MULTIPLIERS = (np.uint64(0xBF58476D1CE4E5B9), np.uint64(0x94D049BB133111EB))
+
+T = TypeVar("T")
+
+
+class GameRandom:
+    """
+    A per game random number stream. Uniform floats are drawn from a NumPy generator in blocks of block_size and
+    chained into a single iterator, so each draw in the tick loop is one C level iterator step rather than a call
+    into the random module. Every other draw is derived from one float, so each draw advances the stream by
+    exactly one number.
+
+    A game seeded with the same seed always plays out the same way, whichever process or order it is run in. Each
+    float is one step of the generator, so the stream can be restarted at any position, see GameRandom.at.
+
+    Attributes:
+        seed (int): the seed the stream was created with, None if it was seeded from the OS.
+        block_size (int): the number of floats drawn at a time.
+        generator (np.random.Generator): the generator the blocks are drawn from.
+        random (Callable[[], float]): return a float in [0, 1).
+        blocks (int): the number of blocks drawn.
+
+    Args:
+        seed (int): the seed of the stream. Default = None, seeded from the OS.
+        block_size (int): the number of floats drawn at a time. Default = BLOCK_SIZE.
+    """
+
+    def __init__(self, seed: int = None, block_size: int = BLOCK_SIZE) -> None:
+        self.seed = seed
+        self.block_size = block_size
+        self.generator = np.random.default_rng(seed)
+        self.blocks = 0
+        self._block = iter(())
+        blocks = iter(self._draw_block, None)
+        self.random = itertools.chain.from_iterable(blocks).__next__
+
+    @classmethod
+    def at(cls, seed: int, position: int, block_size: int = BLOCK_SIZE) -> "GameRandom":
+        """
+        Return the stream of a seed restarted at a position, as if position floats had been drawn from it. The
+        generator jumps ahead to the block of the position in O(log position) steps, so only the floats before it
+        in its block are drawn.
+
+        Args:
+            seed (int): the seed of the stream.
+            position (int): the number of floats drawn before the restart.
+            block_size (int): the number of floats drawn at a time. Default = BLOCK_SIZE.
+        Returns:
+            the restarted GameRandom.
+        """
+        rng = cls(seed, block_size)
+        blocks, offset = divmod(position, block_size)
+        rng.generator.bit_generator.advance(blocks * block_size)
+        rng.blocks = blocks
+        for _ in range(offset):
+            rng.random()
+        return rng
+
+    @classmethod
+    def from_global(cls, block_size: int = BLOCK_SIZE) -> "GameRandom":
+        """Return a stream seeded from the global random module, so random.seed still makes games repeatable."""
+        return cls(random.getrandbits(64), block_size)
+
+    @property
+    def position(self) -> int:
+        """The number of floats drawn from the stream."""
+        return self.blocks * self.block_size - operator.length_hint(self._block)
+
+    def _draw_block(self) -> Iterator[float]:
+        # the chain steps through this iterator itself, so what is left of the block can be measured
+        self._block = iter(self.generator.random(self.block_size).tolist())
+        self.blocks += 1
+        return self._block
+
+    def uniform(self, a: float, b: float) -> float:
+        """Return a float in [a, b)."""
+        return a + (b - a) * self.random()
+
+    def randint(self, a: int, b: int) -> int:
+        """Return an int in [a, b], including both end points."""
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq: Sequence[T]) -> T:
+        """Return a random element of a non-empty sequence."""
+        return seq[int(self.random() * len(seq))]
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """The splitmix64 output function, a bijection of 64 bit ints that scrambles nearby ints apart."""
+    x = (x ^ (x >> np.uint64(30))) * MIX_MULTIPLIERS[0]
+    x = (x ^ (x >> np.uint64(27))) * MIX_MULTIPLIERS[1]
+    return x ^ (x >> np.uint64(31))
+
+
+def derive_seeds(seed: int, key: Iterable[int], counters: Iterable[int]) -> np.ndarray:
+    """
+    Return a 64 bit seed for each counter under a root seed and a key, such as every game of a season of a league
+    with derive_seeds(league_seed, (GAME_STREAM, season), games). The seed and key are hashed into a base, and
+    each counter is stepped from the base and scrambled like a splitmix64 generator, so the seed of any counter is
+    computed on its own, without drawing the seeds before it, and distinct counters always get distinct seeds.
+
+    Args:
+        seed (int): the root seed, an int of any size.
+        key (Iterable[int]): the non negative ints that pick the stream under the root seed.
+        counters (Iterable[int]): the non negative ints to derive a seed for.
+    Returns:
+        the uint64 seed of each counter.
+    """
+    seed = abs(seed)
+    words = [
+        (seed >> shift) & 0xFFFFFFFFFFFFFFFF
+        for shift in range(0, max(seed.bit_length(), 1), 64)
+    ]
+    base = np.zeros(1, dtype=np.uint64)
+    for word in words + list(key):
+        base = _mix64((base ^ np.uint64(word)) + GOLDEN_GAMMA)
+    counters = np.asarray(counters, dtype=np.uint64) + np.uint64(1)
+    return _mix64(base + counters * GOLDEN_GAMMA)
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from hoki.game_config import GameConfig
+
+
+@dataclass(frozen=True)
+class GameSpec:
+    """
+    The few integers a worker needs to run a game, the teams are looked up in the RosterTable the worker
+    attached to.
+
+    Attributes:
+        home (int): the index of the home team.
+        away (int): the index of the away team.
+        seed (int): the seed of the games random number stream.
+    """
+
+    home: int
+    away: int
+    seed: int
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """
+    The compact record of a completed game sent back from a worker.
+
+    Attributes:
+        home (int): the index of the home team.
+        away (int): the index of the away team.
+        counts (np.ndarray): the stat counters of every player, shape (players, STATS_NAMES), home players first
+            in roster order then the away players.
+        goals (Tuple[int, int]): the final home and away goals.
+        period (int): the period the game ended in.
+        num_periods (int): the number of periods before overtime. Default = the GameConfig default.
+    """
+
+    home: int
+    away: int
+    counts: np.ndarray
+    goals: Tuple[int, int]
+    period: int
+    num_periods: int = GameConfig.num_periods
+
+    @classmethod
+    def from_boxscore(
+        cls,
+        boxscore,
+        period: int,
+        home: int,
+        away: int,
+        num_periods: int = GameConfig.num_periods,
+    ) -> "GameResult":
+        """Create a GameResult from a completed games BoxScore, final period, team indices and regulation periods."""
+        return cls(
+            home=home,
+            away=away,
+            counts=boxscore.counts.astype(np.int32),
+            goals=(boxscore.scoreboard.goals(0), boxscore.scoreboard.goals(1)),
+            period=int(period),
+            num_periods=int(num_periods),
+        )
+
+    @property
+    def overtime(self) -> bool:
+        """True if the game was decided in overtime."""
+        return self.period > self.num_periods
+
+    @property
+    def winner(self) -> int:
+        """The index of the winning team, 0 for home and 1 for away."""
+        return 0 if self.goals[0] > self.goals[1] else 1
@@ -3,6 +3,9 @@ from typing import List
 
 import pandas as pd
 
+from hoki.event_log import EventLog
+from hoki.occupancy import ZoneOccupancy
+
 
 @dataclass
 class GameState:
@@ -10,20 +13,23 @@ class GameState:
     A dataclass containg the game state data
     """
 
-    # the player id of the puck
+    # the player slot of the puck
     puck_player: int
     # the zone id of the puck
     puck_zone: int
 
-    # a dict of lists of player ids keyed by team id
-    players_by_team: dict
-    # a dict of team ids keyed by player id
-    team_by_player: dict
+    # a list of lists of player slots indexed by team slot
+    players_by_team: List[List[int]]
+    # a list of team slots indexed by player slot
+    team_by_player: List[int]
+
+    # a list of lists of player slots indexed by zone id
+    player_by_zone: List[List[int]]
+    # a list of zone ids indexed by player slot
+    zone_by_player: List[int]
 
-    # a dict of lists of player ids keyed by zone id
-    player_by_zone: dict
-    # a dict of zone ids keyed by player id
-    zone_by_player: dict
+    # the bitmask occupancy of each team, kept in sync with player_by_zone
+    occupancy: ZoneOccupancy
 
     # the current score and stats
     boxscore: pd.DataFrame
@@ -34,4 +40,10 @@ class GameState:
     # if the game is currently in overtime
     overtime: bool = False
 
-    game_log: List[str] = field(default_factory=lambda: [])
+    # the events of the game, see EventLog
+    events: EventLog = field(default_factory=EventLog)
+
+    @property
+    def game_log(self) -> List[str]:
+        """The text of every event of the game that is kept, rendered from the events."""
+        return self.events.lines()
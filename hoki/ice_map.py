@@ -1,54 +1,70 @@
+from typing import Dict
+
 from hoki.pawn import position as pos
+from hoki.rink import (
+    DEFAULT_ZONES,
+    RinkTopology,
+    get_topology,
+    shortest_path_tree,
+    shortest_paths,
+    trace_path,
+)
+from hoki.skating import OPPONENT_COST, SKATE_COST
 
 
 class IceMap:
-    zones = {
-        0: {"connections": [2, 3, 4, 5], "shot-weight": 2},
-        1: {"connections": [3, 4], "shot-weight": 1},
-        2: {"connections": [0, 3, 6, 8], "shot-weight": 2},
-        3: {"connections": [0, 1, 2, 4, 6], "shot-weight": 1},
-        4: {"connections": [0, 1, 3, 5, 7], "shot-weight": 1},
-        5: {"connections": [0, 4, 7, 12], "shot-weight": 2},
-        6: {"connections": [2, 3, 7, 8, 9], "shot-weight": 1},
-        7: {"connections": [4, 5, 6, 11, 12], "shot-weight": 1},
-        8: {"connections": [2, 9, 15], "shot-weight": 2},
-        9: {"connections": [6, 8, 10, 13], "shot-weight": 1},
-        10: {"connections": [9, 11], "shot-weight": 1},
-        11: {"connections": [7, 10, 12, 14], "shot-weight": 1},
-        12: {"connections": [5, 11, 18], "shot-weight": 2},
-        13: {"connections": [9, 14, 15, 16], "shot-weight": 1},
-        14: {"connections": [11, 13, 17, 18], "shot-weight": 1},
-        15: {"connections": [8, 13, 16, 20], "shot-weight": 2},
-        16: {"connections": [13, 15, 17, 19, 20], "shot-weight": 1},
-        17: {"connections": [14, 16, 18, 19, 20], "shot-weight": 1},
-        18: {"connections": [12, 14, 17, 20], "shot-weight": 2},
-        19: {"connections": [16, 17], "shot-weight": 1},
-        20: {"connections": [15, 16, 17, 18], "shot-weight": 2},
+    """
+    A class that holds the rink a game is played on.
+
+    The zone layout is compiled into a RinkTopology that is shared, read-only, by every IceMap with the same
+    layout in the process, so creating an IceMap does not recalculate the shot paths.
+
+    Attributes:
+        zones (Dict): the zone layout, {zone id: {"connections": [zone ids], "shot-weight": int}}.
+        topology (RinkTopology): the compiled rink.
+        shot_paths (ShotPaths): the shot path between every pair of zones, calculated lazily.
+
+    Args:
+        zones (Dict): the zone layout. Default = None, the default rink.
+        topology (RinkTopology): a compiled rink to use instead of compiling the zones. Default = None.
+    """
+
+    zones = DEFAULT_ZONES
+
+    formation = {
+        pos.GOALIE: 1,
+        pos.CENTRE: 10,
+        pos.WING_L: 9,
+        pos.WING_R: 11,
+        pos.DEFENCE_L: 6,
+        pos.DEFENCE_R: 7,
     }
 
-    def __init__(self) -> None:
-        self.shot_paths = self.calculate_shot_paths(self.zones)
+    def __init__(self, zones: Dict = None, topology: RinkTopology = None) -> None:
+        self.topology = topology if topology is not None else get_topology(zones)
+        if zones is not None:
+            self.zones = zones
+        elif topology is not None:
+            self.zones = topology.to_zones()
+        self.shot_paths = self.topology.shot_paths
+
+    def get_initial_zone(self, position, home):
+        # the away team lines up in the mirrored zones
+        mirror = len(self.zones) - 1
+        return int(
+            self.formation[position] if home else mirror - self.formation[position]
+        )
 
     def get_initial_player_zones(self, players_positions):
-        formation = {
-            pos.GOALIE: 1,
-            pos.CENTRE: 10,
-            pos.WING_L: 9,
-            pos.WING_R: 11,
-            pos.DEFENCE_L: 6,
-            pos.DEFENCE_R: 7,
-        }
         player_zones = {}
         for _, row in players_positions.iterrows():
-            player_zones[row["player-id"]] = int(
-                formation[row["position"]]
-                if row["home"]
-                else 20 - formation[row["position"]]
+            player_zones[row["player-id"]] = self.get_initial_zone(
+                row["position"], row["home"]
             )
         return player_zones
 
     def get_shot_path_between_zones(self, source_id, target_id):
-        return self.shot_paths[source_id][target_id]
+        return self.topology.get_shot_path(source_id, target_id)
 
     def calculate_shot_paths(self, zones):
         shot_paths = {}
@@ -57,36 +73,22 @@ class IceMap:
         return shot_paths
 
     def calculate_shortest_paths(self, source, zones):
-        unseen = list(zones.keys())
-        path_weights = {zone: {"dist": 1000000, "prev": None} for zone in zones}
-        path_weights[source]["dist"] = 0
-
-        done = False
-        while not done:
-            weights = [path_weights[n]["dist"] for n in unseen]
-            index = weights.index(min(weights))
-            prev = unseen[index]
-            for c in zones[prev]["connections"]:
-                new_dist = path_weights[prev]["dist"] + zones[c]["shot-weight"]
-                if new_dist < path_weights[c]["dist"]:
-                    path_weights[c]["dist"] = new_dist
-                    path_weights[c]["prev"] = prev
-            unseen.pop(index)
-            done = len(unseen) == 0
-
-        paths = {}
-        for zone in path_weights:
-            paths[zone] = [zone]
-            while paths[zone][-1] != source:
-                paths[zone].append(path_weights[paths[zone][-1]]["prev"])
-            paths[zone].reverse()
-        return paths
+        return shortest_paths(source, zones)
 
     def get_scate_path_to_zone(self, game_state, player, source_zone, target_zone):
-        pass
+        graph = self.calculate_weighted_graph(game_state, player)
+        return self.calculate_path(graph, source_zone, target_zone)
 
-    def calculate_weighted_graph(self, game_state, source_zone, target_zone):
-        pass
+    def calculate_weighted_graph(self, game_state, player):
+        # the cost of the player skating into each zone, see hoki.skating
+        team = game_state.team_by_player[player]
+        return [
+            SKATE_COST
+            + OPPONENT_COST
+            * sum(1 for p in players if game_state.team_by_player[p] != team)
+            for players in game_state.player_by_zone
+        ]
 
     def calculate_path(self, graph, source, target):
-        return []
+        _, previous = shortest_path_tree(source, self.topology.adjacency, graph)
+        return list(trace_path(previous, source, target)) or [source]
@@ -0,0 +1,52 @@
+from typing import Hashable, Iterable, Iterator
+
+
+class IdMap:
+    """
+    A class that interns external ids, such as pawn ids or team names, as dense integer indices 0..N-1.
+
+    The simulation core works on the indices and only translates back to the external ids when
+    reporting or saving.
+
+    Attributes:
+        ids (List[Hashable]): the external id of each index.
+        index_by_id (Dict[Hashable, int]): the index of each external id.
+
+    Args:
+        ids (Iterable[Hashable]): the external ids to intern, in index order. Default = ().
+    """
+
+    def __init__(self, ids: Iterable[Hashable] = ()) -> None:
+        self.ids = []
+        self.index_by_id = {}
+        for external_id in ids:
+            self.intern(external_id)
+
+    def intern(self, external_id: Hashable) -> int:
+        """Return the index of the external id, adding it to the end of the map if it is new."""
+        index = self.index_by_id.get(external_id)
+        if index is None:
+            index = len(self.ids)
+            self.index_by_id[external_id] = index
+            self.ids.append(external_id)
+        return index
+
+    def index(self, external_id: Hashable) -> int:
+        """Return the index of an interned external id. Raise a KeyError if it is unknown."""
+        return self.index_by_id[external_id]
+
+    def external(self, index: int) -> Hashable:
+        """Return the external id of an index."""
+        return self.ids[index]
+
+    def __len__(self) -> int:
+        """Return the number of interned ids."""
+        return len(self.ids)
+
+    def __contains__(self, external_id: Hashable) -> bool:
+        """Return True if the external id has been interned."""
+        return external_id in self.index_by_id
+
+    def __iter__(self) -> Iterator[Hashable]:
+        """Iterate over the external ids in index order."""
+        return iter(self.ids)
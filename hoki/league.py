@@ -1,14 +1,203 @@
-import itertools
 import random
-from multiprocessing import Pool
-from typing import List
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
-from hoki.game import STATS_NAMES, GameManager
+from hoki.batch_game import run_batch
+from hoki.checkpoint import CHECKPOINT_INTERVAL, SeasonCheckpoint
+from hoki.game import BoxScore, GameManager
+from hoki.game_config import GameConfig
+from hoki.game_random import GAME_STREAM, SCHEDULE_STREAM, GameRandom, derive_seeds
+from hoki.executor import SimulationExecutor
+from hoki.game_result import GameResult, GameSpec
+from hoki.id_map import IdMap
+from hoki.league_stats import (
+    duration_percentiles,
+    PLAYER_STATS_NAMES,
+    TEAM_STATS_NAMES,
+    LeagueStats,
+    PartialStats,
+    reduce_partials,
+)
 from hoki.pawn import Pawn
+from hoki.roster_table import RosterTable
+from hoki.schedule import RoundRobin
 from hoki.team import Team
 
+# the engines that can be used to run the games of a season
+ENGINES = ["scalar", "batch"]
+
+# the default number of games sent to a worker at a time by each engine
+CHUNK_SIZES = {"scalar": 32, "batch": 64}
+
+# the fewest games sent to a worker at a time by each engine, a BatchGameManager needs a few games to be worth it
+MIN_CHUNK_SIZES = {"scalar": 1, "batch": 8}
+
+# the (path, nonce) of the RosterTable a worker process is attached to, the table and the LeagueStats the games of
+# a batch are combined in, set by attach_roster
+_roster = {}
+
+
+def init_worker(path: str, layout: Dict) -> None:
+    """Attach a worker process to the league RosterTable, so a GameSpec only needs to index the teams."""
+    attach_roster(path, layout)
+
+
+def attach_roster(path: str, layout: Dict) -> None:
+    """
+    Attach a worker process to a RosterTable, unless it is already attached to it. A worker of a long lived
+    SimulationExecutor runs the seasons of many leagues, so it attaches to the table of each season the first
+    time it is given a task of that season. The file of a later season can reuse the path of an earlier one, so
+    the table attached to is checked against the nonce in the header of the file as well as its path.
+
+    Args:
+        path (str): the path of the RosterTable.
+        layout (Dict): the layout of the RosterTable.
+    """
+    key = (path, RosterTable.read_nonce(path, layout))
+    if _roster.get("key") == key:
+        return
+    table = RosterTable.attach(path, layout)
+    team_rows = [
+        np.asarray(table.team_players(t), dtype=np.intp)
+        for t in range(len(table.team_offsets) - 1)
+    ]
+    _roster["key"] = key
+    _roster["table"] = table
+    _roster["stats"] = LeagueStats(team_rows, len(table.stats))
+
+
+def run_game_spec(spec: GameSpec, config: GameConfig = None) -> GameResult:
+    """
+    Run a game with a GameManager in a worker process.
+
+    Args:
+        spec (GameSpec): the teams and seed of the game.
+        config (GameConfig): the length of the game and the resolution of its clock. Default = None, the default
+            GameConfig.
+    Returns:
+        the GameResult of the completed game.
+    """
+    table = _roster["table"]
+    home = table.get_team(spec.home)
+    away = table.get_team(spec.away)
+    pawns = [table.get_pawn(row) for row in home.players + away.players]
+    game = GameManager(home, away, pawns, rng=GameRandom(spec.seed), config=config)
+    game.run()
+    return GameResult.from_boxscore(
+        game.boxscore, game.state.period, spec.home, spec.away, game.num_periods
+    )
+
+
+def run_combined_task(
+    task: Tuple[str, Dict, str, List[GameSpec], int, GameConfig],
+) -> PartialStats:
+    """
+    Run a batch of games in a worker process and combine their stats into one PartialStats, so the batch sends
+    back a single message instead of a GameResult per game.
+
+    Args:
+        task (Tuple[str, Dict, str, List[GameSpec], int, GameConfig]): the path and layout of the RosterTable of
+            the season, the engine to run the games with, the GameSpec of each game, the seed of the batch, only
+            used by the "batch" engine, and the GameConfig of the games.
+    Returns:
+        the PartialStats of the batch.
+    """
+    path, layout, engine, specs, seed, config = task
+    attach_roster(path, layout)
+    stats = _roster["stats"]
+    if engine == "batch":
+        # the games of a batch run in lockstep, so each is timed as its share of the batch
+        start = time.perf_counter()
+        results = run_batch_specs(specs, seed, config)
+        duration = (time.perf_counter() - start) / len(specs)
+        for result in results:
+            stats.add_result(result, duration)
+    else:
+        for spec in specs:
+            start = time.perf_counter()
+            result = run_game_spec(spec, config)
+            stats.add_result(result, time.perf_counter() - start)
+    return stats.take_partial()
+
+
+def run_batch_specs(
+    specs: List[GameSpec], seed: int, config: GameConfig = None
+) -> List[GameResult]:
+    """
+    Run a batch of games in lockstep with a BatchGameManager in a worker process.
+
+    Args:
+        specs (List[GameSpec]): the teams of each game.
+        seed (int): the seed of the batch.
+        config (GameConfig): the length of the games and the resolution of their clock. Default = None, the
+            default GameConfig.
+    Returns:
+        the GameResult of each game, in the same order as the specs.
+    """
+    config = config if config is not None else GameConfig()
+    table = _roster["table"]
+    matchups = [
+        [table.get_team(spec.home), table.get_team(spec.away)] for spec in specs
+    ]
+    players_by_id = table.get_players_by_id(
+        {t for spec in specs for t in [spec.home, spec.away]}
+    )
+    return [
+        GameResult.from_boxscore(
+            boxscore, period, spec.home, spec.away, config.num_periods
+        )
+        for spec, (boxscore, period) in zip(
+            specs, run_batch(matchups, players_by_id, seed, config)
+        )
+    ]
+
+
+def guided_chunks(
+    n_games: int, min_chunksize: int, max_chunksize: int, processes: int
+) -> List[Tuple[int, int]]:
+    """
+    Split a schedule into (start, end) chunks that shrink as it runs down, guided self scheduling. Each chunk
+    takes half of the remaining games divided between the workers, between min_chunksize and max_chunksize
+    games, so the first chunks keep the messages few and the last ones are small enough that a worker stuck on
+    a long game does not hold up many others.
+
+    Args:
+        n_games (int): the number of games in the schedule.
+        min_chunksize (int): the fewest games in a chunk, only the last chunk can be smaller.
+        max_chunksize (int): the most games in a chunk.
+        processes (int): the number of workers.
+    Returns:
+        the (start, end) of each chunk, in schedule order.
+    """
+    chunks = []
+    start = 0
+    while start < n_games:
+        size = -(-(n_games - start) // (2 * processes))
+        size = min(max(size, min_chunksize), max_chunksize)
+        end = min(start + size, n_games)
+        chunks.append((start, end))
+        start = end
+    return chunks
+
+
+def _report_progress(
+    partials: Iterator[PartialStats],
+    total: int,
+    progress: Callable[[int, int], None],
+    done: int = 0,
+) -> Iterator[PartialStats]:
+    """Pass the partials through, calling progress with the games done and the total after each one."""
+    for partial in partials:
+        done += partial.games
+        progress(done, total)
+        yield partial
+
 
 class Season:
     """
@@ -16,21 +205,34 @@ class Season:
 
     Attributes:
         teams (List[Team]): a list containing every team.
-        schedule (List[List[Team]]): a list of tuples of Teams representing a game between them.
-            [[home-team, away-team]...]
+        meetings (int): the number of times each pair of teams meet.
+        schedule (RoundRobin): the (home-team, away-team) Teams of every game, in game day order, computed lazily
+            so a season of a large league is not held in memory.
+
+    Args:
+        teams (List[Team]): a list containing every team.
+        rng (random.Random): the random state to shuffle the schedule with. Default = None, the random module.
+        meetings (int): the number of times each pair of teams meet. Default = 1.
     """
 
-    def __init__(self, teams: List[Team]) -> None:
+    def __init__(
+        self, teams: List[Team], rng: random.Random = None, meetings: int = 1
+    ) -> None:
         self.teams = teams
+        self.rng = rng if rng is not None else random
+        self.meetings = meetings
         self.schedule = self.generate_schedule()
 
-    def generate_schedule(self) -> List:
+    def generate_schedule(self) -> RoundRobin:
         """
-        Generate a schedule where every team plays each other once. and then return the list is a radom order.
+        Generate a round robin schedule where every team plays each other team meetings times, at most once per
+        game day, with the teams and game days in a random order.
         """
-        games = list(itertools.combinations(self.teams, 2))
-        random.shuffle(games)
-        return games
+        return RoundRobin(self.teams, self.meetings, self.rng)
+
+    def game_days(self) -> Iterator[List[Tuple[Team, Team]]]:
+        """Yield the (home-team, away-team) Teams of the games of each game day in order."""
+        return self.schedule.game_days()
 
 
 class League:
@@ -41,146 +243,415 @@ class League:
         year (int): the current year of the league. Default = 1
         teams (List[Team]): a list of all the teams in a league.
         players (List[Pawn]): a list of all players in the league.
-        team_stats (pd.DataFrame): a dataframe containing the stats for each team.
-        player_stats (pd.DataFrame): a dataframe containing the stats for each player.
+        team_stats (pd.DataFrame): a dataframe containing the stats for each team, built from stats.
+        player_stats (pd.DataFrame): a dataframe containing the stats for each player, built from stats.
+        stats (LeagueStats): the counters of the team and player stats.
+        player_ids (IdMap): the row of each player in stats by id.
         seasons (List[Season]): a list of all season shedules.
+        engine (str): the engine used to run the games, one of ENGINES. Default = "scalar".
+            "scalar" runs each game with a GameManager, "batch" runs the games in lockstep with a
+            BatchGameManager. The games of a batch share one random stream, seeded by the first game, so only
+            the "scalar" engine plays out the same way at any chunk size or number of workers.
+        seed (int): the root seed of the league. The schedule of each season and the seed of each game are
+            derived from it by their season and game index, see derive_seeds, so a seeded league plays out the
+            same way whichever process runs each game, and any one game can be rerun on its own with get_game.
+            Default = None, drawn from the random module.
+        team_ids (IdMap): the index of each team by name, the index a GameSpec and GameResult refer to it by.
+        season_durations (List[np.ndarray]): the game duration histogram of each season run, see DURATION_EDGES.
+        executor (SimulationExecutor): the workers the games are run in. Default = None, a SimulationExecutor is
+            started for each season and shut down after it.
+        meetings (int): the number of times each pair of teams meet in a season. Default = 1.
+        config (GameConfig): the length of the games and the resolution of their clock. Default = None, the
+            default GameConfig. Games only plan their skating with a SkatingPlanner if the config does. The "batch"
+            engine can not run event driven games or plan skating.
     """
 
-    def __init__(self, teams: List[Team], players: List[Pawn]) -> None:
+    def __init__(
+        self,
+        teams: List[Team],
+        players: List[Pawn],
+        engine: str = "scalar",
+        seed: int = None,
+        executor: SimulationExecutor = None,
+        meetings: int = 1,
+        config: GameConfig = None,
+    ) -> None:
+        if engine not in ENGINES:
+            raise ValueError(f"unknown engine {engine}, expected one of {ENGINES}")
+        self.config = config if config is not None else GameConfig()
+        if engine == "batch" and (self.config.event_driven or self.config.plan_skating):
+            raise ValueError(
+                'the "batch" engine can not run event driven games or plan skating'
+            )
         self.year = 0
+        self.engine = engine
+        self.executor = executor
+        self.meetings = meetings
+        # an unseeded league draws its seed from the random module, so random.seed makes it repeatable
+        self.seed = seed if seed is not None else random.getrandbits(64)
         self.teams = teams
         self.players = players
-        self.players_by_team = self._generate_players_by_team()
-
-        # dataframes that contains team and player stats, this will be updated after every game
-        player_stats_headers = ["games"] + STATS_NAMES
-        team_stats_headers = ["wins", "losses", "overtime-losses"]
-        self.team_stats = self._generate_inital_team_stats(team_stats_headers)
-        self.player_stats = self._generate_inital_player_stats(player_stats_headers)
+        self._index_roster()
+        self.season_durations = []
 
         # a list of seasons for a given league
         self.seasons = []
         self.add_season_schedule()
 
-    def _generate_players_by_team(self):
-        players_by_team = {}
-        for t in self.teams:
-            players_by_team[t.name] = []
-            for p in self.players:
-                if p.id in t.players:
-                    players_by_team[t.name].append(p)
-        return players_by_team
+    def _index_roster(self) -> None:
+        """
+        Build the roster index and the zeroed stats in a single pass over the players and the teams, the stats are
+        updated after every game.
+
+        Raises:
+            ValueError: if two teams have the same name.
+        """
+        self.player_ids = IdMap(player.id for player in self.players)
+        self.players_by_id = {player.id: player for player in self.players}
+        self.team_ids = IdMap(team.name for team in self.teams)
+        if len(self.team_ids) != len(self.teams):
+            # the team rows are keyed by name, two teams with the same name would share one
+            names = [team.name for team in self.teams]
+            duplicates = sorted({name for name in names if names.count(name) > 1})
+            raise ValueError(
+                f"every team in a league needs a unique name, {duplicates} are repeated"
+            )
+        index_by_id = self.player_ids.index_by_id
+        team_rows = [
+            np.fromiter(
+                (index_by_id[p] for p in team.players),
+                dtype=np.intp,
+                count=len(team.players),
+            )
+            for team in self.teams
+        ]
+        self.players_by_team = self._generate_players_by_team(team_rows)
+        self.stats = LeagueStats(team_rows, len(self.player_ids))
+
+    def _generate_players_by_team(
+        self, team_rows: List[np.ndarray]
+    ) -> Dict[str, List[Pawn]]:
+        """Return the players of each team keyed by team name, in league order, from the player rows of each team."""
+        return {
+            team.name: [self.players[row] for row in np.sort(rows).tolist()]
+            for team, rows in zip(self.teams, team_rows)
+        }
 
     def add_season_schedule(self) -> None:
         """
         Generate a new Season and append it to self.seasons
         """
-        self.seasons.append(Season(self.teams))
+        season = len(self.seasons)
+        seed = derive_seeds(self.seed, [SCHEDULE_STREAM], [season])[0]
+        self.seasons.append(Season(self.teams, random.Random(int(seed)), self.meetings))
+
+    def run_season(
+        self,
+        chunksize: int = None,
+        max_in_flight: int = None,
+        progress: Callable[[int, int], None] = None,
+        min_chunksize: int = None,
+        checkpoint: Union[str, Path] = None,
+        checkpoint_interval: float = CHECKPOINT_INTERVAL,
+    ) -> None:
+        """
+        Run every game in a season and then increment the leagues year. The roster is packed into a RosterTable
+        that each worker process of the executor attaches to once, then the workers are sent batches of GameSpecs
+        and send back one PartialStats per batch, combined from the results of its games.
 
-    def run_season(self) -> None:
+        The season is run a game day at a time, the games of a day run in parallel and the next day only starts
+        once they are all done, so anything carried from one day to the next sees every game of the day before.
+        The batches of a day shrink as it runs down, see guided_chunks, and each idle worker takes the next batch,
+        so a long overtime game near the end of the day does not leave one worker doing all the work. The duration
+        of every game is kept in season_durations.
+
+        The partials are merged in a tree reduction as they arrive, in whatever order the workers finish them, so
+        memory is bounded by the batches in flight rather than the length of the schedule. The merged season is
+        added to the league stats once every game is done.
+
+        With a checkpoint path, the stats of the completed game days are saved to it as a SeasonCheckpoint at most
+        once every checkpoint_interval seconds. If the season is interrupted, running it again with the same path
+        on a League with the same teams, players and seed skips the game days the checkpoint holds and resumes
+        from the next one. The checkpoint is removed once the season is done.
+
+        Args:
+            chunksize (int): the most games in a batch. Default = None, the CHUNK_SIZES of the engine.
+            max_in_flight (int): the most games sent to the workers and not yet merged. Default = None, two
+                batches per worker.
+            progress (Callable[[int, int], None]): called with the number of games merged and the number of games
+                in the season after each batch. Default = None.
+            min_chunksize (int): the fewest games in a batch. Default = None, the MIN_CHUNK_SIZES of the engine.
+            checkpoint (Union[str, Path]): the path to save the progress of the season to and resume it from.
+                Default = None, the season is not checkpointed.
+            checkpoint_interval (float): the least number of seconds between two checkpoints. Default =
+                CHECKPOINT_INTERVAL.
+        Raises:
+            ValueError: if the checkpoint is of another season.
         """
-        Create a manager for each game and then run every game in a season. Once complete increment the leagues year.
+        n_games = len(self.seasons[self.year].schedule)
+        chunksize = chunksize or CHUNK_SIZES[self.engine]
+        min_chunksize = min(min_chunksize or MIN_CHUNK_SIZES[self.engine], chunksize)
+        executor = self.executor or SimulationExecutor()
+        max_in_flight = max_in_flight or 2 * chunksize * executor.processes
+        season_stats = LeagueStats(self.stats.team_rows, len(self.player_ids))
+        resume_days = 0
+        if checkpoint is not None and n_games:
+            first_seed = self.get_game_spec(0).seed
+            resume_days = self._resume_season(
+                checkpoint, n_games, first_seed, season_stats
+            )
+        last_checkpoint = time.perf_counter()
+        finished = False
+        try:
+            with RosterTable.create(self.teams, self.players) as table:
+                for day in range(resume_days, self.seasons[self.year].schedule.n_days):
+                    # every game is seeded by its index, so the days before do not need to be generated
+                    specs = self.get_game_day_specs(day)
+                    chunks = guided_chunks(
+                        len(specs), min_chunksize, chunksize, executor.processes
+                    )
+                    # the stream is closed even if the day is interrupted, which releases a task feeder blocked
+                    # on a full window, the workers can not be stopped while it waits
+                    with closing(
+                        self._stream_partials(
+                            executor, table, specs, chunks, max_in_flight
+                        )
+                    ) as partials:
+                        if progress is not None:
+                            partials = _report_progress(
+                                partials, n_games, progress, season_stats.games
+                            )
+                        season_stats.add_partial(reduce_partials(partials))
+                    now = time.perf_counter()
+                    if checkpoint is not None and (
+                        now - last_checkpoint >= checkpoint_interval
+                    ):
+                        SeasonCheckpoint.from_stats(
+                            self.year, n_games, first_seed, day + 1, season_stats
+                        ).save(checkpoint)
+                        last_checkpoint = now
+            finished = True
+        finally:
+            if executor is not self.executor:
+                executor.shutdown(wait=finished)
+        season = season_stats.take_partial()
+        self.stats.add_partial(season)
+        self.season_durations.append(season.duration_counts)
+        self.year += 1
+        if checkpoint is not None and Path(checkpoint).exists():
+            Path(checkpoint).unlink()
+
+    def _resume_season(
+        self,
+        checkpoint: Union[str, Path],
+        n_games: int,
+        first_seed: int,
+        season_stats: LeagueStats,
+    ) -> int:
+        """
+        Restore the stats of the completed game days of the current season from a checkpoint, if there is one.
 
         Args:
-            multi (bool): if True run all the games wth multiprocessing, else run them sequentially. Default = True.
-        """
-        games = [
-            GameManager(
-                teams[0],
-                teams[1],
-                self.players_by_team[teams[0].name]
-                + self.players_by_team[teams[1].name],
+            checkpoint (Union[str, Path]): the path of the SeasonCheckpoint.
+            n_games (int): the number of games in the season.
+            first_seed (int): the seed of the first game of the season.
+            season_stats (LeagueStats): the empty stats of the season to restore the completed games to.
+        Returns:
+            the number of completed game days, 0 if there is no checkpoint.
+        Raises:
+            ValueError: if the checkpoint is of another season.
+        """
+        if not Path(checkpoint).exists():
+            return 0
+        saved = SeasonCheckpoint.load(checkpoint)
+        if not saved.matches(self.year, n_games, first_seed):
+            raise ValueError(
+                f"checkpoint {checkpoint} is of another season, year {saved.year} with {saved.n_games} games"
             )
-            for teams in self.seasons[self.year].schedule
-        ]
+        saved.restore(season_stats)
+        return saved.days
 
-        with Pool() as pool:
-            results = pool.map(self.run_game, games)
+    def game_duration_percentiles(
+        self, percentiles: Iterable[float] = (50, 99), season: int = -1
+    ) -> Dict[str, float]:
+        """
+        Return percentiles of how long the games of a season took to run, such as the median and tail latency.
 
-        for game in results:
-            self._apply_game_stats(game)
-        self.year += 1
+        Args:
+            percentiles (Iterable[float]): the percentiles, between 0 and 100. Default = (50, 99).
+            season (int): the index of the season in season_durations. Default = -1, the last season run.
+        Returns:
+            the duration in seconds of each percentile keyed by "p<percentile>", see duration_percentiles.
+        """
+        percentiles = list(percentiles)
+        durations = duration_percentiles(self.season_durations[season], percentiles)
+        return {f"p{q:g}": duration for q, duration in zip(percentiles, durations)}
 
-    def run_game(self, game: GameManager) -> GameManager:
+    def get_game_specs(self) -> List[GameSpec]:
+        """Return a GameSpec for every game of the current season, in schedule order."""
+        return [spec for specs in self.game_day_specs() for spec in specs]
+
+    def game_day_specs(self) -> Iterator[List[GameSpec]]:
+        """Yield a GameSpec for every game of each game day of the current season."""
+        for day in range(self.seasons[self.year].schedule.n_days):
+            yield self.get_game_day_specs(day)
+
+    def get_game_day_specs(self, day: int, season: int = None) -> List[GameSpec]:
         """
-        Run and return a game.
+        Return a GameSpec for every game of a game day.
 
         Args:
-            game (GameManager): the game to run.
+            day (int): the index of the game day in the schedule.
+            season (int): the index of the season in seasons. Default = None, the current season.
         Returns:
-            the completed gamemanager object.
+            the GameSpec of each game of the day, in schedule order.
         """
-        game.run()
-        return game
+        season = self.year if season is None else season
+        schedule = self.seasons[season].schedule
+        start = day * schedule.games_per_day
+        games = range(start, start + schedule.games_per_day)
+        seeds = derive_seeds(self.seed, [GAME_STREAM, season], games).tolist()
+        return [
+            GameSpec(
+                self.team_ids.index(home.name), self.team_ids.index(away.name), seed
+            )
+            for (home, away), seed in zip(schedule.get_game_day(day), seeds)
+        ]
 
-    def _apply_player_stats(self, game: GameManager) -> None:
+    def get_game_spec(self, game: int, season: int = None) -> GameSpec:
         """
-        Given a competed game, log the player stats to self.player_stats
+        Return the GameSpec of a single game, seeded from the league seed, season and game index alone.
 
         Args:
-            game: the completed game to pull the player stats from.
+            game (int): the index of the game in the schedule.
+            season (int): the index of the season in seasons. Default = None, the current season.
+        Returns:
+            the GameSpec of the game, the same one the game is run with in the season.
         """
-        game_stats = game.state.boxscore.get_stats().set_index(["player-id", "player"])
-        game_stats["games"] = 1
-        game_stats = game_stats.drop("team", axis=1)
-        self.player_stats = game_stats.add(self.player_stats, fill_value=0)
-
-    def _apply_team_stats(self, game: GameManager) -> None:
+        season = self.year if season is None else season
+        home, away = self.seasons[season].schedule[game]
+        seed = derive_seeds(self.seed, [GAME_STREAM, season], [game]).tolist()[0]
+        return GameSpec(
+            self.team_ids.index(home.name), self.team_ids.index(away.name), seed
+        )
+
+    def get_game(self, game: int, season: int = None) -> GameManager:
         """
-        Given a competed game, log the team stats to self.team_stats
+        Return a GameManager of a single game of a season, to rerun it on its own as it was played with the
+        "scalar" engine.
 
         Args:
-            game: the completed game to pull the team stats from.
+            game (int): the index of the game in the schedule.
+            season (int): the index of the season in seasons. Default = None, the current season.
+        Returns:
+            the GameManager of the game, not yet run.
+        """
+        spec = self.get_game_spec(game, season)
+        home, away = self.teams[spec.home], self.teams[spec.away]
+        pawns = [self.players_by_id[p] for p in home.players + away.players]
+        return GameManager(
+            home, away, pawns, rng=GameRandom(spec.seed), config=self.config
+        )
+
+    def _stream_partials(
+        self,
+        executor: SimulationExecutor,
+        table: RosterTable,
+        specs: List[GameSpec],
+        chunks: List[Tuple[int, int]],
+        max_in_flight: int,
+    ) -> Iterator[PartialStats]:
         """
-        game_score = game.state.boxscore.get_score()
-        game_score.sort_values(by=["goals"])
-        game_score["wins"] = 0
-        game_score["overtime-losses"] = 0
-        game_score["losses"] = 0
+        Yield the PartialStats of every (start, end) chunk of the specs as the workers complete them, with at most
+        max_in_flight games sent to the workers and not yet yielded.
+        """
+        # a batch is seeded by its first game, so how the schedule is chunked does not change the league seeds
+        tasks = [
+            (
+                table.path,
+                table.layout,
+                self.engine,
+                specs[start:end],
+                specs[start].seed,
+                self.config,
+            )
+            for start, end in chunks
+        ]
+        # a batch is only sent once there is room for all of its games, so the largest has to fit in the window
+        window = max([max_in_flight] + [end - start for start, end in chunks])
+
+        slots = threading.Semaphore(window)
+        stopped = threading.Event()
+
+        def submit() -> Iterator:
+            for task in tasks:
+                for _ in task[3]:
+                    slots.acquire()
+                if stopped.is_set():
+                    return
+                yield task
+
+        try:
+            for partial in executor.imap_unordered(run_combined_task, submit()):
+                slots.release(partial.games)
+                yield partial
+        finally:
+            # let the task feeder run out rather than wait on a window that will not open
+            stopped.set()
+            slots.release(window)
 
-        game_score.loc[0, "wins"] = 1
-        if game.state.period > 3:
-            game_score.loc[1, "overtime-losses"] = 1
-        else:
-            game_score.loc[1, "losses"] = 1
+    def run_game(self, game: GameManager) -> GameManager:
+        """
+        Run and return a game.
 
-        game_score = game_score.drop(["goals", "shots"], axis=1)
-        game_score.set_index("team", inplace=True)
-        self.team_stats = game_score.add(self.team_stats, fill_value=0)
+        Args:
+            game (GameManager): the game to run.
+        Returns:
+            the completed gamemanager object.
+        """
+        game.run()
+        return game
+
+    @property
+    def player_stats(self) -> pd.DataFrame:
+        """A DataFrame of the stats of every player, indexed by player-id and player."""
+        index = pd.MultiIndex.from_arrays(
+            [
+                [player.id for player in self.players],
+                [player.name for player in self.players],
+            ],
+            names=["player-id", "player"],
+        )
+        return pd.DataFrame(
+            self.stats.player_counts, index=index, columns=PLAYER_STATS_NAMES
+        )
+
+    @property
+    def team_stats(self) -> pd.DataFrame:
+        """A DataFrame of the stats of every team, indexed by team."""
+        index = pd.Index([team.name for team in self.teams], name="team")
+        return pd.DataFrame(
+            self.stats.team_counts, index=index, columns=TEAM_STATS_NAMES
+        )
 
     def _apply_game_stats(self, game: GameManager) -> None:
         """
         Given a completed game, log both the player and team stats.
         """
-        self._apply_player_stats(game)
-        self._apply_team_stats(game)
+        self._apply_result(game.state.boxscore, game.state.period, game.num_periods)
 
-    def _generate_inital_player_stats(self, stats_headers: List[str]) -> pd.DataFrame:
+    def _apply_result(self, boxscore: BoxScore, period: int, num_periods: int) -> None:
         """
-        Generate a fresh empty player stats dataframe.
-
-        Args:
-            stats_header (List[str]): the header for the dataframe.
-        Return:
-            a pd.DataFrame filled with zeros for each player.
+        Given a completed games box score, final period and periods before overtime, log both the player and team
+        stats.
         """
-        player_stats = pd.DataFrame(columns=["player-id", "player"] + stats_headers)
-        for player in self.players:
-            player_stats.loc[len(player_stats)] = [player.id, player.name] + [
-                0 for _ in stats_headers
-            ]
-        return player_stats.set_index(["player-id", "player"])
+        home, away = [self.team_ids.index(name) for name in boxscore.teams]
+        self._apply_game_result(
+            GameResult.from_boxscore(boxscore, period, home, away, num_periods)
+        )
 
-    def _generate_inital_team_stats(self, stats_headers: List[str]) -> pd.DataFrame:
+    def _apply_game_result(self, result: GameResult) -> None:
         """
-        Generate a fresh empty team stats dataframe.
-
-        Args:
-            stats_header (List[str]): the header for the dataframe.
-        Return:
-            a pd.DataFrame filled with zeros for each team.
-        """
-        team_stats = pd.DataFrame(columns=["team"] + stats_headers)
-        for team in self.teams:
-            team_stats.loc[len(team_stats)] = [team.name] + [0 for _ in stats_headers]
-        return team_stats.set_index(["team"])
+        Given a completed games result, log both the player and team stats.
+        """
+        self.stats.add_result(result)
@@ -0,0 +1,201 @@
+from dataclasses import dataclass
+from typing import Iterable, List
+
+import numpy as np
+
+from hoki.game import STATS_NAMES
+from hoki.game_result import GameResult
+
+# the columns of League.player_stats and League.team_stats
+PLAYER_STATS_NAMES = ["games"] + STATS_NAMES
+TEAM_STATS_NAMES = ["wins", "losses", "overtime-losses"]
+WINS, LOSSES, OVERTIME_LOSSES = range(len(TEAM_STATS_NAMES))
+
+# the edges of the game duration histogram in seconds, 20 log spaced bins per decade from 100us to 1000s, with an
+# underflow bin before the first edge and an overflow bin after the last
+DURATION_EDGES = np.geomspace(1e-4, 1e3, 141)
+N_DURATION_BINS = len(DURATION_EDGES) + 1
+
+
+def duration_percentiles(
+    duration_counts: np.ndarray, percentiles: Iterable[float]
+) -> List[float]:
+    """
+    Return percentiles of the game durations in a histogram. Each is the upper edge of the bin the percentile
+    falls in, so it is an upper bound within one bin, about 12%, of the exact duration.
+
+    Args:
+        duration_counts (np.ndarray): the number of games in each DURATION_EDGES bin.
+        percentiles (Iterable[float]): the percentiles, between 0 and 100.
+    Returns:
+        the duration of each percentile in seconds, nan if there are no games and inf in the overflow bin.
+    """
+    cumulative = np.cumsum(duration_counts)
+    if cumulative[-1] == 0:
+        return [float("nan") for _ in percentiles]
+    upper_edges = np.append(DURATION_EDGES, np.inf)
+    # the first bin holding at least the percentile of the games, and at least one game
+    targets = [max(q / 100 * cumulative[-1], 1) for q in percentiles]
+    bins = np.searchsorted(cumulative, targets)
+    return upper_edges[bins].tolist()
+
+
+@dataclass
+class PartialStats:
+    """
+    The combined stats of a batch of games, the one message a worker sends back per batch. Only the rows of the
+    players and teams that played in the batch are kept, so a partial is sized by the batch and not the league.
+
+    Attributes:
+        player_rows (np.ndarray): the sorted league rows of the players with stats in the partial.
+        player_counts (np.ndarray): the PLAYER_STATS_NAMES counters of each row in player_rows.
+        team_rows (np.ndarray): the sorted indices of the teams with stats in the partial.
+        team_counts (np.ndarray): the TEAM_STATS_NAMES counters of each index in team_rows.
+        duration_counts (np.ndarray): the number of games with a duration in each DURATION_EDGES bin.
+        games (int): the number of games combined into the partial.
+    """
+
+    player_rows: np.ndarray
+    player_counts: np.ndarray
+    team_rows: np.ndarray
+    team_counts: np.ndarray
+    duration_counts: np.ndarray
+    games: int
+
+    @classmethod
+    def empty(cls) -> "PartialStats":
+        """Return a partial with no games."""
+        return cls(
+            player_rows=np.zeros(0, dtype=np.intp),
+            player_counts=np.zeros((0, len(PLAYER_STATS_NAMES)), dtype=np.int64),
+            team_rows=np.zeros(0, dtype=np.intp),
+            team_counts=np.zeros((0, len(TEAM_STATS_NAMES)), dtype=np.int64),
+            duration_counts=np.zeros(N_DURATION_BINS, dtype=np.int64),
+            games=0,
+        )
+
+    def merge(self, other: "PartialStats") -> "PartialStats":
+        """Return a new partial with the stats of both partials."""
+        player_rows, player_counts = _merge_rows(
+            self.player_rows, self.player_counts, other.player_rows, other.player_counts
+        )
+        team_rows, team_counts = _merge_rows(
+            self.team_rows, self.team_counts, other.team_rows, other.team_counts
+        )
+        return PartialStats(
+            player_rows,
+            player_counts,
+            team_rows,
+            team_counts,
+            self.duration_counts + other.duration_counts,
+            self.games + other.games,
+        )
+
+
+def _merge_rows(rows_a, counts_a, rows_b, counts_b):
+    rows = np.union1d(rows_a, rows_b)
+    counts = np.zeros((len(rows), counts_a.shape[1]), dtype=np.int64)
+    counts[np.searchsorted(rows, rows_a)] += counts_a
+    counts[np.searchsorted(rows, rows_b)] += counts_b
+    return rows, counts
+
+
+def reduce_partials(partials: Iterable[PartialStats]) -> PartialStats:
+    """
+    Merge partials in a tree reduction as they arrive. Partials of the same level are merged pairwise like the
+    carries of a binary counter, so every row is merged O(log batches) times and at most one partial per level is
+    held at a time.
+
+    Args:
+        partials (Iterable[PartialStats]): the partials to merge, in any order.
+    Returns:
+        the merged partial, an empty one if there were no partials.
+    """
+    levels = []
+    for partial in partials:
+        level = 0
+        while levels and levels[-1][0] == level:
+            partial = levels.pop()[1].merge(partial)
+            level += 1
+        levels.append((level, partial))
+
+    merged = PartialStats.empty()
+    while levels:
+        merged = levels.pop()[1].merge(merged)
+    return merged
+
+
+class LeagueStats:
+    """
+    Dense counters of the player and team stats of a league, with a row per player and per team. The league keeps
+    one for its totals and each worker keeps one to combine the games of a batch before sending them back.
+
+    Attributes:
+        team_rows (List[np.ndarray]): the player rows of each team, in roster order.
+        player_counts (np.ndarray): the PLAYER_STATS_NAMES counters of each player, shape
+            (players, PLAYER_STATS_NAMES).
+        team_counts (np.ndarray): the TEAM_STATS_NAMES counters of each team, shape (teams, TEAM_STATS_NAMES).
+        duration_counts (np.ndarray): the number of timed games with a duration in each DURATION_EDGES bin.
+        games (int): the number of games added.
+
+    Args:
+        team_rows (List[np.ndarray]): the player rows of each team, in roster order.
+        n_players (int): the number of players in the league.
+    """
+
+    def __init__(self, team_rows: List[np.ndarray], n_players: int) -> None:
+        self.team_rows = team_rows
+        self.player_counts = np.zeros(
+            (n_players, len(PLAYER_STATS_NAMES)), dtype=np.int64
+        )
+        self.team_counts = np.zeros(
+            (len(team_rows), len(TEAM_STATS_NAMES)), dtype=np.int64
+        )
+        self.duration_counts = np.zeros(N_DURATION_BINS, dtype=np.int64)
+        self.games = 0
+
+    def add_result(self, result: GameResult, duration: float = None) -> None:
+        """Add the player and team stats of a completed game, and how many seconds it took to run if timed."""
+        rows = np.concatenate(
+            [self.team_rows[result.home], self.team_rows[result.away]]
+        )
+        # a player only has one row in a game, so the rows are unique and a fancy index add is a scatter add
+        self.player_counts[rows, 0] += 1
+        self.player_counts[rows, 1:] += result.counts
+
+        teams = [result.home, result.away]
+        self.team_counts[teams[result.winner], WINS] += 1
+        loss = OVERTIME_LOSSES if result.overtime else LOSSES
+        self.team_counts[teams[1 - result.winner], loss] += 1
+        if duration is not None:
+            self.duration_counts[
+                np.searchsorted(DURATION_EDGES, duration, "right")
+            ] += 1
+        self.games += 1
+
+    def add_partial(self, partial: PartialStats) -> None:
+        """Add the stats of a partial."""
+        self.player_counts[partial.player_rows] += partial.player_counts
+        self.team_counts[partial.team_rows] += partial.team_counts
+        self.duration_counts += partial.duration_counts
+        self.games += partial.games
+
+    def take_partial(self) -> PartialStats:
+        """Return the stats added so far as a partial and reset the counters to zero."""
+        # every player and team in a game has a game or a result counted, so the touched rows are non zero
+        player_rows = np.flatnonzero(self.player_counts[:, 0])
+        team_rows = np.flatnonzero(self.team_counts.any(axis=1))
+        # the counts of a batch fit in 32 bits, which halves the size of the message
+        partial = PartialStats(
+            player_rows=player_rows.astype(np.int32),
+            player_counts=self.player_counts[player_rows].astype(np.int32),
+            team_rows=team_rows.astype(np.int32),
+            team_counts=self.team_counts[team_rows].astype(np.int32),
+            duration_counts=self.duration_counts.copy(),
+            games=self.games,
+        )
+        self.player_counts[player_rows] = 0
+        self.team_counts[team_rows] = 0
+        self.duration_counts[:] = 0
+        self.games = 0
+        return partial
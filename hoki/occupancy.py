@@ -0,0 +1,87 @@
+from functools import lru_cache
+from typing import List
+
+
+@lru_cache(maxsize=65536)
+def lane_bits(zone_mask: int, width: int, slot_mask: int) -> int:
+    """
+    Expand a bitmask of zones into a bitmask of the player slots in them.
+
+    Args:
+        zone_mask (int): a bitmask of zones, bit z for zone z, such as a RinkTopology path mask.
+        width (int): the number of player slots per zone.
+        slot_mask (int): the player slots to include, bit s for slot s.
+    Returns:
+        a bitmask with bit zone * width + slot set for every zone in the zone_mask and slot in the slot_mask.
+    """
+    bits = 0
+    zone = 0
+    while zone_mask:
+        if zone_mask & 1:
+            bits |= slot_mask << (zone * width)
+        zone_mask >>= 1
+        zone += 1
+    return bits
+
+
+class ZoneOccupancy:
+    """
+    Bitmasks of which players of each team are in each zone. A team's mask has bit zone * width + slot set
+    when the player in that slot is in that zone, so the players of a team on a lane are a single AND with a
+    lane_bits mask and counting them is a popcount.
+
+    Attributes:
+        width (int): the number of player slots per zone.
+        teams (List[int]): the occupancy mask of each team, indexed by team slot.
+        everyone (int): the occupancy mask of every team combined.
+        team_by_player (List[int]): the team slot of each player slot.
+
+    Args:
+        team_by_player (List[int]): the team slot of each player slot.
+        zone_by_player (List[int]): the zone id of each player slot.
+        n_teams (int): the number of teams. Default = 2.
+    """
+
+    def __init__(
+        self, team_by_player: List[int], zone_by_player: List[int], n_teams: int = 2
+    ) -> None:
+        self.width = len(team_by_player)
+        self.zone_slots = (1 << self.width) - 1
+        self.team_by_player = team_by_player
+        self.teams = [0 for _ in range(n_teams)]
+        self.everyone = 0
+        for player, zone in enumerate(zone_by_player):
+            self.add(player, zone)
+
+    def bit(self, player: int, zone: int) -> int:
+        """Return the bit of the player in the zone."""
+        return 1 << (zone * self.width + player)
+
+    def add(self, player: int, zone: int) -> None:
+        """Mark the player as in the zone."""
+        bit = self.bit(player, zone)
+        self.teams[self.team_by_player[player]] |= bit
+        self.everyone |= bit
+
+    def remove(self, player: int, zone: int) -> None:
+        """Mark the player as no longer in the zone."""
+        bit = self.bit(player, zone)
+        self.teams[self.team_by_player[player]] &= ~bit
+        self.everyone &= ~bit
+
+    def move(self, player: int, old_zone: int, new_zone: int) -> None:
+        """Move the player from old_zone to new_zone."""
+        self.remove(player, old_zone)
+        self.add(player, new_zone)
+
+    def opponents(self, team: int) -> int:
+        """Return the combined occupancy mask of every team but the given one."""
+        return self.everyone & ~self.teams[team]
+
+    def players_in_zone(self, mask: int, zone: int) -> int:
+        """Return the slot bits of the players of the mask in the zone, bit s for slot s."""
+        return (mask >> (zone * self.width)) & self.zone_slots
+
+    def count(self, mask: int) -> int:
+        """Return the number of players in the mask."""
+        return mask.bit_count()
@@ -1,8 +1,11 @@
-import random
+import math
+from dataclasses import dataclass
 from enum import Enum, auto
-from typing import List, Union
+from typing import Dict, List, Optional, Tuple, Union
 
+from hoki.game_random import GameRandom
 from hoki.game_state import GameState
+from hoki.occupancy import lane_bits
 from hoki.pawn import position
 
 
@@ -14,55 +17,182 @@ class player_action(Enum):
     HIT = auto()
 
 
+@dataclass(frozen=True)
+class RoleIndex:
+    """
+    An immutable lookup of every players teammates, opponents and roles, built once at the start of a game.
+
+    Attributes:
+        teammates (Tuple[Tuple[int]]): the slots of each players teammates, indexed by player slot.
+        opponents (Tuple[Tuple[int]]): the slots of each players opponents, indexed by player slot.
+        teammates_by_position (Tuple[Dict[position, Tuple[int]]]): each players teammates keyed by position.
+        opponents_by_position (Tuple[Dict[position, Tuple[int]]]): each players opponents keyed by position.
+        players_by_position (Dict[position, Tuple[int]]): the slots of every player keyed by position.
+        goalie_by_team (Tuple[int]): the slot of each teams goalie, None if it has none, indexed by team slot.
+        centre_by_team (Tuple[int]): the slot of each teams centre, None if it has none, indexed by team slot.
+    """
+
+    teammates: Tuple[Tuple[int, ...], ...]
+    opponents: Tuple[Tuple[int, ...], ...]
+    teammates_by_position: Tuple[Dict[position, Tuple[int, ...]], ...]
+    opponents_by_position: Tuple[Dict[position, Tuple[int, ...]], ...]
+    players_by_position: Dict[position, Tuple[int, ...]]
+    goalie_by_team: Tuple[Optional[int], ...]
+    centre_by_team: Tuple[Optional[int], ...]
+
+
+def group_by_position(players, slots) -> Dict[position, Tuple[int, ...]]:
+    """Return the slots grouped into tuples keyed by the position of each player."""
+    groups = {}
+    for slot in slots:
+        groups.setdefault(players[slot].position, []).append(slot)
+    return {pos: tuple(group) for pos, group in groups.items()}
+
+
+def build_role_index(players, players_by_team: List[List[int]] = None) -> RoleIndex:
+    """
+    Build the RoleIndex of a game.
+
+    Args:
+        players (List[Pawn]): the Pawn in each player slot.
+        players_by_team (List[List[int]]): the player slots of each team. Default = None, every player on one team.
+    Returns:
+        the RoleIndex of the players.
+    """
+    slots = tuple(range(len(players)))
+    if players_by_team is None:
+        players_by_team = [slots]
+    team_by_player = {
+        slot: team for team, s in enumerate(players_by_team) for slot in s
+    }
+
+    teammates = tuple(
+        tuple(p for p in players_by_team[team_by_player[slot]] if p != slot)
+        for slot in slots
+    )
+    opponents = tuple(
+        tuple(p for p in slots if team_by_player[p] != team_by_player[slot])
+        for slot in slots
+    )
+    positions_by_team = [group_by_position(players, team) for team in players_by_team]
+    return RoleIndex(
+        teammates=teammates,
+        opponents=opponents,
+        teammates_by_position=tuple(
+            group_by_position(players, mates) for mates in teammates
+        ),
+        opponents_by_position=tuple(
+            group_by_position(players, opps) for opps in opponents
+        ),
+        players_by_position=group_by_position(players, slots),
+        goalie_by_team=tuple(
+            team.get(position.GOALIE, (None,))[0] for team in positions_by_team
+        ),
+        centre_by_team=tuple(
+            team.get(position.CENTRE, (None,))[0] for team in positions_by_team
+        ),
+    )
+
+
+def filter_by_position(players, slots, by_position, positions):
+    """Return the slots with one of the positions, using the by_position lookup for a single position."""
+    if positions is None or len(positions) == 0:
+        return slots
+    if len(positions) == 1:
+        return by_position.get(positions[0], ())
+    return tuple(slot for slot in slots if players[slot].position in positions)
+
+
 class PlayerManager:
-    def __init__(self, players_by_id, ice_map) -> None:
-        self.players = players_by_id
+    """
+    A class that manages the players desisions and actions.
+
+    Players are referred to by their integer slot in the game rather than their pawn id.
+
+    Attributes:
+        players (List[Pawn]): the Pawn in each player slot.
+        ice_map (IceMap): the rink the game is played on.
+        index (RoleIndex): the teammates, opponents and roles of every player.
+        skating_planner (SkatingPlanner): plans where skaters move, None to skate to a random adjacent zone.
+        rng (GameRandom): the random number stream of the game.
+
+    Args:
+        players (List[Pawn]): the Pawn in each player slot.
+        ice_map (IceMap): the rink the game is played on.
+        players_by_team (List[List[int]]): the player slots of each team. Default = None, every player on one team.
+        skating_planner (SkatingPlanner): plans where skaters move. Default = None.
+        rng (GameRandom): the random number stream of the game. Default = None, a stream seeded from the global
+            random module.
+    """
+
+    def __init__(
+        self,
+        players,
+        ice_map,
+        players_by_team=None,
+        skating_planner=None,
+        rng: GameRandom = None,
+    ) -> None:
+        self.rng = rng if rng is not None else GameRandom.from_global()
+        self.players = players
         self.ice_map = ice_map
+        self.index = build_role_index(players, players_by_team)
+        self.skating_planner = skating_planner
+        # the slot bits of every player and of every player but the goalies, used to mask lanes
+        self.player_slots = (1 << len(players)) - 1
+        self.skater_slots = self.player_slots
+        for slot in self.index.players_by_position.get(position.GOALIE, ()):
+            self.skater_slots &= ~(1 << slot)
+        self.lanes = {}
+
+    def get_opposing_goal(
+        self, player_id: int, game_state: GameState
+    ) -> Tuple[Optional[int], int]:
+        """
+        Return the slot of the opposing goalie and the zone of the goal the player attacks. A lineup without a
+        goalie leaves an empty net, in the zone its goalie would have lined up in.
+        """
+        goalies = self.index.opponents_by_position[player_id].get(position.GOALIE)
+        if goalies:
+            return goalies[0], game_state.zone_by_player[goalies[0]]
+        # the opponents of the away team are the home team
+        home = game_state.team_by_player[player_id] != 0
+        return None, self.ice_map.get_initial_zone(position.GOALIE, home)
 
     def get_players_opponant_by_position(
-        self, game_state: GameState, player_id: str, positions: List[int] = []
+        self, game_state: GameState, player_id: int, positions: List[int] = []
     ):
-        players = list(self.players.keys())
-        team_player_ids = game_state.players_by_team[
-            game_state.team_by_player[player_id]
-        ]
-        players = list(set(players) - set(team_player_ids))
-        if positions is not None and len(positions) > 0:
-            players = [
-                pid for pid in players if self.players[pid].position in positions
-            ]
-        return players
+        return filter_by_position(
+            self.players,
+            self.index.opponents[player_id],
+            self.index.opponents_by_position[player_id],
+            positions,
+        )
 
     def get_players_teammate_by_position(
-        self, game_state: GameState, player_id: str, positions: List[int] = []
+        self, game_state: GameState, player_id: int, positions: List[int] = []
     ):
-        players = list(self.players.keys())
-        if player_id is not None:
-            players = [
-                p
-                for p in game_state.players_by_team[
-                    game_state.team_by_player[player_id]
-                ]
-            ]
-            players.remove(player_id)
-        if positions is not None and len(positions) > 0:
-            players = [
-                pid for pid in players if self.players[pid].position in positions
-            ]
-        return players
+        if player_id is None:
+            return self.get_all_players_by_positions(positions)
+        return filter_by_position(
+            self.players,
+            self.index.teammates[player_id],
+            self.index.teammates_by_position[player_id],
+            positions,
+        )
 
     def get_all_players_by_positions(self, positions: List = []):
-        players = list(self.players.keys())
-        if positions is not None and len(positions) > 0:
-            players = [
-                pid for pid in players if self.players[pid].position in positions
-            ]
-        return players
+        return filter_by_position(
+            self.players,
+            tuple(range(len(self.players))),
+            self.index.players_by_position,
+            positions,
+        )
 
     def face_off(self, game_state: GameState):
         # calculate winner a faceoff between the 2 centres
-        players = self.get_all_players_by_positions([position.CENTRE])
-        idx = random.randint(0, 1)
+        players = self.index.centre_by_team
+        idx = self.rng.randint(0, 1)
         return players[idx], players[(idx + 1) % 2]
 
     def get_loose_puck(self, game_state: GameState):
@@ -71,11 +201,40 @@ class PlayerManager:
         players = game_state.player_by_zone[zone_id]
         if len(players) == 0:
             return None
-        return players[random.randint(0, len(players) - 1)]
+        return self.rng.choice(players)
 
     def player_choose_action(
         self, player_id: int, game_state: GameState
     ) -> player_action:
+        return self.rng.choice(self.player_action_choices(player_id, game_state))
+
+    def player_choose_next_action(
+        self, player_id: int, game_state: GameState
+    ) -> Tuple[player_action, int]:
+        """
+        Choose an action other than NOTHING, as player_choose_action would given that the player acts, and the
+        number of decisions the player then spends choosing NOTHING, for the event driven scheduler. NOTHING is only
+        chosen when it is the only choice.
+        """
+        choices = self.player_action_choices(player_id, game_state)
+        acting = [action for action in choices if action != player_action.NOTHING]
+        return self.rng.choice(acting or choices), self._idle_decisions(choices)
+
+    def player_idle_decisions(self, player_id: int, game_state: GameState) -> int:
+        """Return the number of decisions in a row the player chooses NOTHING, for the event driven scheduler."""
+        return self._idle_decisions(self.player_action_choices(player_id, game_state))
+
+    def _idle_decisions(self, choices: List[player_action]) -> int:
+        # the decisions are independent, so the run of NOTHING is geometric and drawn with a single number
+        idle_chance = choices.count(player_action.NOTHING) / len(choices)
+        if idle_chance == 0.0 or idle_chance == 1.0:
+            return 0
+        return int(math.log(1.0 - self.rng.random()) / math.log(idle_chance))
+
+    def player_action_choices(
+        self, player_id: int, game_state: GameState
+    ) -> List[player_action]:
+        """Return the actions the player chooses between with equal chance, an action may be listed twice."""
         options = [
             player_action.SKATE,
             player_action.NOTHING,
@@ -95,7 +254,7 @@ class PlayerManager:
             if c > chance:
                 actions = [option]
 
-        return actions[random.randint(0, len(actions) - 1)]
+        return actions
 
     def player_calc_action_success(
         self, game_state: GameState, player_id: int, action: player_action
@@ -104,7 +263,7 @@ class PlayerManager:
         if action == player_action.SHOOT:
             return self.player_calc_action_shoot_success(player_id, game_state)
         if action == player_action.PASS:
-            return self.player_calc_action_pass_success(player_id, game_state)[0]
+            return self.player_calc_action_pass_chance(player_id, game_state)
         if action == player_action.SKATE:
             return self.player_calc_action_skate_success(player_id, game_state)[0]
         if action == player_action.HIT:
@@ -126,8 +285,21 @@ class PlayerManager:
     def player_calc_action_skate_success(
         self, player_id: int, game_state: GameState
     ) -> Union[float, int]:
-        # return chance and zone id
-        return 1.0, game_state.zone_by_player[player_id]
+        # return chance and the zone id to skate towards
+        zone_id = game_state.zone_by_player[player_id]
+        if self.players[player_id].position == position.GOALIE:
+            return 1.0, zone_id
+        if game_state.puck_player is None:
+            return 1.0, zone_id
+        if (
+            game_state.team_by_player[game_state.puck_player]
+            == game_state.team_by_player[player_id]
+        ):
+            # attack the opposing goal
+            _, goal_zone = self.get_opposing_goal(player_id, game_state)
+            return 1.0, goal_zone
+        # chase the puck
+        return 1.0, game_state.puck_zone
 
     def player_calc_action_hit_success(
         self, player_id: int, game_state: GameState
@@ -141,12 +313,38 @@ class PlayerManager:
         # return chance
         return 1.0
 
+    def player_calc_action_pass_chance(
+        self, player_id: int, game_state: GameState
+    ) -> float:
+        # return chance, without drawing a receiver, every decision weighs a pass but few make one
+        return 1.0
+
     def player_calc_action_pass_success(
         self, player_id: int, game_state: GameState
     ) -> Union[float, int]:
         # return chance and player id of receiver
-        players = self.get_players_teammate_by_position(game_state, player_id)
-        return 1.0, players[random.randint(0, len(players) - 1)]
+        players = self.index.teammates[player_id]
+        chance = self.player_calc_action_pass_chance(player_id, game_state)
+        return chance, self.rng.choice(players)
+
+    def get_lane(
+        self, game_state: GameState, source_zone: int, target_zone: int
+    ) -> Tuple[Tuple[int, ...], int, int]:
+        """
+        Return the shot path between two zones, and the occupancy bits of the skaters and of every player on it.
+        """
+        lane = self.lanes.get((source_zone, target_zone))
+        if lane is None:
+            path = self.ice_map.get_shot_path_between_zones(source_zone, target_zone)
+            mask = self.ice_map.topology.get_path_mask(source_zone, target_zone)
+            width = game_state.occupancy.width
+            lane = (
+                path,
+                lane_bits(mask, width, self.skater_slots),
+                lane_bits(mask, width, self.player_slots),
+            )
+            self.lanes[(source_zone, target_zone)] = lane
+        return lane
 
     def player_action_shoot(
         self,
@@ -156,16 +354,21 @@ class PlayerManager:
         # print(f"player {shooter_id} shoots!")
 
         # Calculate the results of a shot.
-        goalie_id = self.get_players_opponant_by_position(
-            game_state, shooter_id, [position.GOALIE]
-        )[0]
+        goalie_id, goal_zone = self.get_opposing_goal(shooter_id, game_state)
 
-        shot_path = self.ice_map.shot_paths[game_state.zone_by_player[shooter_id]][
-            game_state.zone_by_player[goalie_id]
-        ]
+        shooter_zone = game_state.zone_by_player[shooter_id]
+        shot_path, lane, _ = self.get_lane(game_state, shooter_zone, goal_zone)
         goalie_zone = shot_path[-1]
         shooter_team = game_state.team_by_player[shooter_id]
 
+        # the skaters on the shot lane, the shooters teammates may tip it and the opponents block it
+        occupancy = game_state.occupancy
+        tippers = occupancy.teams[shooter_team] & lane
+        tippers &= ~occupancy.bit(shooter_id, shooter_zone)
+        blockers = occupancy.opponents(shooter_team) & lane
+        width = occupancy.width
+        zone_slots = occupancy.zone_slots
+
         # TODO: calculate if initial shot is on target
         ontarget = True
         if not ontarget:
@@ -178,29 +381,35 @@ class PlayerManager:
         # print(shot_path)
         blocked = False
         for zone in shot_path:
+            if not tippers | blockers:
+                break
+            shift = zone * width
+            zone_tippers = tippers >> shift & zone_slots
+            zone_blockers = blockers >> shift & zone_slots
+            if not zone_tippers | zone_blockers:
+                continue
+            tippers ^= zone_tippers << shift
+            blockers ^= zone_blockers << shift
             for player_id in game_state.player_by_zone[zone]:
-                if player_id == shooter_id:
-                    continue
                 player = self.players[player_id]
-                if player.position == position.GOALIE:
-                    continue
-                if game_state.team_by_player[player_id] == shooter_team:
+                if zone_tippers >> player_id & 1:
                     if self.player_calc_reaction_tip_success(player, game_state):
                         # print(f"player {player_id} attepts to tip it!")
                         # TODO: determin if tip is successfull
-                        if random.uniform(0, 1) < 0.25:
+                        if self.rng.random() < 0.25:
                             # print(f"player {player_id} tips it!")
                             save_difficulty += 0.15
                             # print(f"diff = {save_difficulty}")
-                else:
+                elif zone_blockers >> player_id & 1:
                     if (
                         self.player_calc_reaction_block_success(player, game_state)
                         and not blocked
                     ):
                         blocked = True
+                        blockers = 0
                         # print(f"player {player_id} attepts to block it!")
                         # TODO: determin is block is successfull
-                        if random.uniform(0, 1) < 0.25:
+                        if self.rng.random() < 0.25:
                             # print(f"player {player_id} blocks it!")
                             return (
                                 False,
@@ -212,7 +421,11 @@ class PlayerManager:
                         # print(f"diff = {save_difficulty}")
 
         # TODO: calculate if the goalie is able to make the save
-        if save_difficulty < self.players[goalie_id].stats.save:
+        # an empty net makes no save
+        if (
+            goalie_id is not None
+            and save_difficulty < self.players[goalie_id].stats.save
+        ):
             # print(f"player {goalie_id} saves it!")
             return False, goalie_id, goalie_zone
         # print("GOAL!")
@@ -224,17 +437,32 @@ class PlayerManager:
         _, receiver_id = self.player_calc_action_pass_success(passer_id, game_state)
         shooter_team = game_state.team_by_player[passer_id]
 
-        pass_path = self.ice_map.shot_paths[game_state.zone_by_player[passer_id]][
-            game_state.zone_by_player[receiver_id]
-        ]
+        pass_path, _, lane = self.get_lane(
+            game_state,
+            game_state.zone_by_player[passer_id],
+            game_state.zone_by_player[receiver_id],
+        )
+
+        # the opponents on the passing lane, any of them may intercept it
+        occupancy = game_state.occupancy
+        interceptors = occupancy.opponents(shooter_team) & lane
+        width = occupancy.width
+        zone_slots = occupancy.zone_slots
 
         # print(f"player: {passer_id} passes to {receiver_id}!")
         for zone_id in pass_path:
+            if not interceptors:
+                break
+            shift = zone_id * width
+            zone_interceptors = interceptors >> shift & zone_slots
+            if not zone_interceptors:
+                continue
+            interceptors ^= zone_interceptors << shift
             for player_id in game_state.player_by_zone[zone_id]:
-                player = self.players[player_id]
-                if game_state.team_by_player[player_id] != shooter_team:
+                if zone_interceptors >> player_id & 1:
+                    player = self.players[player_id]
                     if self.player_calc_reaction_block_success(player, game_state):
-                        if random.uniform(0, 1) < 0.25:
+                        if self.rng.random() < 0.25:
                             # print(f"player {player_id} intercepts the pass!")
                             return player_id, game_state.zone_by_player[player_id]
 
@@ -242,10 +470,17 @@ class PlayerManager:
 
     def player_action_skate(self, player_id: int, game_state: GameState) -> int:
         # return the zone id to move the player to
+        if self.skating_planner is not None:
+            _, target_zone = self.player_calc_action_skate_success(
+                player_id, game_state
+            )
+            return self.skating_planner.next_zone(
+                player_id, game_state.zone_by_player[player_id], target_zone
+            )
         possible_zones = self.ice_map.zones[game_state.zone_by_player[player_id]][
             "connections"
         ]
-        return possible_zones[random.randint(0, len(possible_zones) - 1)]
+        return self.rng.choice(possible_zones)
 
     def player_action_hit(self, player_id: int, game_state: GameState) -> float:
         # calculate if the hit makes contanct and return the force
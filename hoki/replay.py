@@ -0,0 +1,293 @@
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+from hoki.event_log import EventLog
+from hoki.game import SCORE_STATS, STAT_COLUMNS, GameManager
+from hoki.game_random import GameRandom
+from hoki.occupancy import ZoneOccupancy
+
+# the number of game ticks between two keyframes, a seek re-simulates fewer ticks than this
+KEYFRAME_INTERVAL = 10
+
+# the columns of Replay.header
+HEADER_COLUMNS = [
+    "period",
+    "time",
+    "overtime",
+    "puck_player",
+    "puck_zone",
+    "rng_position",
+]
+PERIOD, TIME, OVERTIME, PUCK_PLAYER, PUCK_ZONE, RNG_POSITION = range(
+    len(HEADER_COLUMNS)
+)
+
+# the int fields of a Replay, in the order they are packed
+REPLAY_SCALARS = [
+    "seed",
+    "block_size",
+    "timer",
+    "game_tick",
+    "num_periods",
+    "decision_ticks",
+    "interval",
+    "ticks",
+]
+# the dtype of each keyframe array of a Replay, in the order they are packed
+REPLAY_ARRAYS = {
+    "header": np.int32,
+    "zone_by_player": np.int16,
+    "zone_order": np.int8,
+    "counts": np.uint16,
+    "possession": np.int8,
+}
+
+
+@dataclass
+class Replay:
+    """
+    The replay of a game, its seed and a keyframe of its state every interval game ticks. A game is a pure
+    function of its seed and state, so restoring the keyframe before a tick and re-simulating from it replays the
+    game exactly, and a seek costs at most interval ticks wherever it lands in the game.
+
+    A keyframe is the game clock, the puck, the zone of each player and the order the players are listed in each
+    zone, the box score, the top of the possession stack and the position of the random stream. Only the top two
+    players of the possession stack are kept, they are all an assist or the next possession look at.
+
+    Games planned with a SkatingPlanner can not be replayed, a plan depends on the planner's cache and work
+    budget as well as the game state. Neither can event driven games, their state includes the scheduled decision
+    of each player.
+
+    Attributes:
+        seed (int): the seed of the game's GameRandom.
+        block_size (int): the block size of the game's GameRandom.
+        timer (int): the number of seconds in each period.
+        game_tick (int): the number of seconds of each game tick.
+        num_periods (int): the number of periods before overtime.
+        decision_ticks (int): the number of game ticks a decision lasts.
+        interval (int): the number of game ticks between two keyframes.
+        ticks (int): the number of game ticks in the game.
+        header (np.ndarray): the HEADER_COLUMNS of each keyframe, shape (keyframes, HEADER_COLUMNS), None is -1.
+        zone_by_player (np.ndarray): the zone of each player slot, shape (keyframes, players).
+        zone_order (np.ndarray): the player slots in the order of player_by_zone, shape (keyframes, players).
+        counts (np.ndarray): the box score counts, shape (keyframes, players, STATS_NAMES).
+        possession (np.ndarray): the top two players of the possession stack, the latest last, -1 padded, shape
+            (keyframes, 2).
+    """
+
+    seed: int
+    block_size: int
+    timer: int
+    game_tick: int
+    num_periods: int
+    decision_ticks: int
+    interval: int
+    ticks: int
+    header: np.ndarray
+    zone_by_player: np.ndarray
+    zone_order: np.ndarray
+    counts: np.ndarray
+    possession: np.ndarray
+
+    @classmethod
+    def record(cls, game: GameManager, interval: int = KEYFRAME_INTERVAL) -> "Replay":
+        """
+        Run a game to the end, keeping a keyframe of its state every interval game ticks.
+
+        Args:
+            game (GameManager): the game to run, seeded with a known seed, in tick mode and not planned with a
+                SkatingPlanner.
+            interval (int): the number of game ticks between two keyframes. Default = KEYFRAME_INTERVAL.
+        Returns:
+            the Replay of the game.
+        Raises:
+            ValueError: if the game can not be replayed.
+        """
+        if (
+            game.skating_planner is not None
+            or game.scheduler is not None
+            or game.rng.seed is None
+        ):
+            raise ValueError(
+                "only a seeded tick mode game without a SkatingPlanner can be replayed"
+            )
+        keyframes = []
+        ticks = 0
+        while not game.completed:
+            if ticks % interval == 0:
+                keyframes.append(_keyframe(game))
+            game.completed = game.increment_state()
+            ticks += 1
+        header, zone_by_player, zone_order, counts, possession = zip(*keyframes)
+        return cls(
+            seed=game.rng.seed,
+            block_size=game.rng.block_size,
+            timer=game.timer,
+            game_tick=game.game_tick,
+            num_periods=game.num_periods,
+            decision_ticks=game.decision_ticks,
+            interval=interval,
+            ticks=ticks,
+            header=np.array(header, dtype=np.int32),
+            zone_by_player=np.array(zone_by_player, dtype=np.int16),
+            zone_order=np.array(zone_order, dtype=np.int8),
+            counts=np.array(counts, dtype=np.uint16),
+            possession=np.array(possession, dtype=np.int8),
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        """Unpack a Replay packed with Replay.to_bytes."""
+        data = zlib.decompress(data)
+        scalars = np.frombuffer(data, dtype="<u8", count=len(REPLAY_SCALARS) + 3)
+        values = dict(zip(REPLAY_SCALARS, scalars.tolist()))
+        keyframes, players, stats = scalars.tolist()[-3:]
+        shapes = {
+            "header": (keyframes, len(HEADER_COLUMNS)),
+            "zone_by_player": (keyframes, players),
+            "zone_order": (keyframes, players),
+            "counts": (keyframes, players, stats),
+            "possession": (keyframes, 2),
+        }
+        offset = scalars.nbytes
+        for name, dtype in REPLAY_ARRAYS.items():
+            dtype = np.dtype(dtype).newbyteorder("<")
+            count = int(np.prod(shapes[name]))
+            values[name] = np.frombuffer(data, dtype, count, offset).reshape(
+                shapes[name]
+            )
+            offset += count * dtype.itemsize
+        values["counts"] = np.cumsum(values["counts"], axis=0, dtype=np.uint16)
+        return cls(**values)
+
+    def to_bytes(self) -> bytes:
+        """
+        Pack the replay into compressed bytes, about half a kilobyte for a game, so a season of replays can be archived.
+        The box score of each keyframe is packed as the change from the one before, which is mostly zeros.
+        """
+        keyframes, players, stats = self.counts.shape
+        scalars = [getattr(self, name) for name in REPLAY_SCALARS]
+        arrays = {name: getattr(self, name) for name in REPLAY_ARRAYS}
+        arrays["counts"] = np.diff(self.counts, axis=0, prepend=np.uint16(0))
+        parts = [np.array(scalars + [keyframes, players, stats], dtype="<u8")]
+        for name, dtype in REPLAY_ARRAYS.items():
+            parts.append(
+                np.ascontiguousarray(arrays[name], np.dtype(dtype).newbyteorder("<"))
+            )
+        return zlib.compress(b"".join(part.tobytes() for part in parts))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Replay":
+        """Load a Replay saved with Replay.save."""
+        return cls.from_bytes(Path(path).read_bytes())
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Save the replay to a file, packed with Replay.to_bytes."""
+        Path(path).write_bytes(self.to_bytes())
+
+    def restore(self, game: GameManager, keyframe: int) -> GameManager:
+        """
+        Restore a game to a keyframe. A replay does not keep the events of the game, so the EventLog of the game
+        is cleared.
+
+        Args:
+            game (GameManager): a new game between the same teams and players as the replayed game.
+            keyframe (int): the index of the keyframe.
+        Returns:
+            the restored game.
+        """
+        header = self.header[keyframe].tolist()
+        state = game.state
+        game.timer = self.timer
+        game.game_tick = self.game_tick
+        game.num_periods = self.num_periods
+        game.decision_ticks = self.decision_ticks
+        # a keyframe is kept every interval ticks of a tick mode game
+        game.ticks = keyframe * self.interval
+        game.completed = False
+        game.rng = GameRandom.at(self.seed, header[RNG_POSITION], self.block_size)
+        game.player_manager.rng = game.rng
+
+        state.period = header[PERIOD]
+        state.time = header[TIME]
+        state.overtime = bool(header[OVERTIME])
+        state.puck_player = header[PUCK_PLAYER] if header[PUCK_PLAYER] >= 0 else None
+        state.puck_zone = header[PUCK_ZONE] if header[PUCK_ZONE] >= 0 else None
+
+        # the lists are updated in place, so anything holding on to them sees the keyframe
+        state.zone_by_player[:] = self.zone_by_player[keyframe].tolist()
+        for players in state.player_by_zone:
+            players.clear()
+        for player in self.zone_order[keyframe].tolist():
+            state.player_by_zone[state.zone_by_player[player]].append(player)
+        state.occupancy = ZoneOccupancy(state.team_by_player, state.zone_by_player)
+        state.events = EventLog(state.events.names, state.events.capacity)
+
+        boxscore = game.boxscore
+        boxscore.counts[:] = self.counts[keyframe]
+        for stat in SCORE_STATS:
+            totals = boxscore.scoreboard.totals[stat]
+            totals[:] = [0 for _ in totals]
+            for slot, team in enumerate(boxscore.team_by_slot):
+                totals[team] += int(boxscore.counts[slot, STAT_COLUMNS[stat]])
+
+        game.posession_stack.stack = [
+            p for p in self.possession[keyframe].tolist() if p >= 0
+        ]
+        return game
+
+    def seek(self, game: GameManager, period: int, time: int) -> GameManager:
+        """
+        Bring a game to the start of the game tick at a period and time, restoring the keyframe before it and
+        re-simulating the ticks in between. The EventLog of the game, and so its game_log, only covers the
+        re-simulated ticks, the events before the keyframe are not kept.
+
+        Args:
+            game (GameManager): a new game between the same teams and players as the replayed game.
+            period (int): the period to seek to.
+            time (int): the seconds remaining in the period to seek to.
+        Returns:
+            the game at the start of the tick, before it is run.
+        Raises:
+            ValueError: if the game does not reach the period and time.
+        """
+        keys = (
+            self.header[:, PERIOD] * (self.timer + 1)
+            + self.timer
+            - self.header[:, TIME]
+        )
+        target = period * (self.timer + 1) + self.timer - time
+        keyframe = int(np.searchsorted(keys, target, "right")) - 1
+        if keyframe < 0:
+            raise ValueError(f"the game does not reach period {period} at {time}")
+        self.restore(game, keyframe)
+        while (game.state.period, game.state.time) != (period, time):
+            if game.completed:
+                raise ValueError(f"the game does not reach period {period} at {time}")
+            game.completed = game.increment_state()
+        return game
+
+
+def _keyframe(game: GameManager):
+    state = game.state
+    header = [
+        state.period,
+        state.time,
+        state.overtime,
+        -1 if state.puck_player is None else state.puck_player,
+        -1 if state.puck_zone is None else state.puck_zone,
+        game.rng.position,
+    ]
+    zone_order = [player for players in state.player_by_zone for player in players]
+    possession = ([-1, -1] + game.posession_stack.stack[-2:])[-2:]
+    return (
+        header,
+        list(state.zone_by_player),
+        zone_order,
+        game.boxscore.counts.copy(),
+        possession,
+    )
@@ -0,0 +1,398 @@
+import heapq
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+# the zone layout of the default rink, keyed by zone id
+DEFAULT_ZONES = {
+    0: {"connections": [2, 3, 4, 5], "shot-weight": 2},
+    1: {"connections": [3, 4], "shot-weight": 1},
+    2: {"connections": [0, 3, 6, 8], "shot-weight": 2},
+    3: {"connections": [0, 1, 2, 4, 6], "shot-weight": 1},
+    4: {"connections": [0, 1, 3, 5, 7], "shot-weight": 1},
+    5: {"connections": [0, 4, 7, 12], "shot-weight": 2},
+    6: {"connections": [2, 3, 7, 8, 9], "shot-weight": 1},
+    7: {"connections": [4, 5, 6, 11, 12], "shot-weight": 1},
+    8: {"connections": [2, 9, 15], "shot-weight": 2},
+    9: {"connections": [6, 8, 10, 13], "shot-weight": 1},
+    10: {"connections": [9, 11], "shot-weight": 1},
+    11: {"connections": [7, 10, 12, 14], "shot-weight": 1},
+    12: {"connections": [5, 11, 18], "shot-weight": 2},
+    13: {"connections": [9, 14, 15, 16], "shot-weight": 1},
+    14: {"connections": [11, 13, 17, 18], "shot-weight": 1},
+    15: {"connections": [8, 13, 16, 20], "shot-weight": 2},
+    16: {"connections": [13, 15, 17, 19, 20], "shot-weight": 1},
+    17: {"connections": [14, 16, 18, 19, 20], "shot-weight": 1},
+    18: {"connections": [12, 14, 17, 20], "shot-weight": 2},
+    19: {"connections": [16, 17], "shot-weight": 1},
+    20: {"connections": [15, 16, 17, 18], "shot-weight": 2},
+}
+
+# the distance and predecessor of a zone that can not be reached
+UNREACHABLE = -1
+
+
+def shortest_path_tree(
+    source: int, adjacency: List[List[int]], shot_weight: List[int]
+) -> Tuple[List[int], List[int]]:
+    """
+    Calculate the shortest path tree from the source zone with a binary heap, where entering a zone costs its
+    shot-weight. Ties are broken towards the lowest zone id.
+
+    Args:
+        source (int): the zone id to start from.
+        adjacency (List[List[int]]): the connected zone ids of each zone.
+        shot_weight (List[int]): the shot-weight of each zone.
+    Returns:
+        the distance to and the previous zone on the path to every zone. Unreachable zones have a
+        distance and previous zone of UNREACHABLE, the source is its own previous zone.
+    """
+    distance = [UNREACHABLE for _ in adjacency]
+    previous = [UNREACHABLE for _ in adjacency]
+    seen = [False for _ in adjacency]
+    distance[source] = 0
+    previous[source] = source
+
+    heap = [(0, source)]
+    while heap:
+        dist, zone = heapq.heappop(heap)
+        if seen[zone]:
+            continue
+        seen[zone] = True
+        for c in adjacency[zone]:
+            new_dist = dist + shot_weight[c]
+            if distance[c] == UNREACHABLE or new_dist < distance[c]:
+                distance[c] = new_dist
+                previous[c] = zone
+                heapq.heappush(heap, (new_dist, c))
+    return distance, previous
+
+
+def shortest_paths(source: int, zones: Dict) -> Dict[int, List[int]]:
+    """
+    Calculate the shortest path from the source zone to every reachable zone, where entering a zone costs its
+    shot-weight.
+
+    Args:
+        source (int): the zone id to start from.
+        zones (Dict): the zone layout keyed by zone id.
+    Returns:
+        a dict of paths, a list of zone ids from the source to the target, keyed by target zone id.
+    """
+    n_zones = max(zones) + 1
+    adjacency = [zones[z]["connections"] if z in zones else [] for z in range(n_zones)]
+    weights = [zones[z]["shot-weight"] if z in zones else 0 for z in range(n_zones)]
+    _, previous = shortest_path_tree(source, adjacency, weights)
+    return {
+        zone: list(trace_path(previous, source, zone))
+        for zone in zones
+        if previous[zone] != UNREACHABLE
+    }
+
+
+def trace_path(previous, source: int, target: int) -> Tuple[int, ...]:
+    """Return the path from the source to the target zone by walking back along the previous zones."""
+    if previous[target] == UNREACHABLE:
+        return ()
+    path = [target]
+    while path[-1] != source:
+        path.append(int(previous[path[-1]]))
+    path.reverse()
+    return tuple(path)
+
+
+class ShotPaths:
+    """
+    A lazy, read-only view of the shot paths of a RinkTopology, shot_paths[source][target] is the path from the
+    source to the target zone.
+
+    Args:
+        topology (RinkTopology): the topology to take the paths from.
+    """
+
+    def __init__(self, topology: "RinkTopology") -> None:
+        self.topology = topology
+
+    def __len__(self) -> int:
+        return self.topology.n_zones
+
+    def __getitem__(self, source: int) -> "ShotPathsFrom":
+        return ShotPathsFrom(self.topology, source)
+
+
+class ShotPathsFrom:
+    """The shot paths from a single source zone, indexed by target zone."""
+
+    def __init__(self, topology: "RinkTopology", source: int) -> None:
+        self.topology = topology
+        self.source = source
+
+    def __len__(self) -> int:
+        return self.topology.n_zones
+
+    def __getitem__(self, target: int) -> Tuple[int, ...]:
+        return self.topology.get_shot_path(self.source, target)
+
+
+class RinkTopology:
+    """
+    A compiled, read-only rink for arbitrary sparse zone graphs. The zone adjacency and shot weights are held as
+    compact arrays and the shortest shot paths as one distance and one predecessor row per source zone. The rows
+    are calculated lazily, the first time a path from their source is needed, so a single topology can be shared
+    by every game in a process, or fully calculated and saved to disk.
+
+    Attributes:
+        n_zones (int): the number of zones, zone ids are 0..n_zones-1.
+        shot_weight (np.ndarray): the cost of a shot path entering each zone, shape (zones,).
+        neighbours (np.ndarray): the connected zones of each zone padded with -1, shape (zones, max connections).
+        degree (np.ndarray): the number of connections of each zone, shape (zones,).
+        adjacency (List[List[int]]): the connected zones of each zone.
+        shot_paths (ShotPaths): the shot paths, indexed by source then target zone.
+
+    Args:
+        shot_weight, neighbours, degree (np.ndarray): the compiled zone arrays.
+        distance, predecessor (np.ndarray): optional precalculated all-pairs rows, shape (zones, zones).
+    """
+
+    def __init__(
+        self,
+        shot_weight: np.ndarray,
+        neighbours: np.ndarray,
+        degree: np.ndarray,
+        distance: np.ndarray = None,
+        predecessor: np.ndarray = None,
+    ) -> None:
+        self.n_zones = len(shot_weight)
+        self.shot_weight = shot_weight
+        self.neighbours = neighbours
+        self.degree = degree
+        for array in [shot_weight, neighbours, degree]:
+            array.flags.writeable = False
+
+        self.adjacency = [
+            neighbours[z, : degree[z]].tolist() for z in range(self.n_zones)
+        ]
+        self._weights = shot_weight.tolist()
+        # the lazily calculated distance and predecessor rows, keyed by source zone
+        self._distance = {}
+        self._predecessor = {}
+        if distance is not None and predecessor is not None:
+            distance.flags.writeable = False
+            predecessor.flags.writeable = False
+            for source in range(self.n_zones):
+                self._distance[source] = distance[source]
+                self._predecessor[source] = predecessor[source]
+        self._paths = {}
+        self._path_masks = {}
+        self._path_positions = None
+        self.shot_paths = ShotPaths(self)
+
+    @classmethod
+    def compile(cls, zones: Dict) -> "RinkTopology":
+        """
+        Compile a zone layout into a RinkTopology. The shot paths are calculated lazily.
+
+        Args:
+            zones (Dict): the zone layout, {zone id: {"connections": [zone ids], "shot-weight": int}}.
+                The zone ids must be 0..N-1.
+        Returns:
+            the compiled RinkTopology.
+        """
+        validate_zones(zones)
+        n_zones = len(zones)
+        shot_weight = np.array([zones[z]["shot-weight"] for z in range(n_zones)])
+        degree = np.array([len(zones[z]["connections"]) for z in range(n_zones)])
+        neighbours = np.full((n_zones, max(degree.max(), 1)), -1, dtype=np.int32)
+        for z in range(n_zones):
+            neighbours[z, : degree[z]] = zones[z]["connections"]
+        return cls(shot_weight, neighbours, degree)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "RinkTopology":
+        """Load a RinkTopology saved with RinkTopology.save."""
+        with np.load(path) as data:
+            return cls(**{name: data[name] for name in TOPOLOGY_ARRAYS})
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Calculate every shot path and save the compiled arrays to a .npz file."""
+        np.savez_compressed(
+            path, **{name: getattr(self, name) for name in TOPOLOGY_ARRAYS}
+        )
+
+    def to_zones(self) -> Dict:
+        """Return the zone layout the topology was compiled from."""
+        return {
+            z: {
+                "connections": list(self.adjacency[z]),
+                "shot-weight": self._weights[z],
+            }
+            for z in range(self.n_zones)
+        }
+
+    def tree(self, source: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the distance and predecessor rows of the source zone, calculating them if needed. Unreachable
+        zones have a distance and predecessor of UNREACHABLE.
+        """
+        if source not in self._predecessor:
+            distance, previous = shortest_path_tree(
+                source, self.adjacency, self._weights
+            )
+            distance = np.array(distance, dtype=np.int32)
+            previous = np.array(previous, dtype=np.int32)
+            distance.flags.writeable = False
+            previous.flags.writeable = False
+            self._distance[source] = distance
+            self._predecessor[source] = previous
+        return self._distance[source], self._predecessor[source]
+
+    def compile_all(self) -> None:
+        """Calculate the shot paths from every source zone."""
+        for source in range(self.n_zones):
+            self.tree(source)
+
+    @property
+    def distance(self) -> np.ndarray:
+        """The shot path distance between every pair of zones, shape (zones, zones)."""
+        self.compile_all()
+        distance = np.stack([self._distance[s] for s in range(self.n_zones)])
+        distance.flags.writeable = False
+        return distance
+
+    @property
+    def predecessor(self) -> np.ndarray:
+        """The previous zone on every shot path, shape (zones, zones)."""
+        self.compile_all()
+        predecessor = np.stack([self._predecessor[s] for s in range(self.n_zones)])
+        predecessor.flags.writeable = False
+        return predecessor
+
+    def get_distance(self, source: int, target: int) -> int:
+        """Return the shot path distance from the source zone to the target zone."""
+        return int(self.tree(source)[0][target])
+
+    def get_shot_path(self, source: int, target: int) -> Tuple[int, ...]:
+        """Return the shot path from the source zone to the target zone, an empty tuple if it is unreachable."""
+        path = self._paths.get((source, target))
+        if path is None:
+            path = trace_path(self.tree(source)[1], source, target)
+            self._paths[(source, target)] = path
+        return path
+
+    def get_path_mask(self, source: int, target: int) -> int:
+        """Return a bitmask of the zones on the shot path from the source zone to the target zone, bit z for zone z."""
+        mask = self._path_masks.get((source, target))
+        if mask is None:
+            mask = 0
+            for zone in self.get_shot_path(source, target):
+                mask |= 1 << zone
+            self._path_masks[(source, target)] = mask
+        return mask
+
+    def path_positions(self) -> np.ndarray:
+        """
+        Return an array where [source, target, zone] is the index of zone on the shot path from source to target,
+        or -1 if zone is not on it. The array is built once and cached, it needs zones**3 memory so is only meant
+        for small rinks.
+        """
+        if self._path_positions is None:
+            positions = np.full((self.n_zones,) * 3, -1, dtype=np.int64)
+            for source in range(self.n_zones):
+                for target in range(self.n_zones):
+                    path = list(self.get_shot_path(source, target))
+                    positions[source, target, path] = np.arange(len(path))
+            positions.flags.writeable = False
+            self._path_positions = positions
+        return self._path_positions
+
+
+# the names of the arrays that make up a saved RinkTopology
+TOPOLOGY_ARRAYS = [
+    "shot_weight",
+    "neighbours",
+    "degree",
+    "distance",
+    "predecessor",
+]
+
+
+def generate_grid_zones(rows: int, columns: int) -> Dict:
+    """
+    Generate a rectangular rink layout of rows x columns zones, where each zone is connected to its 8 neighbours.
+    Zones along the boards have a shot-weight of 2 and the rest a shot-weight of 1.
+
+    Args:
+        rows (int): the number of rows of zones.
+        columns (int): the number of columns of zones.
+    Returns:
+        the zone layout keyed by zone id, zone ids are numbered row by row.
+    """
+    zones = {}
+    for r in range(rows):
+        for c in range(columns):
+            connections = [
+                (r + dr) * columns + (c + dc)
+                for dr in [-1, 0, 1]
+                for dc in [-1, 0, 1]
+                if (dr or dc) and 0 <= r + dr < rows and 0 <= c + dc < columns
+            ]
+            boards = r in [0, rows - 1] or c in [0, columns - 1]
+            zones[r * columns + c] = {
+                "connections": connections,
+                "shot-weight": 2 if boards else 1,
+            }
+    return zones
+
+
+def validate_zones(zones: Dict) -> None:
+    """Raise a ValueError if the zone layout can not be compiled."""
+    if sorted(zones) != list(range(len(zones))):
+        raise ValueError("zone ids must be the integers 0..N-1")
+    for zone, data in zones.items():
+        for connection in data["connections"]:
+            if connection not in zones:
+                raise ValueError(f"zone {zone} connects to unknown zone {connection}")
+
+
+def zones_key(zones: Dict) -> Tuple:
+    """Return a hashable key that identifies a zone layout."""
+    return tuple(
+        (z, tuple(zones[z]["connections"]), zones[z]["shot-weight"])
+        for z in sorted(zones)
+    )
+
+
+# the topologies compiled or loaded by this process, keyed by zones_key
+_TOPOLOGIES = {}
+
+
+def get_topology(
+    zones: Dict = None, cache_file: Union[str, Path] = None
+) -> RinkTopology:
+    """
+    Return the shared RinkTopology of a zone layout. Each layout is compiled once per process, or loaded from
+    the cache_file if it holds the same layout, in which case the compiled topology is saved to it.
+
+    Args:
+        zones (Dict): the zone layout. Default = None, the DEFAULT_ZONES layout.
+        cache_file (str | Path): a .npz file to load the topology from or save it to. Default = None.
+    Returns:
+        the RinkTopology of the zone layout.
+    """
+    zones = DEFAULT_ZONES if zones is None else zones
+    key = zones_key(zones)
+    topology = _TOPOLOGIES.get(key)
+    if topology is not None:
+        return topology
+
+    if cache_file is not None and Path(cache_file).is_file():
+        loaded = RinkTopology.load(cache_file)
+        if zones_key(loaded.to_zones()) == key:
+            topology = loaded
+    if topology is None:
+        topology = RinkTopology.compile(zones)
+        if cache_file is not None:
+            topology.save(cache_file)
+    _TOPOLOGIES[key] = topology
+    return topology
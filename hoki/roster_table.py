@@ -0,0 +1,193 @@
+import os
+import tempfile
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from hoki.body import Body, dominant_hands
+from hoki.pawn import Pawn, position
+from hoki.statblock import STAT_NAMES, StatBlock
+from hoki.team import Team
+
+# the directory the tables are written to, a RAM backed one where the platform has it
+TABLE_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# the arrays that make up a RosterTable, in the order they are packed, the nonce is the header of the file
+TABLE_ARRAYS = [
+    "nonce",
+    "stats",
+    "shooting_hand",
+    "position",
+    "shoots",
+    "jersey_num",
+    "team",
+    "team_offsets",
+    "team_members",
+]
+
+
+class RosterTable:
+    """
+    The league's player table packed into a single memory-mapped file, so worker processes can share one copy of
+    the roster instead of unpickling the Pawns of every game. The file is created once per season by the league,
+    each worker attaches to it once, and tasks only need to name teams by index.
+
+    Players are referred to by their row in the table and teams by their index. A worker rebuilds the Pawns and
+    Teams it needs from the table, the Pawns are named by their row and the Teams by their index.
+
+    Attributes:
+        path (str): the path of the memory-mapped file.
+        layout (Dict[str, Tuple[int, Tuple[int, ...], str]]): the offset, shape and dtype of each array.
+        nonce (np.ndarray): a random number drawn for each table created, shape (1,). The path of a removed table
+            can be reused by a new one, the nonce tells them apart.
+        stats (np.ndarray): the stats of each player, shape (players, STAT_NAMES).
+        shooting_hand, position, shoots, jersey_num (np.ndarray): the remaining player fields, enums as values.
+        team (np.ndarray): the team index of each player, -1 if they are not on a team.
+        team_offsets, team_members (np.ndarray): the player rows of team t are
+            team_members[team_offsets[t]:team_offsets[t + 1]].
+    """
+
+    def __init__(
+        self,
+        path: str,
+        layout: Dict[str, Tuple[int, Tuple[int, ...], str]],
+        owner: bool = False,
+    ) -> None:
+        self.path = path
+        self.layout = layout
+        self.owner = owner
+        for name, (offset, shape, dtype) in layout.items():
+            array = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+            setattr(self, name, array)
+        self._pawns = {}
+        self._teams = {}
+
+    @classmethod
+    def create(
+        cls, teams: List[Team], players: List[Pawn], directory: str = TABLE_DIR
+    ) -> "RosterTable":
+        """
+        Pack the teams and players into a new memory-mapped file and return the table that owns it.
+
+        Args:
+            teams (List[Team]): the teams, in team index order.
+            players (List[Pawn]): the players, in row order.
+            directory (str): the directory to create the file in. Default = TABLE_DIR.
+        Returns:
+            the RosterTable, unlink it once the workers are done with it.
+        """
+        row_by_id = {player.id: row for row, player in enumerate(players)}
+        team = np.full(len(players), -1, dtype=np.int32)
+        team_offsets = np.zeros(len(teams) + 1, dtype=np.int64)
+        members = []
+        for t, roster in enumerate(teams):
+            rows = [row_by_id[player_id] for player_id in roster.players]
+            team[rows] = t
+            members.extend(rows)
+            team_offsets[t + 1] = len(members)
+
+        arrays = {
+            "nonce": np.frombuffer(os.urandom(8), dtype=np.uint64),
+            "stats": np.array(
+                [[getattr(p.stats, stat) for stat in STAT_NAMES] for p in players],
+                dtype=np.float64,
+            ).reshape(len(players), len(STAT_NAMES)),
+            "shooting_hand": np.array(
+                [p.stats.shooting_hand for p in players], dtype=np.int8
+            ),
+            "position": np.array([p.position.value for p in players], dtype=np.int8),
+            "shoots": np.array([p.shoots.value for p in players], dtype=np.int8),
+            "jersey_num": np.array([p.jersey_num for p in players], dtype=np.int16),
+            "team": team,
+            "team_offsets": team_offsets,
+            "team_members": np.array(members, dtype=np.int32),
+        }
+
+        layout = {}
+        offset = 0
+        for name in TABLE_ARRAYS:
+            array = arrays[name]
+            # keep every array aligned to 8 bytes
+            offset += -offset % 8
+            layout[name] = (offset, array.shape, array.dtype.str)
+            offset += array.nbytes
+
+        fd, path = tempfile.mkstemp(prefix="hoki-roster-", suffix=".bin", dir=directory)
+        with os.fdopen(fd, "wb") as f:
+            f.truncate(max(offset, 1))
+            for name in TABLE_ARRAYS:
+                f.seek(layout[name][0])
+                f.write(arrays[name].tobytes())
+        return cls(path, layout, owner=True)
+
+    @classmethod
+    def attach(
+        cls, path: str, layout: Dict[str, Tuple[int, Tuple[int, ...], str]]
+    ) -> "RosterTable":
+        """Attach to a table created by RosterTable.create, as a worker process does at start up."""
+        return cls(path, layout)
+
+    @staticmethod
+    def read_nonce(
+        path: str, layout: Dict[str, Tuple[int, Tuple[int, ...], str]]
+    ) -> int:
+        """Return the nonce of the table at path, read from the file rather than mapped."""
+        offset, _, dtype = layout["nonce"]
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return int(np.frombuffer(f.read(8), dtype=dtype)[0])
+
+    def unlink(self) -> None:
+        """Remove the file, the mapped arrays stay readable until they are dropped."""
+        if self.owner and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self) -> "RosterTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.unlink()
+
+    @property
+    def nbytes(self) -> int:
+        """The size of the packed table in bytes."""
+        return sum(getattr(self, name).nbytes for name in TABLE_ARRAYS)
+
+    def team_players(self, team: int) -> List[int]:
+        """Return the player rows of the team."""
+        start, end = self.team_offsets[team], self.team_offsets[team + 1]
+        return self.team_members[start:end].tolist()
+
+    def get_pawn(self, row: int) -> Pawn:
+        """Return the Pawn of a player row, built from the table the first time it is needed."""
+        pawn = self._pawns.get(row)
+        if pawn is None:
+            stats = StatBlock(
+                **{stat: float(v) for stat, v in zip(STAT_NAMES, self.stats[row])},
+                shooting_hand=int(self.shooting_hand[row]),
+            )
+            pawn = Pawn(
+                id=row,
+                name=str(row),
+                position=position(int(self.position[row])),
+                shoots=dominant_hands(int(self.shoots[row])),
+                stats=stats,
+                jersey_num=int(self.jersey_num[row]),
+                body=Body(),
+            )
+            self._pawns[row] = pawn
+        return pawn
+
+    def get_team(self, team: int) -> Team:
+        """Return the Team of a team index, named by its index, with its players as rows."""
+        roster = self._teams.get(team)
+        if roster is None:
+            roster = Team(name=str(team), players=self.team_players(team))
+            self._teams[team] = roster
+        return roster
+
+    def get_players_by_id(self, teams: List[int]) -> Dict[int, Pawn]:
+        """Return the Pawns of every player on the teams keyed by row."""
+        return {
+            row: self.get_pawn(row) for team in teams for row in self.team_players(team)
+        }
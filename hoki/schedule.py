@@ -0,0 +1,92 @@
+import random
+from collections.abc import Sequence
+from typing import Iterator, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class RoundRobin(Sequence):
+    """
+    A lazy round robin schedule, built with the circle method. The teams are placed on the positions of a circle,
+    padded with a bye when there is an odd number of them, one position is fixed and the others rotate a step each
+    day, so every team plays every other team once per meeting and at most once per game day.
+
+    Nothing is materialized, the schedule only keeps the shuffled positions of the teams and order of the rounds,
+    and each game is computed from its index. The games are indexed and iterated game day by game day.
+
+    Home ice alternates around the circle so each team has home ice in half its games of a meeting, give or take
+    one, and every other meeting swaps home and away.
+
+    Attributes:
+        teams (Sequence[T]): the teams.
+        meetings (int): the number of times each pair of teams meet.
+        positions (List[int]): the team index at each position of the circle, None for the bye.
+        rounds (List[int]): the round of the circle method played on each day of a meeting.
+        games_per_day (int): the number of games on each day.
+        n_days (int): the number of game days.
+
+    Args:
+        teams (Sequence[T]): the teams.
+        meetings (int): the number of times each pair of teams meet. Default = 1.
+        rng (random.Random): the random state to shuffle the positions and rounds with. Default = None, the random
+            module.
+    """
+
+    def __init__(
+        self, teams: Sequence, meetings: int = 1, rng: random.Random = None
+    ) -> None:
+        rng = rng if rng is not None else random
+        self.teams = teams
+        self.meetings = meetings
+        self.positions = list(range(len(teams)))
+        rng.shuffle(self.positions)
+        if len(teams) % 2:
+            # the bye is the fixed position, so the same pair is skipped on every day
+            self.positions.append(None)
+        self.rounds = list(range(max(len(self.positions) - 1, 0)))
+        rng.shuffle(self.rounds)
+        self.games_per_day = len(self.positions) // 2 - len(teams) % 2
+        self.n_days = len(self.rounds) * meetings if self.games_per_day else 0
+
+    def __len__(self) -> int:
+        return self.n_days * self.games_per_day
+
+    def __getitem__(self, index: int) -> Tuple[T, T]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("game index out of range")
+        day, game = divmod(index, self.games_per_day)
+        return self.get_game(day, game)
+
+    def __iter__(self) -> Iterator[Tuple[T, T]]:
+        for day in self.game_days():
+            yield from day
+
+    def get_game(self, day: int, game: int) -> Tuple[T, T]:
+        """Return the (home, away) teams of a game of a game day."""
+        meeting, day = divmod(day, len(self.rounds))
+        rotating = len(self.positions) - 1
+        step = self.rounds[day]
+        # with a bye the pair with the fixed position is skipped
+        pair = game + len(self.teams) % 2
+        if pair == 0:
+            home, away = rotating, step
+            if step % 2:
+                home, away = away, home
+        else:
+            home, away = (step + pair) % rotating, (step - pair) % rotating
+            if pair % 2 == 0:
+                home, away = away, home
+        if meeting % 2:
+            home, away = away, home
+        return self.teams[self.positions[home]], self.teams[self.positions[away]]
+
+    def get_game_day(self, day: int) -> List[Tuple[T, T]]:
+        """Return the (home, away) teams of every game of a game day."""
+        return [self.get_game(day, game) for game in range(self.games_per_day)]
+
+    def game_days(self) -> Iterator[List[Tuple[T, T]]]:
+        """Yield the games of each game day in order."""
+        for day in range(self.n_days):
+            yield self.get_game_day(day)
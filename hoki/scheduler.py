@@ -0,0 +1,44 @@
+import heapq
+import math
+from typing import List
+
+
+class DecisionScheduler:
+    """
+    A priority queue of the game tick each player next decides on an action, for the event driven mode of a
+    GameManager. Only the players whose decision is due are run on a tick, and the game skips straight over the
+    ticks where none are.
+
+    Attributes:
+        now (int): the number of game ticks since the start of the game.
+        queue (List[Tuple[int, int]]): a heap of the (tick, player slot) of the next decision of each player, so the
+            players due on the same tick are popped in slot order, the order a tick runs them in.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0
+        self.queue = []
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def schedule(self, player: int, ticks: int) -> None:
+        """Schedule the next decision of a player ticks game ticks from now."""
+        heapq.heappush(self.queue, (self.now + ticks, player))
+
+    def pop_due(self) -> List[int]:
+        """Remove and return the players with a decision due now, in slot order."""
+        players = []
+        while self.queue and self.queue[0][0] <= self.now:
+            players.append(heapq.heappop(self.queue)[1])
+        return players
+
+    def ticks_to_next(self) -> float:
+        """Return the number of game ticks until the next decision, inf if none are scheduled."""
+        if not self.queue:
+            return math.inf
+        return self.queue[0][0] - self.now
+
+    def advance(self, ticks: int) -> None:
+        """Move the clock forward by ticks game ticks."""
+        self.now += ticks
@@ -0,0 +1,282 @@
+import heapq
+import math
+import random
+from typing import List, Set, Tuple
+
+from hoki.game_state import GameState
+from hoki.rink import RinkTopology
+
+# the cost of skating into a zone
+SKATE_COST = 1
+# the extra cost of skating into a zone for every opponent in it
+OPPONENT_COST = 2
+
+# the zone expansions a planner may spend per tick before it reuses stale paths
+DEFAULT_BUDGET = 1000
+# the most paths and trees a planner keeps before it clears its caches
+MAX_CACHED_PATHS = 4096
+MAX_CACHED_TREES = 256
+# the most occupancy changes a planner logs per team before it drops the oldest half
+MAX_LOGGED_CHANGES = 1024
+
+# the seed of the zone keys used to sign the occupancy, fixed so it does not touch the game random state
+SIGNATURE_SEED = 0x5EED
+SIGNATURE_MASK = (1 << 64) - 1
+
+
+class SkatingTree:
+    """
+    The cheapest skating route from every zone to a single target zone.
+
+    Attributes:
+        dist (List[float]): the cost of skating from each zone to the target, inf if it can not be reached.
+        next (List[int]): the next zone on the route from each zone, -1 if it can not be reached.
+        costs (List[int]): the cost of entering each zone the tree was calculated with.
+        version (int): the position in the occupancy change log the tree is up to date with.
+    """
+
+    def __init__(self, target: int, costs: List[int], version: int) -> None:
+        self.dist = [math.inf for _ in costs]
+        self.next = [-1 for _ in costs]
+        self.dist[target] = 0
+        self.next[target] = target
+        self.costs = costs
+        self.version = version
+
+
+class SkatingPlanner:
+    """
+    A per game skating planner. Entering a zone costs SKATE_COST plus OPPONENT_COST for every opponent in it,
+    so skaters route around the other team.
+
+    The planner keeps the occupancy of every zone up to date through move, which also updates a Zobrist style
+    signature of the occupancy each team skates against. Paths are cached per (team, source, target, signature)
+    and the routes to each target are kept as trees that are repaired, rather than recalculated, when a move
+    changes the cost of only one or two zones. The zone expansions spent per tick are capped by the budget: a
+    build or repair only starts while budget is left, after that stale but valid routes are reused and players
+    without a route stay in their zone until the next tick.
+
+    Attributes:
+        adjacency (List[List[int]]): the connected zones of each zone.
+        occupancy (List[List[int]]): the number of players of each team in each zone, indexed by team then zone.
+        signatures (List[int]): a signature of the opponents occupancy of each team.
+        budget (int): the zone expansions allowed per tick.
+        work (int): the zone expansions spent this tick.
+        stats (Dict[str, int]): counts of cache hits, tree builds, tree repairs and stale routes.
+
+    Args:
+        topology (RinkTopology): the rink to skate on.
+        game_state (GameState): the game to plan for, the occupancy is taken from its player_by_zone.
+        budget (int): the zone expansions allowed per tick. Default = DEFAULT_BUDGET.
+    """
+
+    def __init__(
+        self,
+        topology: RinkTopology,
+        game_state: GameState,
+        budget: int = DEFAULT_BUDGET,
+    ) -> None:
+        self.n_zones = topology.n_zones
+        self.adjacency = topology.adjacency
+        self.reverse = [[] for _ in range(self.n_zones)]
+        for zone, connections in enumerate(self.adjacency):
+            for connection in connections:
+                self.reverse[connection].append(zone)
+
+        self.team_by_player = game_state.team_by_player
+        self.n_teams = len(game_state.players_by_team)
+        keys = random.Random(SIGNATURE_SEED)
+        self.keys = [keys.getrandbits(64) for _ in range(self.n_zones)]
+        self.occupancy = [[0] * self.n_zones for _ in range(self.n_teams)]
+        self.signatures = [0 for _ in range(self.n_teams)]
+        # the zones whose cost changed for each team, and the log position of the first entry
+        self.changes = [[] for _ in range(self.n_teams)]
+        self.change_base = [0 for _ in range(self.n_teams)]
+        for zone, players in enumerate(game_state.player_by_zone):
+            for player in players:
+                self._update(self.team_by_player[player], zone, 1)
+
+        self.trees = {}
+        self.paths = {}
+        self.budget = budget
+        self.work = 0
+        self.stats = {"hits": 0, "builds": 0, "repairs": 0, "stale": 0}
+
+    def begin_tick(self) -> None:
+        """Reset the work spent, called at the start of every game tick."""
+        self.work = 0
+
+    def move(self, player: int, old_zone: int, new_zone: int) -> None:
+        """Update the occupancy after the player skated from old_zone to new_zone."""
+        if old_zone == new_zone:
+            return
+        team = self.team_by_player[player]
+        self._update(team, old_zone, -1)
+        self._update(team, new_zone, 1)
+
+    def _update(self, team: int, zone: int, count: int) -> None:
+        self.occupancy[team][zone] += count
+        for other in range(self.n_teams):
+            if other == team:
+                continue
+            self.signatures[other] = (
+                self.signatures[other] + count * self.keys[zone]
+            ) & SIGNATURE_MASK
+            changes = self.changes[other]
+            changes.append(zone)
+            if len(changes) > MAX_LOGGED_CHANGES:
+                drop = len(changes) // 2
+                del changes[:drop]
+                self.change_base[other] += drop
+
+    def zone_cost(self, team: int, zone: int) -> int:
+        """Return the cost of entering the zone for a player of the team."""
+        opponents = sum(
+            self.occupancy[other][zone]
+            for other in range(self.n_teams)
+            if other != team
+        )
+        return SKATE_COST + OPPONENT_COST * opponents
+
+    def costs(self, team: int) -> List[int]:
+        """Return the cost of entering each zone for a player of the team."""
+        return [self.zone_cost(team, zone) for zone in range(self.n_zones)]
+
+    def get_path(self, player: int, source: int, target: int) -> Tuple[int, ...]:
+        """
+        Return the cheapest skating path for the player from the source zone to the target zone.
+
+        Args:
+            player (int): the player slot.
+            source (int): the zone id to start from.
+            target (int): the zone id to skate to.
+        Returns:
+            a tuple of zone ids from the source to the target, only the source if the target can not be reached.
+        """
+        team = self.team_by_player[player]
+        key = (team, source, target, self.signatures[team])
+        path = self.paths.get(key)
+        if path is not None:
+            self.stats["hits"] += 1
+            return path
+
+        tree, fresh = self._get_tree(team, target)
+        path = [source]
+        if tree is not None and tree.next[source] != -1:
+            while path[-1] != target:
+                path.append(tree.next[path[-1]])
+        path = tuple(path)
+        if fresh:
+            if len(self.paths) >= MAX_CACHED_PATHS:
+                self.paths.clear()
+            self.paths[key] = path
+        return path
+
+    def next_zone(self, player: int, source: int, target: int) -> int:
+        """Return the zone the player should skate into next to reach the target zone."""
+        path = self.get_path(player, source, target)
+        return path[1] if len(path) > 1 else source
+
+    def _get_tree(self, team: int, target: int) -> Tuple[SkatingTree, bool]:
+        """
+        Return the route tree of the team to the target and whether it matches the current occupancy. The tree
+        is None if there is none and the budget is spent.
+        """
+        version = self.change_base[team] + len(self.changes[team])
+        tree = self.trees.get((team, target))
+        if tree is None or tree.version < self.change_base[team]:
+            if self.work >= self.budget:
+                self.stats["stale"] += 1
+                return None, False
+            if len(self.trees) >= MAX_CACHED_TREES:
+                self.trees.clear()
+            tree = SkatingTree(target, self.costs(team), version)
+            self._propagate(tree, [(0, target)])
+            self.trees[(team, target)] = tree
+            self.stats["builds"] += 1
+            return tree, True
+        if tree.version == version:
+            return tree, True
+        if self.work >= self.budget:
+            self.stats["stale"] += 1
+            return tree, False
+
+        start = tree.version - self.change_base[team]
+        changed = set(self.changes[team][start:])
+        self._repair(tree, team, changed)
+        tree.version = version
+        self.stats["repairs"] += 1
+        return tree, True
+
+    def _repair(self, tree: SkatingTree, team: int, zones: Set[int]) -> None:
+        """Repair the tree after the cost of the zones changed."""
+        costs = tree.costs
+        increased = []
+        decreased = []
+        for zone in zones:
+            cost = self.zone_cost(team, zone)
+            if cost > costs[zone]:
+                increased.append(zone)
+            elif cost < costs[zone]:
+                decreased.append(zone)
+            costs[zone] = cost
+
+        dist = tree.dist
+        next_zone = tree.next
+        # every route that enters a dearer zone may change, so clear those zones and the routes through them
+        invalid = set()
+        if increased:
+            children = [[] for _ in range(self.n_zones)]
+            for zone, following in enumerate(next_zone):
+                if following != -1 and following != zone:
+                    children[following].append(zone)
+            stack = [child for zone in increased for child in children[zone]]
+            while stack:
+                zone = stack.pop()
+                if zone not in invalid:
+                    invalid.add(zone)
+                    stack.extend(children[zone])
+            for zone in invalid:
+                dist[zone] = math.inf
+                next_zone[zone] = -1
+
+        heap = []
+        for zone in invalid:
+            for connection in self.adjacency[zone]:
+                candidate = costs[connection] + dist[connection]
+                if candidate < dist[zone]:
+                    dist[zone] = candidate
+                    next_zone[zone] = connection
+            if dist[zone] < math.inf:
+                heap.append((dist[zone], zone))
+        for zone in decreased:
+            candidate = costs[zone] + dist[zone]
+            for previous in self.reverse[zone]:
+                if candidate < dist[previous]:
+                    dist[previous] = candidate
+                    next_zone[previous] = zone
+                    heap.append((candidate, previous))
+        heapq.heapify(heap)
+        self._propagate(tree, heap)
+
+    def _propagate(self, tree: SkatingTree, heap: List[Tuple[float, int]]) -> None:
+        """Run Dijkstra backwards from the zones in the heap, lowering the cost of the zones that lead to them."""
+        dist = tree.dist
+        next_zone = tree.next
+        costs = tree.costs
+        while heap:
+            cost, zone = heapq.heappop(heap)
+            if cost > dist[zone]:
+                continue
+            self.work += 1
+            candidate = cost + costs[zone]
+            for previous in self.reverse[zone]:
+                if candidate < dist[previous]:
+                    dist[previous] = candidate
+                    next_zone[previous] = zone
+                    heapq.heappush(heap, (candidate, previous))
+
+
+def path_cost(path: Tuple[int, ...], costs: List[int]) -> int:
+    """Return the cost of skating along the path, the cost of every zone entered after the first."""
+    return sum(costs[zone] for zone in path[1:])
@@ -28,3 +28,14 @@ class Team:
 def generate_team_name():
     """Return a random team name. '<random city> <random word>s'"""
     return faker.city() + " " + faker.word() + "s"
+
+
+def generate_team_names(n_teams: int) -> List[str]:
+    """
+    Return n_teams distinct random team names. A league indexes its teams by name, so a name that is already taken
+    is drawn again.
+    """
+    names = {}
+    while len(names) < n_teams:
+        names.setdefault(generate_team_name())
+    return list(names)
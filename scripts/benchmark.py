@@ -0,0 +1,926 @@
+import argparse
+import itertools
+import pickle
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from hoki.body import Body
+from hoki.batch_game import BatchGameManager
+from hoki.checkpoint import CHECKPOINT_INTERVAL, SeasonCheckpoint
+from hoki.event_log import EventLog, event_type
+from hoki.executor import SimulationExecutor
+from hoki.game import STATS_NAMES, GameManager
+from hoki.game_config import GameConfig
+from hoki.game_random import GameRandom
+from hoki.game_result import GameResult
+from hoki.ice_map import IceMap
+from hoki.league import (
+    CHUNK_SIZES,
+    League,
+    guided_chunks,
+    init_worker,
+    run_combined_task,
+    run_game_spec,
+)
+from hoki.league_stats import LeagueStats, reduce_partials
+from hoki.occupancy import ZoneOccupancy, lane_bits
+from hoki.pawn import Pawn, dominant_hands, generate_player_name, position
+from hoki.replay import KEYFRAME_INTERVAL, Replay
+from hoki.rink import DEFAULT_ZONES, RinkTopology, generate_grid_zones
+from hoki.roster_table import RosterTable
+from hoki.schedule import RoundRobin
+from hoki.statblock import generate_inital_stats
+from hoki.team import Team
+
+POSITIONS = [
+    position.GOALIE,
+    position.DEFENCE_L,
+    position.DEFENCE_R,
+    position.WING_L,
+    position.WING_R,
+    position.CENTRE,
+]
+
+
+def generate_league_data(n_teams):
+    """Return a list of teams and a list of their players, 6 players per team."""
+    teams = []
+    players = []
+    for t in range(n_teams):
+        team = Team(name=f"team-{t}")
+        for i, pos in enumerate(POSITIONS):
+            pawn = Pawn(
+                name=generate_player_name(),
+                position=pos,
+                id=f"p{t * len(POSITIONS) + i}",
+                shoots=(
+                    dominant_hands.LEFT
+                    if random.randint(0, 1) == 0
+                    else dominant_hands.RIGHT
+                ),
+                stats=generate_inital_stats(),
+                jersey_num=random.randint(0, 99),
+                body=Body(),
+            )
+            team.players.append(pawn.id)
+            players.append(pawn)
+        teams.append(team)
+    return teams, players
+
+
+def report(name, samples, unit="s"):
+    """Print the mean, median and min of a list of timings."""
+    print(
+        f"{name}: mean={statistics.mean(samples):.6f}{unit} "
+        f"median={statistics.median(samples):.6f}{unit} "
+        f"min={min(samples):.6f}{unit} (n={len(samples)})"
+    )
+
+
+def bench_game(args):
+    """Time complete games between two teams."""
+    random.seed(args.seed)
+    teams, players = generate_league_data(2)
+    samples = []
+    for _ in range(args.games):
+        game = GameManager(teams[0], teams[1], players)
+        start = time.perf_counter()
+        game.run()
+        samples.append(time.perf_counter() - start)
+    report("per-game run time", samples)
+
+
+def bench_schedule(args):
+    """
+    Measure the time and peak memory to build a season schedule and read its first game day, for shuffling a
+    list of every pairing against the lazy RoundRobin. The list is only built up to 2,000 teams.
+    """
+    for n_teams in [500, 2000, 10000]:
+        teams = list(range(n_teams))
+        line = f"{n_teams} teams, {n_teams * (n_teams - 1) // 2} games:"
+        if n_teams <= 2000:
+            tracemalloc.start()
+            start = time.perf_counter()
+            games = list(itertools.combinations(teams, 2))
+            random.Random(args.seed).shuffle(games)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del games
+            line += f" shuffled list {elapsed:.2f}s, {peak / 2**20:.0f}MiB;"
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        schedule = RoundRobin(teams, rng=random.Random(args.seed))
+        schedule.get_game_day(0)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += (
+            f" RoundRobin {elapsed * 1e3:.1f}ms, {peak / 2**10:.0f}KiB, "
+            f"{schedule.n_days} days of {schedule.games_per_day} games"
+        )
+        print(line)
+
+
+def bench_setup(args):
+    """Time the construction of a GameManager, including its rink."""
+    random.seed(args.seed)
+    teams, players = generate_league_data(2)
+    samples = []
+    for _ in range(args.games):
+        start = time.perf_counter()
+        GameManager(teams[0], teams[1], players)
+        samples.append(time.perf_counter() - start)
+    report("GameManager setup time", samples)
+
+
+def bench_ticks(args):
+    """Measure how many game ticks per second a GameManager runs."""
+    random.seed(args.seed)
+    teams, players = generate_league_data(2)
+    ticks = 0
+    elapsed = 0.0
+    for _ in range(args.games):
+        game = GameManager(teams[0], teams[1], players)
+        start = time.perf_counter()
+        while not game.completed:
+            game.completed = game.increment_state()
+            ticks += 1
+        elapsed += time.perf_counter() - start
+    print(f"ticks per second: {ticks / elapsed:.0f} ({ticks} ticks)")
+
+
+def bench_is_tied(args):
+    """Time the tie check polled by GameManager.increment_state on every overtime tick."""
+    random.seed(args.seed)
+    teams, players = generate_league_data(2)
+    game = GameManager(teams[0], teams[1], players)
+    calls = 10000
+    start = time.perf_counter()
+    for _ in range(calls):
+        game.is_tied()
+    report("is_tied", [(time.perf_counter() - start) / calls * 1e6], unit="us")
+
+
+def bench_batch(args):
+    """Time a batch of games run in lockstep by the BatchGameManager."""
+    random.seed(args.seed)
+    teams, players = generate_league_data(2)
+    players_by_id = {p.id: p for p in players}
+    for n_games in [args.games, args.games * 10, args.games * 100]:
+        batch = BatchGameManager([teams] * n_games, players_by_id, seed=args.seed)
+        start = time.perf_counter()
+        batch.run()
+        elapsed = time.perf_counter() - start
+        report(f"batch of {n_games} per-game run time", [elapsed / n_games])
+
+
+def bench_replay(args):
+    """
+    Measure the size of a game replay, the time to record it against running the game, and the time to seek to a
+    random tick by restoring a keyframe against re-running the game up to it.
+    """
+    random.seed(args.seed)
+    teams, players = generate_league_data(2)
+    run_times, record_times, sizes, seek_times, rerun_times = [], [], [], [], []
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "replay.npz"
+        for seed in range(args.games):
+            game = GameManager(teams[0], teams[1], players, rng=GameRandom(seed))
+            start = time.perf_counter()
+            game.run()
+            run_times.append(time.perf_counter() - start)
+
+            game = GameManager(teams[0], teams[1], players, rng=GameRandom(seed))
+            start = time.perf_counter()
+            replay = Replay.record(game)
+            record_times.append(time.perf_counter() - start)
+            replay.save(path)
+            sizes.append(path.stat().st_size)
+
+            period = random.randint(1, game.num_periods)
+            clock = random.randint(0, game.timer)
+            game = GameManager(teams[0], teams[1], players, rng=GameRandom(seed))
+            start = time.perf_counter()
+            replay.seek(game, period, clock)
+            seek_times.append(time.perf_counter() - start)
+
+            game = GameManager(teams[0], teams[1], players, rng=GameRandom(seed))
+            start = time.perf_counter()
+            while (game.state.period, game.state.time) != (period, clock):
+                game.completed = game.increment_state()
+            rerun_times.append(time.perf_counter() - start)
+    report("run", run_times)
+    report("record", record_times)
+    report("seek", seek_times)
+    report("re-run to the tick", rerun_times)
+    size = statistics.mean(sizes)
+    print(
+        f"replay {size / 2**10:.1f}KiB/game with a keyframe every {KEYFRAME_INTERVAL} ticks, "
+        f"{size * 1000 * 999 / 2 / 2**30:.1f}GiB for a 1000 team season"
+    )
+
+
+def bench_rink(args):
+    """Time and measure the peak memory of compiling rinks of 21, 200 and 2000 zones."""
+    rinks = {
+        "default": DEFAULT_ZONES,
+        "10x20 grid": generate_grid_zones(10, 20),
+        "40x50 grid": generate_grid_zones(40, 50),
+    }
+    for name, zones in rinks.items():
+        tracemalloc.start()
+        start = time.perf_counter()
+        topology = RinkTopology.compile(zones)
+        topology.get_shot_path(0, len(zones) - 1)
+        single = time.perf_counter() - start
+        _, single_peak = tracemalloc.get_traced_memory()
+
+        start = time.perf_counter()
+        topology.compile_all()
+        full = time.perf_counter() - start
+        _, full_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{name} ({len(zones)} zones): "
+            f"compile + one path={single:.6f}s peak={single_peak / 2**20:.2f}MiB, "
+            f"all pairs={full:.6f}s peak={full_peak / 2**20:.2f}MiB"
+        )
+
+
+def bench_skate(args):
+    """Time the skating planner per tick for the 12 players against uncached Dijkstra paths."""
+    random.seed(args.seed)
+    teams, players = generate_league_data(2)
+    rinks = {
+        "default": None,
+        "10x20 grid": generate_grid_zones(10, 20),
+        "40x50 grid": generate_grid_zones(40, 50),
+    }
+    for name, zones in rinks.items():
+        ice_map = IceMap(zones=zones)
+        game = GameManager(teams[0], teams[1], players, ice_map, plan_skating=True)
+        planner = game.skating_planner
+        manager = game.player_manager
+        cached = []
+        uncached = []
+        max_work = 0
+        for tick in range(args.games * 10):
+            if tick % 5 == 0:
+                # the puck changes hands every few ticks
+                game.state.puck_player = random.randrange(len(game.players))
+                game.state.puck_zone = game.state.zone_by_player[game.state.puck_player]
+            targets = [
+                manager.player_calc_action_skate_success(player, game.state)[1]
+                for player in range(len(game.players))
+            ]
+
+            start = time.perf_counter()
+            for player, target in enumerate(targets):
+                ice_map.get_scate_path_to_zone(
+                    game.state, player, game.state.zone_by_player[player], target
+                )
+            uncached.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            planner.begin_tick()
+            for player, target in enumerate(targets):
+                zone = planner.next_zone(
+                    player, game.state.zone_by_player[player], target
+                )
+                game.move_player(player, zone)
+            cached.append(time.perf_counter() - start)
+            max_work = max(max_work, planner.work)
+
+        cached.sort()
+        uncached.sort()
+        print(
+            f"{name}: per tick planner p50={statistics.median(cached) * 1e6:.1f}us "
+            f"p99={cached[int(len(cached) * 0.99)] * 1e6:.1f}us "
+            f"max={cached[-1] * 1e6:.1f}us, uncached p50={statistics.median(uncached) * 1e6:.1f}us, "
+            f"max work={max_work}/{planner.budget} {planner.stats}"
+        )
+
+
+def bench_lanes(args):
+    """Time counting the opponents on a lane by walking its zones against the occupancy bitmasks."""
+    rng = random.Random(args.seed)
+    rinks = {
+        "default": DEFAULT_ZONES,
+        "10x20 grid": generate_grid_zones(10, 20),
+        "40x50 grid": generate_grid_zones(40, 50),
+    }
+    for name, zones in rinks.items():
+        topology = RinkTopology.compile(zones)
+        team_by_player = [0] * 6 + [1] * 6
+        zone_by_player = [rng.randrange(len(zones)) for _ in team_by_player]
+        player_by_zone = [[] for _ in zones]
+        for player, zone in enumerate(zone_by_player):
+            player_by_zone[zone].append(player)
+        occupancy = ZoneOccupancy(team_by_player, zone_by_player)
+        lanes = [
+            (zone_by_player[rng.randrange(6)], zone_by_player[rng.randrange(6, 12)])
+            for _ in range(args.games * 50)
+        ]
+        for source, target in lanes:
+            lane_bits(topology.get_path_mask(source, target), 12, 0xFFF)
+
+        start = time.perf_counter()
+        walked = [
+            sum(
+                1
+                for zone in topology.get_shot_path(source, target)
+                for player in player_by_zone[zone]
+                if team_by_player[player] == 1
+            )
+            for source, target in lanes
+        ]
+        walk = (time.perf_counter() - start) / len(lanes)
+
+        start = time.perf_counter()
+        counted = [
+            (
+                occupancy.teams[1]
+                & lane_bits(topology.get_path_mask(source, target), 12, 0xFFF)
+            ).bit_count()
+            for source, target in lanes
+        ]
+        bits = (time.perf_counter() - start) / len(lanes)
+        assert walked == counted
+        print(f"{name}: walk={walk * 1e6:.2f}us bitmask={bits * 1e6:.2f}us per lane")
+
+
+def bench_rng(args):
+    """Time single draws from the random module against a GameRandom stream."""
+    calls = 200000
+    rng = GameRandom(args.seed)
+    options = [0, 1, 2, 3, 4]
+    draws = {
+        "random.random": lambda: random.random(),
+        "GameRandom.random": lambda: rng.random(),
+        "random.randint": lambda: random.randint(0, 4),
+        "GameRandom.randint": lambda: rng.randint(0, 4),
+        "random.uniform": lambda: random.uniform(0, 1),
+        "GameRandom.uniform": lambda: rng.uniform(0, 1),
+        "random.choice": lambda: random.choice(options),
+        "GameRandom.choice": lambda: rng.choice(options),
+    }
+    for name, draw in draws.items():
+        start = time.perf_counter()
+        for _ in range(calls):
+            draw()
+        report(name, [(time.perf_counter() - start) / calls * 1e9], unit="ns")
+
+
+def bench_season(args):
+    """
+    Measure the bytes sent to and from the workers and the wall time of a season at 32, 128 and 512 teams, for
+    pickling whole GameManagers through the pool against sending a GameSpec and getting a GameResult back. The
+    roster is shipped once per worker, either pickled or as the path of a RosterTable.
+    """
+    sample = args.games * 5
+    for n_teams in [32, 128, 512]:
+        random.seed(args.seed)
+        teams, players = generate_league_data(n_teams)
+        players_by_id = {player.id: player for player in players}
+        league = League(teams, players, seed=args.seed)
+        n_games = len(league.seasons[0].schedule)
+        specs = league.get_game_specs()[:sample]
+
+        start = time.perf_counter()
+        games = [
+            GameManager(
+                teams[spec.home],
+                teams[spec.away],
+                [
+                    players_by_id[p]
+                    for p in teams[spec.home].players + teams[spec.away].players
+                ],
+                rng=GameRandom(spec.seed),
+            )
+            for spec in specs
+        ]
+        with Pool() as pool:
+            done = pool.map(league.run_game, games)
+        legacy_time = (time.perf_counter() - start) / len(specs)
+        legacy_bytes = statistics.mean(len(pickle.dumps(g)) for g in games)
+        legacy_bytes += statistics.mean(len(pickle.dumps(g)) for g in done)
+        league_bytes = len(pickle.dumps(league))
+
+        start = time.perf_counter()
+        with RosterTable.create(teams, players) as table:
+            initargs = (table.path, table.layout)
+            with Pool(initializer=init_worker, initargs=initargs) as pool:
+                results = pool.map(run_game_spec, specs)
+            table_bytes = table.nbytes
+        compact_time = (time.perf_counter() - start) / len(specs)
+        compact_bytes = statistics.mean(len(pickle.dumps(s)) for s in specs)
+        compact_bytes += statistics.mean(len(pickle.dumps(r)) for r in results)
+        roster_bytes = len(pickle.dumps((teams, players)))
+        init_bytes = len(pickle.dumps(initargs))
+
+        print(
+            f"{n_teams} teams, {n_games} games: "
+            f"GameManager round trip {legacy_bytes:.0f}B/game "
+            f"+ {league_bytes}B League per task, "
+            f"{legacy_bytes * n_games / 2**20:.1f}MiB/season, "
+            f"{legacy_time * n_games:.1f}s/season; "
+            f"GameSpec/GameResult {compact_bytes:.0f}B/game "
+            f"+ {init_bytes}B per worker for a {table_bytes}B RosterTable "
+            f"(pickled roster {roster_bytes}B), "
+            f"{compact_bytes * n_games / 2**20:.1f}MiB/season, "
+            f"{compact_time * n_games:.1f}s/season "
+            f"(times extrapolated from {len(specs)} games)"
+        )
+
+
+def bench_checkpoint(args):
+    """
+    Time a season of 32 teams with and without a checkpoint after every game day, and the cost of saving the
+    checkpoint of a 1,000 team league against the wall time of its season, extrapolated from the 32 team one.
+    """
+    random.seed(args.seed)
+    teams, players = generate_league_data(32)
+    times = {}
+    with tempfile.TemporaryDirectory() as directory, SimulationExecutor() as executor:
+        path = Path(directory) / "season.npz"
+        for name, kwargs in [
+            ("warm up", {}),
+            ("none", {}),
+            ("every day", {"checkpoint": path, "checkpoint_interval": 0}),
+        ]:
+            league = League(teams, players, seed=args.seed, executor=executor)
+            start = time.perf_counter()
+            league.run_season(**kwargs)
+            times[name] = time.perf_counter() - start
+        per_game = times["none"] / len(league.seasons[0].schedule)
+        n_days = league.seasons[0].schedule.n_days
+
+        random.seed(args.seed)
+        teams, players = generate_league_data(1000)
+        league = League(teams, players, seed=args.seed)
+        n_games = len(league.seasons[0].schedule)
+        checkpoint = SeasonCheckpoint.from_stats(0, n_games, 0, 1, league.stats)
+        timings = []
+        for _ in range(args.games):
+            start = time.perf_counter()
+            checkpoint.save(path)
+            timings.append(time.perf_counter() - start)
+        size = path.stat().st_size
+
+    print(
+        f"32 teams: season {times['none']:.2f}s, "
+        f"{times['every day']:.2f}s checkpointed after each of {n_days} days"
+    )
+    save = statistics.median(timings)
+    season = per_game * n_games
+    print(
+        f"1000 teams: checkpoint {size / 2**20:.2f}MiB saved in {save * 1e3:.1f}ms, "
+        f"season ~{season:.0f}s, one save per {CHECKPOINT_INTERVAL:.0f}s interval "
+        f"costs {save / CHECKPOINT_INTERVAL:.3%} of the season"
+    )
+
+
+def bench_combine(args):
+    """
+    Measure the messages and bytes sent back by the workers over a 32 team season, for a GameResult per game
+    against a PartialStats per batch, and the cost of combining and tree reducing partials for a million games
+    of a 1,000 team league.
+    """
+    random.seed(args.seed)
+    teams, players = generate_league_data(32)
+    league = League(teams, players, seed=args.seed)
+    specs = league.get_game_specs()
+    start = time.perf_counter()
+    with RosterTable.create(teams, players) as table:
+        initargs = (table.path, table.layout)
+        with Pool(initializer=init_worker, initargs=initargs) as pool:
+            results = list(pool.imap_unordered(run_game_spec, specs, 32))
+    result_time = time.perf_counter() - start
+    result_bytes = sum(len(pickle.dumps(r)) for r in results)
+
+    league = League(teams, players, seed=args.seed)
+    specs = league.get_game_specs()
+    start = time.perf_counter()
+    league.run_season()
+    partial_time = time.perf_counter() - start
+    with RosterTable.create(teams, players) as table:
+        init_worker(table.path, table.layout)
+        tasks = [
+            (table.path, table.layout, "scalar", specs[i::16], 0, league.config)
+            for i in range(16)
+        ]
+        partials = [run_combined_task(task) for task in tasks]
+    partial_bytes = statistics.mean(len(pickle.dumps(p)) for p in partials)
+    n_batches = -(-len(specs) // CHUNK_SIZES["scalar"])
+    print(
+        f"32 teams, {len(specs)} games: {len(results)} GameResults, {result_bytes / 2**10:.0f}KiB, "
+        f"{result_time:.1f}s; {n_batches} PartialStats of {CHUNK_SIZES['scalar']} games, "
+        f"{n_batches * partial_bytes / 2**10:.0f}KiB, {partial_time:.1f}s"
+    )
+
+    n_teams, n_games, batch = 1000, 1_000_000, 1024
+    rng = np.random.default_rng(args.seed)
+    team_rows = [np.arange(6 * t, 6 * t + 6) for t in range(n_teams)]
+    worker = LeagueStats(team_rows, 6 * n_teams)
+    counts = rng.integers(0, 3, size=(12, len(STATS_NAMES)), dtype=np.int32)
+    matchups = rng.integers(0, n_teams, size=(n_games, 2))
+    matchups[:, 1] = (matchups[:, 0] + 1 + matchups[:, 1] % (n_teams - 1)) % n_teams
+
+    def partials():
+        for start in range(0, n_games, batch):
+            end = start + batch
+            for home, away in matchups[start:end].tolist():
+                worker.add_result(GameResult(home, away, counts, (2, 1), 3))
+            yield worker.take_partial()
+
+    start = time.perf_counter()
+    season = reduce_partials(partials())
+    elapsed = time.perf_counter() - start
+    print(
+        f"{n_teams} teams, {n_games} games in batches of {batch}: {n_games // batch} partials, "
+        f"combined and reduced in {elapsed:.1f}s ({elapsed / n_games * 1e6:.1f}us/game), "
+        f"{season.games} games merged"
+    )
+
+
+def bench_construct(args):
+    """
+    Measure the time to build the league roster index and zeroed stat tables, for the team by player membership
+    scan and row by row DataFrame appends it replaced against the single pass of League._index_roster, and the
+    time to construct a whole League. The old build is only measured up to 1,000 teams, at 10,000 teams it takes
+    minutes.
+    """
+    for n_teams in [250, 1000, 10000]:
+        random.seed(args.seed)
+        teams, players = generate_league_data(n_teams)
+        league = League(teams[:2], players[:12], seed=args.seed)
+        league.teams, league.players = teams, players
+        start = time.perf_counter()
+        league._index_roster()
+        league.player_stats, league.team_stats
+        index_time = time.perf_counter() - start
+
+        line = f"{n_teams} teams, {len(players)} players: single pass {index_time:.2f}s"
+        if n_teams <= 1000:
+            start = time.perf_counter()
+            for t in teams:
+                [p for p in players if p.id in t.players]
+            player_stats = pd.DataFrame(columns=["player-id", "player"] + STATS_NAMES)
+            for player in players:
+                player_stats.loc[len(player_stats)] = [player.id, player.name] + [
+                    0 for _ in STATS_NAMES
+                ]
+            team_stats = pd.DataFrame(columns=["team", "wins", "losses"])
+            for team in teams:
+                team_stats.loc[len(team_stats)] = [team.name, 0, 0]
+            line += f", membership scan and appends {time.perf_counter() - start:.2f}s"
+
+        start = time.perf_counter()
+        League(teams, players, seed=args.seed)
+        line += f", League {time.perf_counter() - start:.2f}s"
+        print(line)
+
+
+def bench_events(args):
+    """
+    Measure the events recorded per game, the bytes of the EventLog against the same events kept as formatted
+    strings, pickled and in memory, and the time to record an event. A game with 1,200 second periods shows the
+    log stays bounded by its capacity.
+    """
+    random.seed(args.seed)
+    teams, players = generate_league_data(2)
+    counts, log_bytes, text_bytes, pickled, text_pickled = [], [], [], [], []
+    for seed in range(args.games):
+        game = GameManager(teams[0], teams[1], players, rng=GameRandom(seed))
+        game.run()
+        events = game.state.events
+        lines = events.lines()
+        counts.append(events.count)
+        log_bytes.append(events.nbytes)
+        text_bytes.append(
+            sys.getsizeof(lines) + sum(sys.getsizeof(line) for line in lines)
+        )
+        pickled.append(len(pickle.dumps(events)))
+        text_pickled.append(len(pickle.dumps(lines)))
+    print(
+        f"{statistics.mean(counts):.0f} events/game: EventLog {statistics.mean(log_bytes) / 2**10:.1f}KiB, "
+        f"pickled {statistics.mean(pickled) / 2**10:.1f}KiB; "
+        f"strings {statistics.mean(text_bytes) / 2**10:.1f}KiB, "
+        f"pickled {statistics.mean(text_pickled) / 2**10:.1f}KiB"
+    )
+
+    log = EventLog()
+    calls = 100000
+    start = time.perf_counter()
+    for i in range(calls):
+        log.record(i, 1, event_type.PASS, 3, 4, 5)
+    report("record", [(time.perf_counter() - start) / calls * 1e6], unit="us")
+
+    game = GameManager(
+        teams[0],
+        teams[1],
+        players,
+        rng=GameRandom(args.seed),
+        config=GameConfig(timer=1200),
+    )
+    game.run()
+    events = game.state.events
+    print(
+        f"1200s periods: {events.count} events, {len(events)} kept, {events.dropped} dropped, "
+        f"{events.nbytes / 2**10:.1f}KiB"
+    )
+
+
+def run_timed_game(teams, players, seed, config):
+    """Run a game and return its run time, shots and the number of times increment_state was called."""
+    game = GameManager(teams[0], teams[1], players, rng=GameRandom(seed), config=config)
+    ticks = 0
+    start = time.perf_counter()
+    while not game.completed:
+        game.completed = game.increment_state()
+        ticks += 1
+    elapsed = time.perf_counter() - start
+    return elapsed, game.boxscore.counts[:, STATS_NAMES.index("shots")].sum(), ticks
+
+
+def bench_next_event(args):
+    """
+    Time complete games in tick mode against event driven mode on the same GameConfig, at 30 and 1,200 second
+    periods, with one tick decisions and, at 1,200 seconds, with decisions paced to 30 a period. Both modes play the
+    same game at the same decision_ticks, compare the mean shots a game; the run time ratio is the speedup of event
+    driven mode, about 1 since tick mode already skips the decisions between two multiples of decision_ticks.
+    """
+    random.seed(args.seed)
+    teams, players = generate_league_data(2)
+    for timer, decision_ticks in [
+        (30, 1),
+        (1200, 1),
+        (1200, GameConfig.paced(1200).decision_ticks),
+    ]:
+        means = {}
+        for event_driven in [False, True]:
+            config = GameConfig(
+                timer=timer, decision_ticks=decision_ticks, event_driven=event_driven
+            )
+            runs = [
+                run_timed_game(teams, players, seed, config)
+                for seed in range(args.games)
+            ]
+            samples, shots, ticks = zip(*runs)
+            name = "event" if event_driven else "tick"
+            means[name] = statistics.mean(samples)
+            report(
+                f"{timer}s periods, {decision_ticks} tick decisions, {name}: {statistics.mean(shots):.0f} shots, "
+                f"{statistics.mean(ticks):.0f} ticks run, per-game run time",
+                samples,
+            )
+        speedup = means["tick"] / means["event"]
+        print(
+            f"{timer}s periods, {decision_ticks} tick decisions: event driven speedup {speedup:.2f}x"
+        )
+
+
+def bench_clock(args):
+    """
+    Measure how the run time of a game grows with the length of its periods, from 30 to 1,200 seconds, with one
+    tick decisions in tick mode and event driven mode. The growth is the slope of log run time against log period
+    length, 1 is linear: both modes play the same game, with decisions and shots growing with the period.
+    """
+    random.seed(args.seed)
+    teams, players = generate_league_data(2)
+    timers = [30, 120, 300, 600, 1200]
+    for name, event_driven in [("tick", False), ("event", True)]:
+        means = []
+        for timer in timers:
+            config = GameConfig(timer=timer, event_driven=event_driven)
+            runs = [
+                run_timed_game(teams, players, seed, config)
+                for seed in range(args.games)
+            ]
+            samples, shots, ticks = zip(*runs)
+            means.append(statistics.mean(samples))
+            print(
+                f"{name}, {timer}s periods: {means[-1] * 1e3:.1f}ms/game, "
+                f"{statistics.mean(ticks):.0f} ticks run, {statistics.mean(shots):.0f} shots"
+            )
+        growth = np.polyfit(np.log(timers), np.log(means), 1)[0]
+        print(
+            f"{name}: {timers[-1] // timers[0]}x the period length, {means[-1] / means[0]:.1f}x the run time, "
+            f"growth {growth:.2f}"
+        )
+
+
+def bench_fold(args):
+    """
+    Measure the time to fold a season of GameResults into the league stats at 1,000 and 1,500 teams, for the
+    per game DataFrame.add fold against the NumPy accumulators, with the cost of building the DataFrames once.
+    """
+    for n_teams in [1000, 1500]:
+        random.seed(args.seed)
+        teams, players = generate_league_data(n_teams)
+        league = League(teams, players, seed=args.seed)
+        n_games = len(league.seasons[0].schedule)
+        rng = np.random.default_rng(args.seed)
+        counts = rng.integers(0, 3, size=(12, len(STATS_NAMES)), dtype=np.int32)
+        results = [
+            GameResult(spec.home, spec.away, counts, goals=(2, 1), period=3)
+            for spec in league.get_game_specs()
+        ]
+
+        index = pd.MultiIndex.from_tuples(
+            [(p.id, p.name) for p in players], names=["player-id", "player"]
+        )
+        player_stats = pd.DataFrame(0, index=index, columns=["games"] + STATS_NAMES)
+        sample = results[: args.games * 5]
+        start = time.perf_counter()
+        for result in sample:
+            player_ids = teams[result.home].players + teams[result.away].players
+            game_index = pd.MultiIndex.from_tuples(
+                [(p, league.players_by_id[p].name) for p in player_ids],
+                names=["player-id", "player"],
+            )
+            game_stats = pd.DataFrame(
+                result.counts, index=game_index, columns=STATS_NAMES
+            )
+            game_stats["games"] = 1
+            player_stats = game_stats.add(player_stats, fill_value=0)
+        frame_time = (time.perf_counter() - start) / len(sample) * n_games
+
+        start = time.perf_counter()
+        for result in results:
+            league._apply_game_result(result)
+        fold_time = time.perf_counter() - start
+        start = time.perf_counter()
+        league.player_stats, league.team_stats
+        build_time = time.perf_counter() - start
+
+        print(
+            f"{n_teams} teams, {n_games} games: DataFrame.add {frame_time:.0f}s/season "
+            f"(extrapolated from {len(sample)} games), "
+            f"accumulators {fold_time:.2f}s/season + {build_time * 1e3:.0f}ms per DataFrame view"
+        )
+
+
+def bench_startup(args):
+    """
+    Measure the cost of starting the workers, and the wall time of short seasons run with a pool started for
+    each season against a SimulationExecutor started once and shared by every season and league.
+    """
+    start = time.perf_counter()
+    with SimulationExecutor() as executor:
+        warm_time = time.perf_counter() - start
+        processes = executor.processes
+    print(
+        f"SimulationExecutor of {processes} workers started and warmed up in {warm_time * 1e3:.0f}ms"
+    )
+
+    random.seed(args.seed)
+    teams, players = generate_league_data(4)
+    n_seasons = args.games
+    start = time.perf_counter()
+    for season in range(n_seasons):
+        League(teams, players, seed=season).run_season()
+    fresh_time = (time.perf_counter() - start) / n_seasons
+
+    start = time.perf_counter()
+    with SimulationExecutor() as executor:
+        for season in range(n_seasons):
+            League(teams, players, seed=season, executor=executor).run_season()
+    shared_time = (time.perf_counter() - start) / n_seasons
+    print(
+        f"{n_seasons} leagues of 4 teams, 6 games each: pool per season {fresh_time * 1e3:.0f}ms/season, "
+        f"shared executor {shared_time * 1e3:.0f}ms/season (including its start up)"
+    )
+
+
+def bench_chunks(args):
+    """
+    Measure the duration of every game of a 32 team season, then replay those durations on 8 and 32 simulated
+    workers that each take the next chunk when idle, for fixed chunks of 32 games against guided_chunks. The
+    makespan is the time the last worker finishes, the ideal is the total divided between the workers.
+    """
+    random.seed(args.seed)
+    teams, players = generate_league_data(32)
+    league = League(teams, players, seed=args.seed)
+    specs = league.get_game_specs()
+    durations = []
+    with RosterTable.create(teams, players) as table:
+        init_worker(table.path, table.layout)
+        for spec in specs:
+            start = time.perf_counter()
+            run_game_spec(spec)
+            durations.append(time.perf_counter() - start)
+    quantiles = statistics.quantiles(durations, n=100)
+    print(
+        f"{len(specs)} games: p50 {quantiles[49] * 1e3:.1f}ms, p99 {quantiles[98] * 1e3:.1f}ms, "
+        f"max {max(durations) * 1e3:.1f}ms"
+    )
+
+    for processes in [8, 32]:
+        line = f"{processes} workers, ideal {sum(durations) / processes:.2f}s:"
+        for name, chunks in [
+            ("fixed", [(i, min(i + 32, len(specs))) for i in range(0, len(specs), 32)]),
+            ("guided", guided_chunks(len(specs), 1, 32, processes)),
+        ]:
+            finish = [0.0] * processes
+            for start, end in chunks:
+                worker = finish.index(min(finish))
+                finish[worker] += sum(durations[start:end])
+            line += f" {name} {len(chunks)} chunks, makespan {max(finish):.2f}s;"
+        print(line)
+
+
+def bench_stream(args):
+    """
+    Measure the peak traced memory of the parent process, and in an untraced run the time to the first folded
+    result and the whole season, for collecting every GameResult with pool.map before folding them against
+    folding them in as they arrive.
+    """
+
+    def map_season(league, teams, players):
+        first = time.perf_counter()
+        with RosterTable.create(teams, players) as table:
+            initargs = (table.path, table.layout)
+            with Pool(initializer=init_worker, initargs=initargs) as pool:
+                results = pool.map(run_game_spec, league.get_game_specs())
+        first = time.perf_counter() - first
+        for result in results:
+            league._apply_game_result(result)
+        return first
+
+    def stream_season(league, teams, players):
+        first = []
+        start = time.perf_counter()
+        league.run_season(
+            progress=lambda done, total: first or first.append(time.perf_counter())
+        )
+        return first[0] - start
+
+    for n_teams in [16, 32]:
+        random.seed(args.seed)
+        teams, players = generate_league_data(n_teams)
+        n_games = n_teams * (n_teams - 1) // 2
+        line = f"{n_teams} teams, {n_games} games:"
+        for name, season in [("pool.map", map_season), ("streamed", stream_season)]:
+            start = time.perf_counter()
+            first = season(League(teams, players, seed=args.seed), teams, players)
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            season(League(teams, players, seed=args.seed), teams, players)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            line += (
+                f" {name} peak {peak / 2**20:.2f}MiB, first result {first:.1f}s, "
+                f"season {elapsed:.1f}s;"
+            )
+        print(line)
+
+
+BENCHMARKS = {
+    "checkpoint": bench_checkpoint,
+    "clock": bench_clock,
+    "chunks": bench_chunks,
+    "combine": bench_combine,
+    "batch": bench_batch,
+    "construct": bench_construct,
+    "events": bench_events,
+    "fold": bench_fold,
+    "game": bench_game,
+    "is-tied": bench_is_tied,
+    "lanes": bench_lanes,
+    "next-event": bench_next_event,
+    "replay": bench_replay,
+    "rink": bench_rink,
+    "rng": bench_rng,
+    "season": bench_season,
+    "schedule": bench_schedule,
+    "setup": bench_setup,
+    "skate": bench_skate,
+    "startup": bench_startup,
+    "stream": bench_stream,
+    "ticks": bench_ticks,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the hoki engine benchmarks.")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS), nargs="+")
+    parser.add_argument("--games", "-g", type=int, default=20)
+    parser.add_argument("--seed", "-s", type=int, default=0)
+    args = parser.parse_args()
+
+    for name in args.benchmark:
+        print(f"== {name} ==")
+        BENCHMARKS[name](args)
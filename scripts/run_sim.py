@@ -1,19 +1,21 @@
 import argparse
+import dataclasses
 import os
 import random
 import xml.etree.ElementTree as ET
 from datetime import datetime
-from multiprocessing import Pool
 from pathlib import Path
 
 import pandas as pd
 
 from hoki.body import Body
+from hoki.game_config import GameConfig
 from hoki.league import League
 from hoki.pawn import Pawn, dominant_hands, generate_player_name, position
 from hoki.save_manager import save_state_to_xml, xml_to_save_state
 from hoki.statblock import STAT_NAMES, generate_inital_stats, get_df_row
-from hoki.team import Team, generate_team_name
+from hoki import faker
+from hoki.team import Team, generate_team_names
 
 DATA_DIR = "data"
 DATA_FILE = "data.xml"
@@ -28,16 +30,18 @@ POSITIONS = [
 ]
 
 
+def print_progress(done, total):
+    print(
+        f"\rPlayed {done}/{total} games", end="\n" if done == total else "", flush=True
+    )
+
+
 def generate_team(name):
     return Team(name=name)
 
 
 def generate_teams(n_teams=2):
-    with Pool() as pool:
-        teams = pool.map(
-            generate_team, [(generate_team_name()) for _ in range(n_teams)]
-        )
-    return teams
+    return [generate_team(name) for name in generate_team_names(n_teams)]
 
 
 def generate_player(pos, id):
@@ -75,10 +79,9 @@ def generate_team_players(offset):
 
 def generate_players(teams):
     all_players = []
-    with Pool() as pool:
-        team_players = pool.map(
-            generate_team_players, [(i * len(POSITIONS)) for i in range(len(teams))]
-        )
+    team_players = [
+        generate_team_players(i * len(POSITIONS)) for i in range(len(teams))
+    ]
     for i, players in enumerate(team_players):
         teams[i].players = [p.id for p in players]
         all_players += players
@@ -162,7 +165,31 @@ if __name__ == "__main__":
         action="store_true",
         default=False,
     )
+    parser.add_argument(
+        "--seed",
+        "-s",
+        help="The seed of the generated dataset and the league, random if not given",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "--period-length",
+        "-p",
+        help="The seconds in each period, the games are paced to the decisions of a default period, "
+        "which plays fewer decisions and changes the stats from one tick decisions over the same period",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "--plan-skating",
+        help="Skate towards the puck or the goal around the opponents, rather than at random",
+        action="store_true",
+        default=False,
+    )
     args = parser.parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+        faker.seed_instance(args.seed)
 
     start = datetime.now()
     data_file = Path(DATA_DIR, DATA_FILE)
@@ -185,10 +212,19 @@ if __name__ == "__main__":
 
     players_df = generate_players_df(players)
 
-    league = League(teams=teams[: args.n_teams], players=players)
+    config = (
+        GameConfig()
+        if args.period_length is None
+        else GameConfig.paced(args.period_length)
+    )
+    config = dataclasses.replace(config, plan_skating=args.plan_skating)
+    league = League(
+        teams=teams[: args.n_teams], players=players, seed=args.seed, config=config
+    )
+    print(f"League seed: {league.seed}")
 
     league_start = datetime.now()
-    league.run_season()
+    league.run_season(progress=print_progress)
     league_time = datetime.now() - league_start
 
     league.player_stats.to_csv(f"data/season_{league.year}_player_stats.csv")
@@ -203,4 +239,6 @@ if __name__ == "__main__":
     print(f"Total teams: {len(teams)}")
     print(f"Completed in: {league_time}")
     print(f"Avg. per game: {league_time/len(games)}")
+    durations = league.game_duration_percentiles()
+    print(f"Game duration p50: {durations['p50']:.3f}s, p99: {durations['p99']:.3f}s")
     print(datetime.now() - start)
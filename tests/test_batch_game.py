@@ -0,0 +1,113 @@
+import random
+
+import numpy as np
+import pytest
+
+from hoki.batch_game import BatchGameManager, run_batch
+from hoki.game import STAT_COLUMNS, GameManager
+from hoki.game_config import GameConfig
+from hoki.league import League
+
+
+def game_summary(counts, period):
+    """Return the per team totals of every stat followed by the final period."""
+    half = counts.shape[0] // 2
+    return np.concatenate([counts[:half].sum(0), counts[half:].sum(0), [period]])
+
+
+def test_batch_game(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+    batch = BatchGameManager([teams, teams[::-1]], {p.id: p for p in players}, seed=0)
+    batch.run()
+    assert batch.completed
+    assert len(batch.active) == 0
+    assert (batch.period >= batch.num_periods).all()
+
+    boxscores = batch.get_boxscores()
+    assert boxscores[0].teams == [teams[0].name, teams[1].name]
+    assert boxscores[1].teams == [teams[1].name, teams[0].name]
+    for g, boxscore in enumerate(boxscores):
+        counts = boxscore.counts
+        assert (counts == batch.counts[g]).all()
+        assert counts[:, STAT_COLUMNS["faceoffs-won"]].sum() * 2 == (
+            counts[:, STAT_COLUMNS["faceoffs"]].sum()
+        )
+        assert counts[:, STAT_COLUMNS["goals"]].sum() <= (
+            counts[:, STAT_COLUMNS["shots"]].sum()
+        )
+        score = boxscore.get_score_dict()
+        assert score["goals"][0] == batch.goals[g, 0]
+        assert score["goals"][1] == batch.goals[g, 1]
+        if batch.period[g] > batch.num_periods:
+            assert not boxscore.is_tied()
+
+
+def test_batch_game_requires_equal_rosters(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+    teams[0].players.pop()
+    with pytest.raises(ValueError):
+        BatchGameManager([teams], {p.id: p for p in players})
+
+
+def test_run_batch(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+    results = run_batch([teams], {p.id: p for p in players}, seed=0)
+    assert len(results) == 1
+    boxscore, period = results[0]
+    assert boxscore.teams == [teams[0].name, teams[1].name]
+    assert period >= 3
+
+
+def test_batch_game_matches_scalar_game(create_teams, fill_teams_with_pawns):
+    random.seed(0)
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+
+    scalar = []
+    for _ in range(100):
+        game = GameManager(teams[0], teams[1], pawns=players)
+        game.run()
+        scalar.append(game_summary(game.boxscore.counts, game.state.period))
+    scalar = np.array(scalar)
+
+    batch = BatchGameManager([teams] * 1000, {p.id: p for p in players}, seed=0)
+    batch.run()
+    batched = np.array(
+        [game_summary(batch.counts[g], batch.period[g]) for g in range(1000)]
+    )
+
+    # every per team stat mean must agree within 4 standard errors
+    error = np.sqrt(scalar.var(0) / len(scalar) + batched.var(0) / len(batched))
+    difference = np.abs(scalar.mean(0) - batched.mean(0))
+    assert (difference <= 4 * error + 1e-9).all()
+
+
+def test_league_batch_engine(create_teams, fill_teams_with_pawns):
+    teams = create_teams(4)
+    players = fill_teams_with_pawns(teams)
+    league = League(teams=teams, players=players, engine="batch")
+    league.run_season()
+    assert league.year == 1
+    assert league.player_stats["games"].sum() == 6 * 2 * len(teams[0].players)
+    assert league.team_stats["wins"].sum() == 6
+
+    with pytest.raises(ValueError):
+        League(teams=teams, players=players, engine="unknown")
+
+
+def test_batch_game_config(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+    players_by_id = {p.id: p for p in players}
+    config = GameConfig(timer=60, game_tick=2, num_periods=2)
+    batch = BatchGameManager([teams], players_by_id, seed=0, config=config)
+    assert (batch.timer, batch.game_tick, batch.num_periods) == (60, 2, 2)
+    assert (batch.time == 60).all()
+    batch.run()
+    assert (batch.period >= 2).all()
+
+    with pytest.raises(ValueError):
+        BatchGameManager([teams], players_by_id, config=GameConfig(event_driven=True))
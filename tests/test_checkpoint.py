@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from hoki.checkpoint import SeasonCheckpoint
+from hoki.league import League
+
+
+class Interrupted(Exception):
+    pass
+
+
+def test_checkpoint_save_load(tmp_path):
+    path = tmp_path / "season.npz"
+    checkpoint = SeasonCheckpoint(
+        year=2,
+        n_games=10,
+        first_seed=2**64 - 1,
+        days=3,
+        games=6,
+        player_counts=np.arange(22).reshape(2, 11),
+        team_counts=np.arange(6).reshape(2, 3),
+        duration_counts=np.ones(142, dtype=np.int64),
+    )
+    checkpoint.save(path)
+    loaded = SeasonCheckpoint.load(path)
+    assert (loaded.year, loaded.n_games, loaded.first_seed, loaded.days, loaded.games) == (2, 10, 2**64 - 1, 3, 6)
+    assert (loaded.player_counts == checkpoint.player_counts).all()
+    assert (loaded.team_counts == checkpoint.team_counts).all()
+    assert (loaded.duration_counts == checkpoint.duration_counts).all()
+    assert loaded.matches(2, 10, 2**64 - 1)
+    assert not loaded.matches(3, 10, 2**64 - 1)
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_league_resumes_from_checkpoint(create_teams, fill_teams_with_pawns, tmp_path):
+    path = tmp_path / "season.npz"
+    teams = create_teams(6)
+    players = fill_teams_with_pawns(teams)
+    expected = League(teams=teams, players=players, seed=8)
+    expected.run_season()
+
+    def interrupt(done, total):
+        if done == 9:
+            raise Interrupted()
+
+    league = League(teams=teams, players=players, seed=8)
+    with pytest.raises(Interrupted):
+        league.run_season(chunksize=1, progress=interrupt, checkpoint=path, checkpoint_interval=0)
+    saved = SeasonCheckpoint.load(path)
+    # every game day of three games completed before the interruption is kept
+    assert (saved.days, saved.games) == (2, 6)
+
+    calls = []
+    league = League(teams=teams, players=players, seed=8)
+    league.run_season(progress=lambda *a: calls.append(a), checkpoint=path)
+    assert calls[0][0] > 6
+    assert calls[-1] == (15, 15)
+    assert league.player_stats.equals(expected.player_stats)
+    assert league.team_stats.equals(expected.team_stats)
+    assert not path.exists()
+
+    other = League(teams=teams, players=players, seed=9)
+    saved.save(path)
+    with pytest.raises(ValueError):
+        other.run_season(checkpoint=path)
+
+
+def test_league_resumes_from_interrupted_window(create_teams, fill_teams_with_pawns, tmp_path):
+    path = tmp_path / "season.npz"
+    teams = create_teams(20)
+    players = fill_teams_with_pawns(teams)
+    expected = League(teams=teams, players=players, seed=8)
+    expected.run_season()
+
+    def interrupt(done, total):
+        if done == 25:
+            raise Interrupted()
+
+    # a window of one game is full whenever the season is interrupted, with most of the schedule still to send
+    league = League(teams=teams, players=players, seed=8)
+    with pytest.raises(Interrupted):
+        league.run_season(
+            chunksize=1, max_in_flight=1, progress=interrupt, checkpoint=path, checkpoint_interval=0
+        )
+    saved = SeasonCheckpoint.load(path)
+    # game days of ten games
+    assert (saved.days, saved.games) == (2, 20)
+
+    league = League(teams=teams, players=players, seed=8)
+    league.run_season(checkpoint=path)
+    assert league.player_stats.equals(expected.player_stats)
+    assert league.team_stats.equals(expected.team_stats)
+    assert not path.exists()
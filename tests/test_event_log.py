@@ -0,0 +1,40 @@
+import pickle
+
+from hoki.event_log import EventLog, event_type
+
+
+def test_event_log_records():
+    log = EventLog(names=["a", "b", "c"])
+    log.record(30, 1, event_type.FACEOFF, 0, 1, 4)
+    log.record(29, 1, event_type.SHOT, 2)
+    log.record(29, 1, event_type.GOAL, 2, 0, 10)
+    log.note(12, 3, "test")
+    events = log.events()
+    assert len(log) == len(events) == 4
+    assert list(events["type"]) == [
+        event_type.FACEOFF,
+        event_type.SHOT,
+        event_type.GOAL,
+        event_type.NOTE,
+    ]
+    assert list(events[0]) == [30, 1, event_type.FACEOFF, 0, 1, 4]
+    assert log.lines() == [
+        "1:30: a wins the faceoff against b",
+        "1:29: c shoots",
+        "1:29: c scores, assisted by a",
+        "3:12: test",
+    ]
+    assert pickle.loads(pickle.dumps(log)).lines() == log.lines()
+
+
+def test_event_log_is_bounded():
+    log = EventLog(capacity=1000)
+    sizes = set()
+    for tick in range(2500):
+        log.record(tick, 1, event_type.PASS, 0, 1)
+        sizes.add(log.nbytes)
+    assert len(log) == 1000
+    assert log.dropped == 1500
+    assert list(log.events()["tick"]) == list(range(1500, 2500))
+    assert log.nbytes == max(sizes) == 1000 * 13
+    assert log.lines()[0] == "1:1500: player 0 passes to player 1"
@@ -0,0 +1,50 @@
+import pytest
+
+from hoki.executor import SimulationExecutor
+from hoki.league import League
+
+
+def test_executor_is_shared(create_teams, fill_teams_with_pawns):
+    teams = create_teams(4)
+    players = fill_teams_with_pawns(teams)
+    other_teams = create_teams(3)
+    other_players = fill_teams_with_pawns(other_teams)
+    expected = League(teams=teams, players=players, seed=2)
+    expected.run_season()
+    expected.add_season_schedule()
+    expected.run_season()
+
+    with SimulationExecutor(processes=2) as executor:
+        pool = executor.pool
+        league = League(teams=teams, players=players, seed=2, executor=executor)
+        other = League(teams=other_teams, players=other_players, seed=3, executor=executor)
+        league.run_season()
+        other.run_season()
+        league.add_season_schedule()
+        league.run_season()
+        assert executor.pool is pool
+    assert executor.pool is None
+
+    assert league.player_stats.equals(expected.player_stats)
+    assert league.team_stats.equals(expected.team_stats)
+    assert other.stats.games == 3
+
+
+def test_executor_starts_on_demand():
+    executor = SimulationExecutor(processes=1)
+    assert executor.pool is None
+    assert executor.map(abs, [-1, 2]) == [1, 2]
+    executor.shutdown()
+    assert executor.pool is None
+
+
+def test_executor_stops_on_error():
+    with pytest.raises(ValueError):
+        with SimulationExecutor(processes=1) as executor:
+            executor.imap_unordered(abs, [-1, 2])
+            raise ValueError
+    assert executor.pool is None
+    executor.shutdown(wait=False)
+    assert executor.map(abs, [-3]) == [3]
+    executor.shutdown(wait=False)
+    assert executor.pool is None
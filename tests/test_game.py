@@ -1,6 +1,15 @@
 import pytest
 
-from hoki.game import STATS_NAMES, BoxScore, GameManager, PossessionStack
+from hoki.game import (
+    STATS_NAMES,
+    BoxScore,
+    GameManager,
+    PossessionStack,
+    ScoreBoard,
+)
+from hoki.event_log import event_type
+from hoki.game_config import GameConfig
+from hoki.game_random import GameRandom
 
 
 @pytest.mark.parametrize(
@@ -33,8 +42,28 @@ def test_run_game(create_teams, fill_teams_with_pawns):
     game.run()
     assert game.completed
 
+    events = game.state.events.events()
+    assert len(events) > 0
+    assert (events["type"] == event_type.FACEOFF).sum() == game.boxscore.counts[:, 3].sum() // 2
+    assert (events["type"] == event_type.SHOT).sum() == game.boxscore.counts[:, 2].sum()
+    assert (events["type"] == event_type.GOAL).sum() == game.boxscore.counts[:, 0].sum()
+
     game.log_event("test")
-    assert game.state.game_log == ["3:0: test"]
+    assert game.state.game_log[-1] == "3:0: test"
+
+
+def test_run_game_is_seeded(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+    games = [
+        GameManager(teams[0], teams[1], pawns=players, rng=GameRandom(seed))
+        for seed in [1, 1, 2]
+    ]
+    for game in games:
+        game.run()
+    assert (games[0].boxscore.counts == games[1].boxscore.counts).all()
+    assert games[0].state.period == games[1].state.period
+    assert games[0].rng is games[0].player_manager.rng
 
 
 def test_run_game_overtime(create_teams, fill_teams_with_pawns):
@@ -121,3 +150,153 @@ def test_boxscore(create_teams, fill_teams_with_pawns):
         assert stats["faceoffs-won"][i] == 0
 
     assert str(boxscore) == str(score_df)
+
+
+def test_boxscore_counts(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+    boxscore = BoxScore(teams[0], teams[1], players_by_id={p.id: p for p in players})
+
+    assert boxscore.counts.shape == (len(players), len(STATS_NAMES))
+    boxscore.add_shot(players[7].id, goal=True)
+    assert boxscore.counts[7].tolist() == [1, 0, 1, 0, 0]
+    assert boxscore.counts.sum() == 2
+
+    stats_df = boxscore.stats
+    assert list(stats_df.columns) == ["team", "player-id", "player"] + STATS_NAMES
+    assert stats_df["team"].loc[7] == teams[1].name
+    assert stats_df["goals"].loc[7] == 1
+
+
+def test_scoreboard():
+    scoreboard = ScoreBoard(["home", "away"])
+    events = []
+    scoreboard.subscribe(lambda team, board: events.append((team, board.margin())))
+
+    assert scoreboard.is_tied()
+    assert scoreboard.leader() is None
+    assert scoreboard.margin() == 0
+
+    scoreboard.increment(1, "shots")
+    scoreboard.increment(1, "goals")
+    assert not scoreboard.is_tied()
+    assert scoreboard.leader() == "away"
+    assert scoreboard.margin() == 1
+    assert scoreboard.shots(1) == 1
+    assert scoreboard.goals(0) == 0
+    assert events == [("away", 1)]
+
+    scoreboard.increment(0, "shots")
+    assert events == [("away", 1)]
+    scoreboard.increment(0, "goals")
+    assert scoreboard.is_tied()
+    assert events == [("away", 1), ("home", 0)]
+
+
+def test_boxscore_scoreboard(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+    boxscore = BoxScore(teams[0], teams[1], players_by_id={p.id: p for p in players})
+    scorers = []
+    boxscore.scoreboard.subscribe(lambda team, board: scorers.append(team))
+
+    boxscore.add_shot(players[6].id, goal=True)
+    boxscore.add_shot(players[0].id)
+    assert boxscore.scoreboard.leader() == teams[1].name
+    assert scorers == [teams[1].name]
+    assert boxscore.get_score_dict()["shots"] == {0: 1, 1: 1}
+
+
+def test_game_state_uses_slots(create_game):
+    game, teams, players = create_game()
+    state = game.state
+    assert list(game.player_ids) == teams[0].players + teams[1].players
+    assert list(game.team_ids) == [teams[0].name, teams[1].name]
+    assert state.players_by_team == [list(range(6)), list(range(6, 12))]
+    assert state.team_by_player == [0] * 6 + [1] * 6
+    for slot, zone in enumerate(state.zone_by_player):
+        assert slot in state.player_by_zone[zone]
+        assert game.players[slot].id == game.player_ids.external(slot)
+
+    game.run()
+    for slot, zone in enumerate(state.zone_by_player):
+        team_mask = state.occupancy.teams[state.team_by_player[slot]]
+        assert team_mask & state.occupancy.bit(slot, zone)
+    assert sum(mask.bit_count() for mask in state.occupancy.teams) == 12
+    stats = game.boxscore.get_stats()
+    assert list(stats["player-id"]) == teams[0].players + teams[1].players
+
+
+def test_run_game_event_driven(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+
+    def clock(game):
+        visited = []
+        while not game.completed:
+            visited.append((game.state.period, game.state.time))
+            game.completed = game.increment_state()
+        return visited
+
+    tick_game = GameManager(teams[0], teams[1], pawns=players, rng=GameRandom(1))
+    tick_clock = clock(tick_game)
+    config = GameConfig(decision_ticks=10, event_driven=True)
+    game = GameManager(teams[0], teams[1], pawns=players, rng=GameRandom(1), config=config)
+    event_clock = clock(game)
+    assert game.completed
+    assert len(event_clock) < len(tick_clock)
+    assert event_clock == sorted(event_clock, key=lambda t: (t[0], -t[1]))
+    assert all(time in range(0, game.timer + 1, game.game_tick) for _, time in event_clock)
+    for period in range(1, game.num_periods + 1):
+        assert (period, game.timer) in event_clock
+        assert (period, 0) in event_clock
+    events = game.state.events.events()
+    assert (events["type"] == event_type.SHOT).sum() == game.boxscore.counts[:, 2].sum()
+
+
+def test_tick_mode_decision_ticks(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+
+    def shots(config):
+        total = 0
+        for seed in range(20):
+            game = GameManager(teams[0], teams[1], pawns=players, rng=GameRandom(seed), config=config)
+            game.run()
+            total += game.boxscore.counts[:, 2].sum()
+        return total
+
+    # both modes play the same game at the same decision_ticks, a larger decision_ticks plays fewer decisions
+    tick_shots = shots(GameConfig(decision_ticks=10))
+    event_shots = shots(GameConfig(decision_ticks=10, event_driven=True))
+    assert abs(tick_shots - event_shots) < 0.25 * event_shots
+    assert tick_shots < 0.25 * shots(GameConfig())
+
+
+def test_action_choices_do_not_draw(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+    game = GameManager(teams[0], teams[1], pawns=players, rng=GameRandom(1))
+    while game.state.puck_player is None:
+        game.increment_state()
+    position = game.rng.position
+    for player_id in range(len(game.players)):
+        game.player_manager.player_action_choices(player_id, game.state)
+    # a pass receiver is only drawn once a pass is chosen
+    assert game.rng.position == position
+
+
+@pytest.mark.parametrize("plan_skating", [False, True])
+def test_run_game_without_goalie(create_teams, fill_teams_with_pawns, plan_skating):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+    # the goalie is the first player of a team, the away team plays with an empty net
+    teams[1].players = teams[1].players[1:]
+    game = GameManager(
+        teams[0], teams[1], pawns=players, rng=GameRandom(1), plan_skating=plan_skating
+    )
+    goalie_id, goal_zone = game.player_manager.get_opposing_goal(0, game.state)
+    assert goalie_id is None
+    assert goal_zone == game.ice_map.get_initial_zone(players[0].position, False)
+    game.run()
+    assert game.completed
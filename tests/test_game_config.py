@@ -0,0 +1,43 @@
+import pytest
+
+from hoki.game import GameManager
+from hoki.game_config import DECISIONS_PER_PERIOD, GameConfig
+from hoki.game_random import GameRandom
+
+
+def test_game_config():
+    config = GameConfig()
+    assert (config.timer, config.game_tick, config.num_periods) == (30, 1, 3)
+    assert config.period_ticks == 30
+    assert not config.event_driven
+    assert GameConfig(timer=1200, game_tick=5).period_ticks == 240
+
+    with pytest.raises(ValueError):
+        GameConfig(timer=0)
+    with pytest.raises(ValueError):
+        GameConfig(timer=30, game_tick=7)
+
+
+def test_game_config_paced():
+    config = GameConfig.paced(1200)
+    assert config.event_driven
+    assert config.timer == 1200
+    assert config.decision_ticks * DECISIONS_PER_PERIOD == config.period_ticks
+    assert GameConfig.paced(30).decision_ticks == 1
+    assert GameConfig.paced(10).decision_ticks == 1
+
+
+def test_game_config_sets_the_clock(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+    config = GameConfig.paced(1200, game_tick=2, num_periods=2)
+    game = GameManager(teams[0], teams[1], pawns=players, rng=GameRandom(1), config=config)
+    assert game.state.time == 1200
+    ticks = 0
+    while not game.completed:
+        assert game.state.time % 2 == 0
+        game.completed = game.increment_state()
+        ticks += 1
+    assert game.state.period >= 2
+    # the paced game runs about as many ticks as a default one, not the 600 in each period
+    assert ticks < 4 * DECISIONS_PER_PERIOD * game.state.period
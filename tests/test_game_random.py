@@ -0,0 +1,49 @@
+import pickle
+import random
+
+from hoki.game_random import GameRandom
+
+
+def test_game_random_is_seeded():
+    a = GameRandom(7, block_size=16)
+    b = GameRandom(7, block_size=64)
+    assert [a.random() for _ in range(100)] == [b.random() for _ in range(100)]
+    assert [GameRandom(8).random() for _ in range(3)] != [
+        GameRandom(7).random() for _ in range(3)
+    ]
+
+
+def test_game_random_ranges():
+    rng = GameRandom(0, block_size=10)
+    ints = [rng.randint(2, 4) for _ in range(1000)]
+    assert set(ints) == {2, 3, 4}
+    floats = [rng.uniform(1, 3) for _ in range(1000)]
+    assert all(1 <= f < 3 for f in floats)
+    choices = [rng.choice("abc") for _ in range(1000)]
+    assert set(choices) == {"a", "b", "c"}
+
+
+def test_game_random_from_global():
+    random.seed(3)
+    a = GameRandom.from_global()
+    random.seed(3)
+    b = GameRandom.from_global()
+    assert a.seed == b.seed
+    assert a.random() == b.random()
+
+
+def test_game_random_pickles():
+    rng = GameRandom(11, block_size=4)
+    rng.random()
+    copy = pickle.loads(pickle.dumps(rng))
+    assert [rng.random() for _ in range(10)] == [copy.random() for _ in range(10)]
+
+
+def test_game_random_at():
+    rng = GameRandom(3, block_size=16)
+    draws = [rng.random() for _ in range(50)]
+    assert rng.position == 50
+    for position in [0, 5, 16, 17, 40]:
+        restarted = GameRandom.at(3, position, block_size=16)
+        assert restarted.position == position
+        assert [restarted.random() for _ in range(10)] == draws[position:position + 10]
@@ -0,0 +1,20 @@
+import pytest
+
+from hoki.id_map import IdMap
+
+
+def test_id_map():
+    ids = IdMap(["p3", "p1", "p3"])
+    assert len(ids) == 2
+    assert list(ids) == ["p3", "p1"]
+    assert ids.index("p1") == 1
+    assert ids.external(0) == "p3"
+    assert "p1" in ids
+    assert "p2" not in ids
+
+    assert ids.intern("p2") == 2
+    assert ids.intern("p3") == 0
+    assert len(ids) == 3
+
+    with pytest.raises(KeyError):
+        ids.index("p4")
@@ -1,4 +1,28 @@
-from hoki.league import League, Season
+import os
+import pickle
+import random
+import threading
+
+import numpy as np
+import pytest
+
+from hoki.game import STATS_NAMES
+from hoki.game_result import GameResult, GameSpec
+from hoki.game import GameManager
+from hoki.game_config import GameConfig
+from hoki.executor import SimulationExecutor
+from hoki.game_random import GameRandom
+from hoki.league import (
+    League,
+    Season,
+    guided_chunks,
+    _roster,
+    attach_roster,
+    init_worker,
+    run_batch_specs,
+    run_game_spec,
+)
+from hoki.roster_table import RosterTable
 
 
 def test_league_run_season(create_game):
@@ -15,8 +39,351 @@ def test_league_run_season(create_game):
     assert league.year == 1
 
 
+def test_league_game_config(create_teams, fill_teams_with_pawns):
+    teams = create_teams(4)
+    players = fill_teams_with_pawns(teams)
+    config = GameConfig.paced(1200)
+    league = League(teams=teams, players=players, seed=5, config=config)
+    assert league.get_game(0).timer == 1200
+    league.run_season()
+    assert league.year == 1
+    assert league.player_stats["shots"].sum() > 0
+
+    with pytest.raises(ValueError):
+        League(teams=teams, players=players, engine="batch", config=config)
+
+
+def test_league_plans_skating(create_teams, fill_teams_with_pawns):
+    teams = create_teams(3)
+    players = fill_teams_with_pawns(teams)
+    config = GameConfig(plan_skating=True)
+    league = League(teams=teams, players=players, seed=5, config=config)
+    assert league.get_game(0).skating_planner is not None
+    assert League(teams=teams, players=players).get_game(0).skating_planner is None
+    league.run_season()
+    assert league.stats.games == 3
+
+    with pytest.raises(ValueError):
+        League(teams=teams, players=players, engine="batch", config=config)
+
+
+@pytest.mark.parametrize("num_periods", [2, 5])
+def test_league_books_overtime_losses_by_num_periods(create_teams, fill_teams_with_pawns, num_periods):
+    # short periods score less, so more of the games are tied at the end of regulation
+    random.seed(2)
+    teams = create_teams(10)
+    players = fill_teams_with_pawns(teams)
+    config = GameConfig(timer=4, num_periods=num_periods)
+    league = League(teams=teams, players=players, seed=3, config=config)
+    n_games = len(league.seasons[0].schedule)
+    overtime = 0
+    for game_index in range(n_games):
+        game = league.get_game(game_index)
+        game.run()
+        overtime += game.state.period > num_periods
+    league.run_season()
+    totals = league.team_stats.sum()
+    assert 0 < overtime < n_games
+    assert totals["wins"] == n_games
+    assert totals["overtime-losses"] == overtime
+    assert totals["losses"] == n_games - overtime
+
+    batch = League(teams=teams, players=players, engine="batch", seed=3, config=config)
+    batch.run_season()
+    totals = batch.team_stats.sum()
+    assert totals["wins"] == totals["losses"] + totals["overtime-losses"] == n_games
+    assert totals["losses"] > 0
+
+
+def test_league_rejects_duplicate_team_names(create_teams, fill_teams_with_pawns):
+    teams = create_teams(3)
+    players = fill_teams_with_pawns(teams)
+    teams[2].name = teams[0].name
+    with pytest.raises(ValueError):
+        League(teams=teams, players=players)
+
+
+def test_unseeded_league_follows_the_random_module(create_teams, fill_teams_with_pawns):
+    teams = create_teams(4)
+    players = fill_teams_with_pawns(teams)
+    leagues = []
+    for _ in range(2):
+        random.seed(11)
+        leagues.append(League(teams=teams, players=players))
+    assert leagues[0].seed == leagues[1].seed
+    for league in leagues:
+        league.run_season()
+    assert leagues[0].player_stats.equals(leagues[1].player_stats)
+
+
 def test_seasion(create_teams):
     for n_teams in range(100):
         teams = create_teams(n_teams)
         seasion = Season(teams)
         assert len(seasion.schedule) == (n_teams * (n_teams - 1)) / 2
+
+
+def test_league_is_seeded(create_teams, fill_teams_with_pawns):
+    teams = create_teams(4)
+    players = fill_teams_with_pawns(teams)
+    leagues = [League(teams=teams, players=players, seed=5) for _ in range(2)]
+    for league in leagues:
+        league.run_season()
+    schedules = [
+        [(home.name, away.name) for home, away in league.seasons[0].schedule]
+        for league in leagues
+    ]
+    assert schedules[0] == schedules[1]
+    assert leagues[0].player_stats.equals(leagues[1].player_stats)
+    assert leagues[0].team_stats.equals(leagues[1].team_stats)
+
+
+def test_run_game_spec(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+    with RosterTable.create(teams, players) as table:
+        init_worker(table.path, table.layout)
+    spec = GameSpec(0, 1, seed=3)
+    result = run_game_spec(spec)
+    assert (result.home, result.away) == (0, 1)
+    assert result.counts.shape == (12, len(STATS_NAMES))
+    assert result.counts.dtype == np.int32
+    assert result.goals[0] == result.counts[:6, STATS_NAMES.index("goals")].sum()
+    assert result.goals[1] == result.counts[6:, STATS_NAMES.index("goals")].sum()
+    assert result.goals[0] != result.goals[1]
+    assert (run_game_spec(spec).counts == result.counts).all()
+
+    # the players rebuilt from the table play the same game as the originals
+    game = GameManager(teams[0], teams[1], players, rng=GameRandom(3))
+    game.run()
+    assert (game.boxscore.counts == result.counts).all()
+
+    batch = run_batch_specs([spec, spec], seed=4)
+    assert len(batch) == 2
+    assert all(r.counts.shape == (12, len(STATS_NAMES)) for r in batch)
+
+
+def test_worker_reattaches_to_a_reused_path(create_teams, fill_teams_with_pawns, tmp_path):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+    other_teams = create_teams(3)
+    other_players = fill_teams_with_pawns(other_teams)
+    first = RosterTable.create(teams, players, directory=str(tmp_path))
+    path = first.path
+    attach_roster(path, first.layout)
+    first.unlink()
+
+    # a later season's table created at the path the first one was removed from
+    second = RosterTable.create(other_teams, other_players, directory=str(tmp_path))
+    os.replace(second.path, path)
+    assert RosterTable.read_nonce(path, second.layout) != int(first.nonce[0])
+    attach_roster(path, second.layout)
+    assert len(_roster["table"].team_offsets) == 4
+    assert _roster["stats"].team_counts.shape[0] == 3
+    os.remove(path)
+
+
+def test_results_are_compact(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+    with RosterTable.create(teams, players) as table:
+        init_worker(table.path, table.layout)
+    spec = GameSpec(0, 1, seed=3)
+    assert len(pickle.dumps(spec)) < 100
+    assert len(pickle.dumps(run_game_spec(spec))) < 1000
+
+
+def test_league_team_stats_follow_the_score(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+    league = League(teams=teams, players=players)
+    counts = np.zeros((12, len(STATS_NAMES)), dtype=np.int32)
+    counts[7, STATS_NAMES.index("goals")] = 2
+    league._apply_game_result(
+        GameResult(0, 1, counts, goals=(1, 2), period=4)
+    )
+    assert league.team_stats.loc[teams[1].name, "wins"] == 1
+    assert league.team_stats.loc[teams[0].name, "overtime-losses"] == 1
+    assert league.team_stats.loc[teams[0].name, "wins"] == 0
+    player = league.player_stats.loc[players[7].id]
+    assert player["goals"].iloc[0] == 2
+    assert player["games"].iloc[0] == 1
+
+
+def test_league_credits_the_winner(create_teams, fill_teams_with_pawns):
+    teams = create_teams(6)
+    players = fill_teams_with_pawns(teams)
+    league = League(teams=teams, players=players, seed=4)
+    wins = {team.name: 0 for team in teams}
+    away_wins = 0
+    for game_index in range(len(league.seasons[0].schedule)):
+        game = league.get_game(game_index)
+        game.run()
+        winner = game.boxscore.scoreboard.goals(1) > game.boxscore.scoreboard.goals(0)
+        away_wins += winner
+        wins[game.boxscore.teams[winner]] += 1
+    league.run_season()
+    # the standings follow the score, whichever side of the ice the winner played on
+    assert away_wins > 0
+    assert league.team_stats["wins"].to_dict() == wins
+
+
+def test_league_streams_results(create_teams, fill_teams_with_pawns):
+    teams = create_teams(5)
+    players = fill_teams_with_pawns(teams)
+    leagues = [League(teams=teams, players=players, seed=6) for _ in range(2)]
+    calls = []
+    leagues[0].run_season(chunksize=1, max_in_flight=1, progress=lambda *a: calls.append(a))
+    leagues[1].run_season(chunksize=3)
+    assert calls == [(done, 10) for done in range(1, 11)]
+    assert leagues[0].stats.games == leagues[1].stats.games == 10
+    # the results are folded in as they arrive, so the order the games finish in does not matter
+    assert leagues[0].player_stats.equals(leagues[1].player_stats)
+    assert leagues[0].team_stats.equals(leagues[1].team_stats)
+
+    batch = League(teams=teams, players=players, engine="batch", seed=6)
+    batch.run_season(chunksize=4)
+    assert batch.team_stats["wins"].sum() == 10
+    assert batch.player_stats["games"].sum() == 10 * 12
+
+
+def run_interrupted_season(league, **kwargs):
+    """Run a season that is interrupted after 3 games, in a thread so a hang fails the test rather than stalls it."""
+
+    def progress(done, total):
+        if done >= 3:
+            raise KeyboardInterrupt
+
+    errors = []
+
+    def run():
+        try:
+            league.run_season(progress=progress, **kwargs)
+        except KeyboardInterrupt as error:
+            errors.append(error)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(60)
+    assert not thread.is_alive()
+    assert len(errors) == 1
+
+
+def test_league_interrupted_season_stops(create_teams, fill_teams_with_pawns):
+    teams = create_teams(20)
+    players = fill_teams_with_pawns(teams)
+    league = League(teams=teams, players=players, seed=6)
+    # the window is full once a game is sent, so the task feeder is blocked when the season is interrupted
+    run_interrupted_season(league, chunksize=1, max_in_flight=1)
+    assert league.year == 0
+    assert league.stats.games == 0
+
+    # a shared executor is left running and can run the season again
+    with SimulationExecutor(processes=2) as executor:
+        league = League(teams=teams, players=players, seed=6, executor=executor)
+        run_interrupted_season(league, chunksize=1, max_in_flight=1)
+        assert executor.pool is not None
+        league.run_season(chunksize=8)
+        assert league.stats.games == len(league.seasons[0].schedule)
+
+
+def test_league_stats_accumulate(create_teams, fill_teams_with_pawns):
+    teams = create_teams(3)
+    players = fill_teams_with_pawns(teams)
+    league = League(teams=teams, players=players)
+    rng = np.random.default_rng(7)
+    expected = {player.id: np.zeros(len(STATS_NAMES), dtype=np.int64) for player in players}
+    for home, away in [(0, 1), (1, 2), (2, 0), (0, 1)]:
+        counts = rng.integers(0, 5, size=(12, len(STATS_NAMES)), dtype=np.int32)
+        league._apply_game_result(GameResult(home, away, counts, goals=(3, 1), period=3))
+        for row, player_id in enumerate(teams[home].players + teams[away].players):
+            expected[player_id] += counts[row]
+
+    player_stats = league.player_stats
+    assert list(player_stats.columns) == ["games"] + STATS_NAMES
+    assert player_stats.index.names == ["player-id", "player"]
+    for player in players:
+        row = player_stats.loc[player.id]
+        assert (row[STATS_NAMES].to_numpy()[0] == expected[player.id]).all()
+    assert player_stats.loc[players[0].id]["games"].iloc[0] == 3
+
+    team_stats = league.team_stats
+    assert list(team_stats.loc[teams[0].name]) == [2, 1, 0]
+    assert list(team_stats.loc[teams[1].name]) == [1, 2, 0]
+    assert list(team_stats.loc[teams[2].name]) == [1, 1, 0]
+
+
+def test_guided_chunks():
+    chunks = guided_chunks(1000, 2, 32, processes=4)
+    assert chunks[0] == (0, 32)
+    assert chunks[-1][1] == 1000
+    assert all(end == start for (_, end), (start, _) in zip(chunks, chunks[1:]))
+    sizes = [end - start for start, end in chunks]
+    assert sizes == sorted(sizes, reverse=True)
+    assert min(sizes[:-1]) == 2
+    assert guided_chunks(0, 1, 32, processes=4) == []
+    assert guided_chunks(5, 8, 64, processes=4) == [(0, 5)]
+
+
+def test_league_reports_game_durations(create_teams, fill_teams_with_pawns):
+    teams = create_teams(4)
+    players = fill_teams_with_pawns(teams)
+    league = League(teams=teams, players=players, seed=1)
+    league.run_season()
+    assert league.season_durations[0].sum() == 6
+    durations = league.game_duration_percentiles()
+    assert list(durations) == ["p50", "p99"]
+    assert 0 < durations["p50"] <= durations["p99"] < float("inf")
+
+
+def test_league_roster_index(create_teams, fill_teams_with_pawns):
+    teams = create_teams(3)
+    players = fill_teams_with_pawns(teams)
+    random.Random(2).shuffle(players)
+    league = League(teams=teams, players=players)
+    for team in teams:
+        expected = [p for p in players if p.id in team.players]
+        assert league.players_by_team[team.name] == expected
+    for t, team in enumerate(teams):
+        rows = league.stats.team_rows[t]
+        assert [players[row].id for row in rows] == team.players
+    assert league.players_by_id[players[4].id] is players[4]
+
+
+def test_league_runs_game_days(create_teams, fill_teams_with_pawns):
+    teams = create_teams(5)
+    players = fill_teams_with_pawns(teams)
+    league = League(teams=teams, players=players, seed=4, meetings=2)
+    days = list(league.game_day_specs())
+    assert len(days) == 10
+    assert all(len(day) == 2 for day in days)
+    for day in days:
+        teams_playing = [t for spec in day for t in [spec.home, spec.away]]
+        assert len(teams_playing) == len(set(teams_playing))
+
+    league = League(teams=teams, players=players, seed=4, meetings=2)
+    calls = []
+    league.run_season(progress=lambda *a: calls.append(a))
+    assert calls[-1] == (20, 20)
+    assert league.stats.games == 20
+    assert (league.team_stats.sum(axis=1) == 8).all()
+
+
+def test_league_games_are_seeded_by_index(create_teams, fill_teams_with_pawns):
+    teams = create_teams(5)
+    players = fill_teams_with_pawns(teams)
+    league = League(teams=teams, players=players, seed=11)
+    league.add_season_schedule()
+    specs = league.get_game_specs()
+    assert [league.get_game_spec(game) for game in range(len(specs))] == specs
+    assert len({spec.seed for spec in specs}) == len(specs)
+    assert league.get_game_day_specs(0, season=1) != league.get_game_day_specs(0)
+    assert League(teams=teams, players=players, seed=12).get_game_specs() != specs
+
+    # a game rerun on its own plays out as it does in the season
+    with RosterTable.create(teams, players) as table:
+        init_worker(table.path, table.layout)
+        result = run_game_spec(specs[3])
+    game = league.get_game(3)
+    game.run()
+    assert (result.counts == GameResult.from_boxscore(game.boxscore, game.state.period, 0, 0).counts).all()
@@ -0,0 +1,85 @@
+import random
+
+import numpy as np
+
+from hoki.game import STATS_NAMES
+from hoki.game_result import GameResult
+from hoki.league_stats import LeagueStats, PartialStats, duration_percentiles, reduce_partials
+
+
+def create_results(n_teams, n_games, seed=0):
+    rng = np.random.default_rng(seed)
+    results = []
+    for _ in range(n_games):
+        home, away = rng.choice(n_teams, size=2, replace=False)
+        counts = rng.integers(0, 4, size=(12, len(STATS_NAMES)), dtype=np.int32)
+        goals = (1, 2) if rng.random() < 0.5 else (3, 0)
+        results.append(GameResult(int(home), int(away), counts, goals, int(rng.integers(3, 5))))
+    return results
+
+
+def create_stats(n_teams):
+    team_rows = [np.arange(6 * t, 6 * t + 6) for t in range(n_teams)]
+    return LeagueStats(team_rows, 6 * n_teams)
+
+
+def test_partials_match_the_dense_stats():
+    results = create_results(8, 50)
+    expected = create_stats(8)
+    for result in results:
+        expected.add_result(result)
+
+    worker = create_stats(8)
+    partials = []
+    for start in range(0, len(results), 7):
+        for result in results[start:start + 7]:
+            worker.add_result(result)
+        partials.append(worker.take_partial())
+        assert not worker.player_counts.any()
+        assert worker.games == 0
+    assert all(len(p.player_rows) <= 7 * 12 for p in partials)
+
+    random.Random(1).shuffle(partials)
+    stats = create_stats(8)
+    stats.add_partial(reduce_partials(partials))
+    assert stats.games == 50
+    assert (stats.player_counts == expected.player_counts).all()
+    assert (stats.team_counts == expected.team_counts).all()
+
+
+def test_away_win_is_credited_to_the_away_team():
+    counts = np.zeros((12, len(STATS_NAMES)), dtype=np.int32)
+    result = GameResult(2, 5, counts, goals=(1, 3), period=3)
+    assert result.winner == 1
+    stats = create_stats(8)
+    stats.add_result(result)
+    assert stats.team_counts[5].tolist() == [1, 0, 0]
+    assert stats.team_counts[2].tolist() == [0, 1, 0]
+    assert stats.team_counts.sum() == 2
+
+
+def test_reduce_no_partials():
+    merged = reduce_partials([])
+    assert merged.games == 0
+    stats = create_stats(2)
+    stats.add_partial(merged)
+    assert not stats.player_counts.any()
+    assert reduce_partials([PartialStats.empty()]).games == 0
+
+
+def test_duration_percentiles():
+    stats = create_stats(2)
+    result = create_results(2, 1)[0]
+    for duration in [0.01] * 98 + [1.0, 30.0]:
+        stats.add_result(result, duration)
+    stats.add_result(result)
+    assert stats.duration_counts.sum() == 100
+    p50, p99, p100 = duration_percentiles(stats.duration_counts, [50, 99, 100])
+    assert 0.01 <= p50 < 0.0115
+    assert 1.0 <= p99 < 1.15
+    assert 30.0 <= p100 < 34.5
+
+    partial = stats.take_partial()
+    assert partial.duration_counts.sum() == 100
+    assert not stats.duration_counts.any()
+    assert np.isnan(duration_percentiles(stats.duration_counts, [50])[0])
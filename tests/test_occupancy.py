@@ -0,0 +1,35 @@
+from hoki.occupancy import ZoneOccupancy, lane_bits
+from hoki.rink import get_topology
+
+
+def test_lane_bits():
+    assert lane_bits(0, 4, 0b1111) == 0
+    assert lane_bits(0b101, 4, 0b0011) == 0b0011_0000_0011
+    assert lane_bits(0b10, 3, 0b101) == 0b101_000
+
+
+def test_zone_occupancy():
+    occupancy = ZoneOccupancy([0, 0, 1, 1], [0, 2, 2, 3])
+    assert occupancy.width == 4
+    assert occupancy.teams[0] == occupancy.bit(0, 0) | occupancy.bit(1, 2)
+    assert occupancy.opponents(0) == occupancy.teams[1]
+    assert occupancy.players_in_zone(occupancy.teams[1], 2) == 0b0100
+    assert occupancy.players_in_zone(occupancy.teams[1], 3) == 0b1000
+
+    occupancy.move(3, 3, 2)
+    assert occupancy.players_in_zone(occupancy.teams[1], 2) == 0b1100
+    assert occupancy.players_in_zone(occupancy.teams[1], 3) == 0
+    assert occupancy.everyone == occupancy.teams[0] | occupancy.teams[1]
+    assert occupancy.opponents(1) == occupancy.teams[0]
+
+
+def test_lane_count():
+    topology = get_topology()
+    occupancy = ZoneOccupancy([0, 0, 1, 1], [3, 9, 6, 20])
+    path = topology.get_shot_path(1, 19)
+    mask = topology.get_path_mask(1, 19)
+    assert mask == sum(1 << zone for zone in path)
+
+    lane = lane_bits(mask, occupancy.width, 0b1111)
+    expected = sum(1 for zone in [6, 20] if zone in path)
+    assert occupancy.count(occupancy.teams[1] & lane) == expected
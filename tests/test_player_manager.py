@@ -1,3 +1,4 @@
+from dataclasses import FrozenInstanceError
 from typing import List, Union
 
 import pytest
@@ -137,3 +138,31 @@ def test_player_reaction_tip(player_manager):
 
 def test_player_reaction_block(player_manager):
     manager, _ = player_manager
+
+
+def test_role_index(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+    players_by_team = [list(range(6)), list(range(6, 12))]
+    manager = PlayerManager(players, IceMap(), players_by_team)
+    index = manager.index
+
+    assert index.teammates[0] == (1, 2, 3, 4, 5)
+    assert index.opponents[0] == tuple(range(6, 12))
+    assert index.goalie_by_team == (0, 6)
+    assert index.centre_by_team == (5, 11)
+    assert index.players_by_position[position.GOALIE] == (0, 6)
+
+    assert manager.get_players_opponant_by_position(None, 1, [position.GOALIE]) == (6,)
+    assert manager.get_players_teammate_by_position(None, 6, [position.GOALIE]) == ()
+    assert manager.get_players_teammate_by_position(
+        None, 7, [position.GOALIE, position.CENTRE]
+    ) == (6, 11)
+    assert manager.get_players_teammate_by_position(None, None) == tuple(range(12))
+    assert manager.get_all_players_by_positions([position.CENTRE]) == (5, 11)
+
+    winner, loser = manager.face_off(None)
+    assert {winner, loser} == {5, 11}
+
+    with pytest.raises(FrozenInstanceError):
+        index.teammates = ()
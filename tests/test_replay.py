@@ -0,0 +1,78 @@
+import pytest
+
+from hoki.game import GameManager
+from hoki.game_config import GameConfig
+from hoki.game_random import GameRandom
+from hoki.replay import Replay
+
+
+def test_replay_seek(create_teams, fill_teams_with_pawns, tmp_path):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+
+    def new_game():
+        return GameManager(teams[0], teams[1], pawns=players, rng=GameRandom(7))
+
+    replay = Replay.record(new_game(), interval=7)
+    replay.save(tmp_path / "game.replay")
+    replay = Replay.load(tmp_path / "game.replay")
+    played = new_game()
+    played.run()
+    assert len(replay.header) == -(-replay.ticks // 7)
+
+    for period, time in [(1, 30), (1, 3), (2, 17), (3, 12), (3, 0)]:
+        expected = new_game()
+        while (expected.state.period, expected.state.time) != (period, time):
+            expected.completed = expected.increment_state()
+        game = replay.seek(new_game(), period, time)
+        assert game.state.zone_by_player == expected.state.zone_by_player
+        assert game.state.player_by_zone == expected.state.player_by_zone
+        assert game.state.puck_player == expected.state.puck_player
+        assert game.rng.position == expected.rng.position
+        assert (game.boxscore.counts == expected.boxscore.counts).all()
+        game.run()
+        assert (game.boxscore.counts == played.boxscore.counts).all()
+        assert game.state.period == played.state.period
+
+    # the log of a seek only covers the ticks re-simulated from the keyframe, whatever the game logged before
+    game = new_game()
+    game.run()
+    game = replay.seek(game, 1, 30)
+    assert len(game.state.events) == 0
+    game = replay.seek(new_game(), 1, 25)
+    expected = new_game()
+    while (expected.state.period, expected.state.time) != (1, 25):
+        expected.completed = expected.increment_state()
+    assert game.state.game_log == expected.state.game_log
+
+    with pytest.raises(ValueError):
+        replay.seek(new_game(), played.state.period + 1, 10)
+    with pytest.raises(ValueError):
+        Replay.record(GameManager(teams[0], teams[1], pawns=players, plan_skating=True))
+    with pytest.raises(ValueError):
+        Replay.record(
+            GameManager(
+                teams[0],
+                teams[1],
+                pawns=players,
+                rng=GameRandom(1),
+                config=GameConfig(event_driven=True),
+            )
+        )
+
+
+def test_replay_decision_ticks(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+
+    def new_game():
+        config = GameConfig(decision_ticks=3)
+        return GameManager(teams[0], teams[1], pawns=players, rng=GameRandom(3), config=config)
+
+    replay = Replay.from_bytes(Replay.record(new_game(), interval=5).to_bytes())
+    assert replay.decision_ticks == 3
+    played = new_game()
+    played.run()
+    game = replay.seek(GameManager(teams[0], teams[1], pawns=players), 2, 13)
+    game.run()
+    assert (game.boxscore.counts == played.boxscore.counts).all()
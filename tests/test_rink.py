@@ -0,0 +1,156 @@
+import numpy as np
+import pytest
+
+from hoki.ice_map import IceMap
+from hoki.rink import (
+    DEFAULT_ZONES,
+    UNREACHABLE,
+    RinkTopology,
+    generate_grid_zones,
+    get_topology,
+    shortest_paths,
+)
+
+LINE_ZONES = {
+    0: {"connections": [1], "shot-weight": 1},
+    1: {"connections": [0, 2], "shot-weight": 3},
+    2: {"connections": [1], "shot-weight": 1},
+}
+
+
+def list_scan_shortest_paths(source, zones):
+    """The original O(V^2) list scan Dijkstra, kept as a reference for the heap based version."""
+    unseen = list(zones)
+    dist = {z: 1000000 for z in zones}
+    prev = {z: None for z in zones}
+    dist[source] = 0
+    while unseen:
+        zone = min(unseen, key=lambda z: dist[z])
+        unseen.remove(zone)
+        for c in zones[zone]["connections"]:
+            new_dist = dist[zone] + zones[c]["shot-weight"]
+            if new_dist < dist[c]:
+                dist[c] = new_dist
+                prev[c] = zone
+    paths = {}
+    for target in zones:
+        path = [target]
+        while path[-1] != source and prev[path[-1]] is not None:
+            path.append(prev[path[-1]])
+        if path[-1] == source:
+            paths[target] = path[::-1]
+    return paths
+
+
+def test_default_topology_matches_shortest_paths():
+    topology = get_topology()
+    assert topology.n_zones == len(DEFAULT_ZONES)
+    for source in DEFAULT_ZONES:
+        paths = shortest_paths(source, DEFAULT_ZONES)
+        for target, path in paths.items():
+            assert topology.get_shot_path(source, target) == tuple(path)
+            assert topology.distance[source, target] == sum(
+                DEFAULT_ZONES[z]["shot-weight"] for z in path[1:]
+            )
+    assert topology.to_zones() == DEFAULT_ZONES
+
+
+@pytest.mark.parametrize("rows, columns", [(1, 1), (3, 7), (10, 20)])
+def test_heap_shortest_paths_match_list_scan(rows, columns):
+    zones = generate_grid_zones(rows, columns)
+    for source in [0, len(zones) // 2, len(zones) - 1]:
+        assert shortest_paths(source, zones) == list_scan_shortest_paths(
+            source, zones
+        )
+    assert shortest_paths(0, DEFAULT_ZONES) == list_scan_shortest_paths(
+        0, DEFAULT_ZONES
+    )
+
+
+def test_generate_grid_zones():
+    zones = generate_grid_zones(3, 4)
+    assert len(zones) == 12
+    assert zones[0] == {"connections": [1, 4, 5], "shot-weight": 2}
+    assert sorted(zones[5]["connections"]) == [0, 1, 2, 4, 6, 8, 9, 10]
+    assert zones[5]["shot-weight"] == 1
+    assert RinkTopology.compile(zones).get_distance(0, 11) == 4
+
+
+def test_topology_rows_are_lazy():
+    topology = RinkTopology.compile(generate_grid_zones(20, 10))
+    assert topology.get_shot_path(0, 199)[0] == 0
+    assert topology.get_shot_path(0, 199)[-1] == 199
+    assert list(topology._predecessor) == [0]
+    topology.compile_all()
+    assert len(topology._predecessor) == 200
+    assert topology.predecessor.shape == (200, 200)
+
+
+def test_unreachable_zones():
+    zones = {
+        0: {"connections": [1], "shot-weight": 1},
+        1: {"connections": [0], "shot-weight": 1},
+        2: {"connections": [], "shot-weight": 1},
+    }
+    topology = RinkTopology.compile(zones)
+    assert topology.get_shot_path(0, 2) == ()
+    assert topology.get_distance(0, 2) == UNREACHABLE
+    assert topology.get_shot_path(2, 2) == (2,)
+    assert 2 not in shortest_paths(0, zones)
+
+
+def test_topology_is_shared_and_read_only():
+    assert get_topology() is get_topology(dict(DEFAULT_ZONES))
+    assert IceMap().topology is IceMap().topology
+    assert IceMap().shot_paths is get_topology().shot_paths
+    with pytest.raises(ValueError):
+        get_topology().distance[0, 0] = 1
+
+
+def test_path_positions():
+    positions = get_topology().path_positions()
+    path = get_topology().get_shot_path(1, 19)
+    for idx, zone in enumerate(path):
+        assert positions[1, 19, zone] == idx
+    assert (positions[1, 19] >= 0).sum() == len(path)
+
+
+def test_custom_topology():
+    topology = get_topology(LINE_ZONES)
+    assert topology is not get_topology()
+    assert topology.get_shot_path(0, 2) == (0, 1, 2)
+    assert topology.distance[0, 2] == 4
+    assert topology.neighbours[1].tolist() == [0, 2]
+    assert topology.neighbours[0].tolist() == [1, -1]
+
+    ice_map = IceMap(zones=LINE_ZONES)
+    assert ice_map.topology is topology
+    assert ice_map.get_shot_path_between_zones(2, 0) == (2, 1, 0)
+
+    with pytest.raises(ValueError):
+        RinkTopology.compile({0: {"connections": [1], "shot-weight": 1}})
+    with pytest.raises(ValueError):
+        RinkTopology.compile({1: {"connections": [], "shot-weight": 1}})
+
+
+def test_save_and_load_topology(tmp_path):
+    cache_file = tmp_path / "rink.npz"
+    topology = RinkTopology.compile(DEFAULT_ZONES)
+    topology.save(cache_file)
+    loaded = RinkTopology.load(cache_file)
+    assert np.array_equal(loaded.predecessor, topology.predecessor)
+    assert loaded.shot_paths[3][17] == topology.shot_paths[3][17]
+    assert np.array_equal(loaded.distance, topology.distance)
+    assert IceMap(topology=loaded).zones == DEFAULT_ZONES
+
+
+def test_get_topology_cache_file(tmp_path):
+    cache_file = tmp_path / "pair.npz"
+    zones = {
+        0: {"connections": [1], "shot-weight": 2},
+        1: {"connections": [0], "shot-weight": 2},
+    }
+    topology = get_topology(zones, cache_file=cache_file)
+    assert cache_file.is_file()
+    assert RinkTopology.load(cache_file).to_zones() == zones
+    assert get_topology(zones, cache_file=cache_file) is topology
@@ -0,0 +1,39 @@
+import os
+import pickle
+
+from hoki.roster_table import RosterTable
+from hoki.statblock import STAT_NAMES
+
+
+def test_roster_table_round_trip(create_teams, fill_teams_with_pawns):
+    teams = create_teams(3)
+    players = fill_teams_with_pawns(teams)
+    with RosterTable.create(teams, players) as table:
+        assert os.path.exists(table.path)
+        worker = RosterTable.attach(table.path, table.layout)
+        for t, team in enumerate(teams):
+            rows = worker.team_players(t)
+            assert [players[row].id for row in rows] == team.players
+            assert (worker.team[rows] == t).all()
+            assert worker.get_team(t).players == rows
+
+        for row, player in enumerate(players):
+            pawn = worker.get_pawn(row)
+            assert pawn is worker.get_pawn(row)
+            assert pawn.id == row
+            assert pawn.position == player.position
+            assert pawn.shoots == player.shoots
+            assert pawn.jersey_num == player.jersey_num
+            for stat in STAT_NAMES + ["shooting_hand"]:
+                assert getattr(pawn.stats, stat) == getattr(player.stats, stat)
+        assert len(worker.get_players_by_id([0, 2])) == 12
+    assert not os.path.exists(table.path)
+
+
+def test_roster_table_is_smaller_than_the_roster(create_teams, fill_teams_with_pawns):
+    teams = create_teams(4)
+    players = fill_teams_with_pawns(teams)
+    with RosterTable.create(teams, players) as table:
+        assert table.nbytes < len(pickle.dumps((teams, players)))
+        assert len(pickle.dumps((table.path, table.layout))) < 1000
+        assert not table.stats.flags.writeable
@@ -0,0 +1,40 @@
+import itertools
+import random
+from collections import Counter
+
+import pytest
+
+from hoki.schedule import RoundRobin
+
+
+@pytest.mark.parametrize("n_teams", [0, 1, 2, 3, 4, 7, 10, 33])
+@pytest.mark.parametrize("meetings", [1, 2, 3])
+def test_round_robin(n_teams, meetings):
+    schedule = RoundRobin(list(range(n_teams)), meetings, random.Random(n_teams))
+    games = list(schedule)
+    assert len(games) == len(schedule) == meetings * n_teams * (n_teams - 1) // 2
+    assert games == [schedule[i] for i in range(len(schedule))]
+
+    pairs = Counter(frozenset(game) for game in games)
+    assert set(pairs) == {frozenset(p) for p in itertools.combinations(range(n_teams), 2)}
+    assert set(pairs.values()) <= {meetings}
+
+    for day in schedule.game_days():
+        teams = [team for game in day for team in game]
+        assert len(teams) == len(set(teams))
+
+    home = Counter(home for home, _ in games)
+    away = Counter(away for _, away in games)
+    for team in range(n_teams):
+        assert abs(home[team] - away[team]) <= 1
+
+
+def test_round_robin_is_lazy():
+    schedule = RoundRobin(range(10000), rng=random.Random(1))
+    assert len(schedule) == 10000 * 9999 // 2
+    assert schedule.n_days == 9999
+    assert len(schedule.get_game_day(5000)) == 5000
+    home, away = schedule[-1]
+    assert home != away
+    with pytest.raises(IndexError):
+        schedule[len(schedule)]
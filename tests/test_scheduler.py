@@ -0,0 +1,24 @@
+import math
+
+from hoki.scheduler import DecisionScheduler
+
+
+def test_decision_scheduler():
+    scheduler = DecisionScheduler()
+    assert scheduler.ticks_to_next() == math.inf
+    scheduler.schedule(3, 2)
+    scheduler.schedule(1, 2)
+    scheduler.schedule(0, 5)
+    assert len(scheduler) == 3
+    assert scheduler.pop_due() == []
+    assert scheduler.ticks_to_next() == 2
+
+    scheduler.advance(2)
+    assert scheduler.pop_due() == [1, 3]
+    assert scheduler.ticks_to_next() == 3
+    scheduler.schedule(2, 0)
+    assert scheduler.pop_due() == [2]
+
+    scheduler.advance(4)
+    assert scheduler.pop_due() == [0]
+    assert len(scheduler) == 0
@@ -0,0 +1,173 @@
+import random
+
+import pytest
+
+from hoki.game import GameManager
+from hoki.game_state import GameState
+from hoki.ice_map import IceMap
+from hoki.occupancy import ZoneOccupancy
+from hoki.pawn import position
+from hoki.rink import RinkTopology, generate_grid_zones, get_topology
+from hoki.skating import OPPONENT_COST, SKATE_COST, SkatingPlanner, path_cost
+
+
+def create_state(n_zones, n_players=12, seed=0):
+    rng = random.Random(seed)
+    players_by_team = [
+        list(range(n_players // 2)),
+        list(range(n_players // 2, n_players)),
+    ]
+    team_by_player = [0] * (n_players // 2) + [1] * (n_players // 2)
+    zone_by_player = [rng.randrange(n_zones) for _ in range(n_players)]
+    player_by_zone = [[] for _ in range(n_zones)]
+    for player, zone in enumerate(zone_by_player):
+        player_by_zone[zone].append(player)
+    return GameState(
+        puck_player=None,
+        puck_zone=None,
+        players_by_team=players_by_team,
+        team_by_player=team_by_player,
+        player_by_zone=player_by_zone,
+        zone_by_player=zone_by_player,
+        occupancy=ZoneOccupancy(team_by_player, zone_by_player),
+        boxscore=None,
+        time=30,
+        period=1,
+    )
+
+
+def move(state, planner, player, zone):
+    old_zone = state.zone_by_player[player]
+    state.player_by_zone[old_zone].remove(player)
+    state.player_by_zone[zone].append(player)
+    state.zone_by_player[player] = zone
+    planner.move(player, old_zone, zone)
+
+
+def assert_valid_path(topology, path, source, target):
+    assert path[0] == source
+    assert path[-1] == target
+    for zone, following in zip(path, path[1:]):
+        assert following in topology.adjacency[zone]
+
+
+def test_weighted_graph():
+    state = create_state(21, seed=1)
+    ice_map = IceMap()
+    graph = ice_map.calculate_weighted_graph(state, 0)
+    for zone, players in enumerate(state.player_by_zone):
+        opponents = sum(1 for p in players if state.team_by_player[p] == 1)
+        assert graph[zone] == SKATE_COST + OPPONENT_COST * opponents
+    path = ice_map.get_scate_path_to_zone(state, 0, 1, 19)
+    assert_valid_path(ice_map.topology, path, 1, 19)
+    assert ice_map.get_scate_path_to_zone(state, 0, 4, 4) == [4]
+
+
+@pytest.mark.parametrize(
+    "zones",
+    [None, generate_grid_zones(6, 9)],
+    ids=["default", "grid"],
+)
+def test_planner_matches_uncached_paths(zones):
+    ice_map = IceMap(zones=zones)
+    topology = ice_map.topology
+    state = create_state(topology.n_zones, seed=2)
+    planner = SkatingPlanner(topology, state)
+    rng = random.Random(3)
+    for _ in range(300):
+        planner.begin_tick()
+        player = rng.randrange(12)
+        zone = state.zone_by_player[player]
+        move(state, planner, player, rng.choice(topology.adjacency[zone]))
+        assert planner.costs(0) == ice_map.calculate_weighted_graph(state, 0)
+
+        for player in [rng.randrange(12) for _ in range(3)]:
+            source = rng.randrange(topology.n_zones)
+            target = rng.randrange(topology.n_zones)
+            costs = ice_map.calculate_weighted_graph(state, player)
+            path = planner.get_path(player, source, target)
+            expected = ice_map.get_scate_path_to_zone(state, player, source, target)
+            assert_valid_path(topology, path, source, target)
+            assert path_cost(path, costs) == path_cost(expected, costs)
+    assert planner.stats["repairs"] > 0
+    assert planner.stats["stale"] == 0
+
+
+def test_planner_cache():
+    topology = get_topology()
+    state = create_state(topology.n_zones, seed=4)
+    planner = SkatingPlanner(topology, state)
+    path = planner.get_path(0, 1, 19)
+    assert planner.get_path(0, 1, 19) is path
+    assert planner.stats["hits"] == 1
+
+    # moving an opponent away and back restores the signature
+    zone = state.zone_by_player[6]
+    signature = planner.signatures[0]
+    move(state, planner, 6, topology.adjacency[zone][0])
+    assert planner.signatures[0] != signature
+    move(state, planner, 6, zone)
+    assert planner.signatures[0] == signature
+    assert planner.get_path(0, 1, 19) is path
+
+    # moving a teammate does not change the paths
+    move(state, planner, 1, topology.adjacency[state.zone_by_player[1]][0])
+    assert planner.get_path(0, 1, 19) is path
+
+
+def test_planner_budget():
+    topology = RinkTopology.compile(generate_grid_zones(10, 10))
+    state = create_state(topology.n_zones, seed=5)
+    planner = SkatingPlanner(topology, state)
+    path = planner.get_path(0, 0, 99)
+    assert 0 < planner.work <= 100
+
+    # once the budget is spent stale routes are reused
+    planner.budget = planner.work
+    move(state, planner, 6, 55)
+    stale = planner.get_path(0, 0, 99)
+    assert planner.stats["stale"] == 1
+    assert_valid_path(topology, stale, 0, 99)
+    assert stale == path
+
+    # and players without a route stay put
+    assert planner.get_path(0, 0, 55) == (0,)
+    assert planner.stats["stale"] == 2
+
+    planner.begin_tick()
+    planner.get_path(0, 0, 99)
+    assert planner.stats["repairs"] == 1
+
+
+def test_unreachable_target():
+    zones = {
+        0: {"connections": [1], "shot-weight": 1},
+        1: {"connections": [0], "shot-weight": 1},
+        2: {"connections": [], "shot-weight": 1},
+    }
+    state = create_state(3, n_players=2)
+    planner = SkatingPlanner(RinkTopology.compile(zones), state)
+    assert planner.get_path(0, 0, 2) == (0,)
+    assert planner.next_zone(0, 0, 2) == 0
+    assert planner.next_zone(0, 0, 1) == 1
+
+
+def test_game_with_skating_planner(create_teams, fill_teams_with_pawns):
+    teams = create_teams(2)
+    players = fill_teams_with_pawns(teams)
+    game = GameManager(teams[0], teams[1], players, plan_skating=True)
+    game.run()
+
+    planner = game.skating_planner
+    for team in range(2):
+        for zone, players_in_zone in enumerate(game.state.player_by_zone):
+            count = sum(
+                1 for p in players_in_zone if game.state.team_by_player[p] == team
+            )
+            assert planner.occupancy[team][zone] == count
+    assert planner.stats["hits"] + planner.stats["repairs"] > 0
+    for player, pawn in enumerate(game.players):
+        if pawn.position == position.GOALIE:
+            assert game.state.zone_by_player[player] == game.ice_map.get_initial_zone(
+                position.GOALIE, player < 6
+            )
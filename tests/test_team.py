@@ -1,4 +1,5 @@
-from hoki.team import Team, generate_team_name
+from hoki import faker
+from hoki.team import Team, generate_team_name, generate_team_names
 
 
 def test_team(create_player):
@@ -20,3 +21,11 @@ def test_generate_team_name():
     name1 = generate_team_name()
     name2 = generate_team_name()
     assert name1 != name2
+
+
+def test_generate_team_names():
+    faker.seed_instance(1)
+    names = generate_team_names(500)
+    assert len(set(names)) == 500
+    faker.seed_instance(1)
+    assert generate_team_names(500) == names